@@ -0,0 +1,84 @@
+"""contact search indexes
+
+Tables are still created by init_db(); this revision only adds the indexes
+behind GET /contacts/search. The index expressions must stay identical to
+CONTACT_SEARCH_DOCUMENT and CONTACT_SEARCH_TEXT in app/api/crud.py, or
+Postgres will not use them. On SQLite init_db() creates the same FTS5 table
+and triggers (CONTACTS_FTS_DDL in app/database.py) on fresh databases.
+
+Revision ID: 3f9a2c71d4e8
+Revises:
+Create Date: 2026-10-17 09:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a2c71d4e8"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(company, '') || ' ' || coalesce(notes, ''))"
+)
+SEARCH_TEXT = (
+    "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(company, ''))"
+)
+FTS_COLUMNS = "first_name, last_name, email, company, notes"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # Built concurrently so large contact tables stay writable during the upgrade
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contacts_search_document "
+                f"ON contacts USING gin (({SEARCH_DOCUMENT}))"
+            )
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contacts_search_trgm "
+                f"ON contacts USING gin (({SEARCH_TEXT}) gin_trgm_ops)"
+            )
+    elif op.get_bind().dialect.name == "sqlite" and not sa.inspect(op.get_bind()).has_table("contacts_fts"):
+        # External-content FTS5 table kept in sync with contacts by triggers
+        op.execute(
+            f"CREATE VIRTUAL TABLE contacts_fts USING fts5({FTS_COLUMNS}, "
+            "content='contacts', content_rowid='id', tokenize='unicode61')"
+        )
+        op.execute(
+            f"CREATE TRIGGER contacts_fts_insert AFTER INSERT ON contacts BEGIN "
+            f"INSERT INTO contacts_fts(rowid, {FTS_COLUMNS}) "
+            f"VALUES (new.id, new.first_name, new.last_name, new.email, new.company, new.notes); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER contacts_fts_delete AFTER DELETE ON contacts BEGIN "
+            f"INSERT INTO contacts_fts(contacts_fts, rowid, {FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.company, old.notes); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER contacts_fts_update AFTER UPDATE ON contacts BEGIN "
+            f"INSERT INTO contacts_fts(contacts_fts, rowid, {FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.company, old.notes); "
+            f"INSERT INTO contacts_fts(rowid, {FTS_COLUMNS}) "
+            f"VALUES (new.id, new.first_name, new.last_name, new.email, new.company, new.notes); END"
+        )
+        op.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_contacts_search_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_contacts_search_document")
+    elif op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS contacts_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS contacts_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS contacts_fts_insert")
+        op.execute("DROP TABLE IF EXISTS contacts_fts")
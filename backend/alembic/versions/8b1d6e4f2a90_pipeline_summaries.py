@@ -0,0 +1,49 @@
+"""pipeline summaries
+
+Creates the pipeline_summaries rollup (if init_db() has not already) and
+fills it from the existing deals. Afterwards the deal CRUD keeps it up to
+date; `python -m app.cli rebuild-pipeline-summaries` recomputes it.
+
+Revision ID: 8b1d6e4f2a90
+Revises: 3f9a2c71d4e8
+Create Date: 2026-10-17 11:03:27.194551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b1d6e4f2a90"
+down_revision: Union[str, None] = "3f9a2c71d4e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEAL_STATUSES = ("LEAD", "QUALIFIED", "PROPOSAL", "NEGOTIATION", "WON", "LOST")
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("pipeline_summaries"):
+        # The dealstatus enum type already exists on Postgres, created with the deals table
+        status_type = sa.Enum(*DEAL_STATUSES, name="dealstatus").with_variant(
+            postgresql.ENUM(*DEAL_STATUSES, name="dealstatus", create_type=False), "postgresql"
+        )
+        op.create_table(
+            "pipeline_summaries",
+            sa.Column("pipeline_id", sa.Integer(), sa.ForeignKey("pipelines.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("status", status_type, primary_key=True),
+            sa.Column("deal_count", sa.Integer(), nullable=False),
+            sa.Column("total_value", sa.Float(), nullable=False),
+        )
+    op.execute("DELETE FROM pipeline_summaries")
+    op.execute(
+        "INSERT INTO pipeline_summaries (pipeline_id, status, deal_count, total_value) "
+        "SELECT pipeline_id, status, count(*), coalesce(sum(value), 0) FROM deals GROUP BY pipeline_id, status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pipeline_summaries")
@@ -0,0 +1,66 @@
+"""list filter indexes
+
+Composite indexes behind the filters and sorts of GET /deals and GET /tasks.
+Each ends in (sort column, id) so a filtered page is read in order straight
+from the index, in either direction, and keyset pagination continues from
+the last row without a sort step. Timestamp sorts combined with a filter
+read the filter's index and sort only the matching rows.
+
+Revision ID: c42e7a1b9d35
+Revises: 8b1d6e4f2a90
+Create Date: 2026-10-17 13:26:51.870342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c42e7a1b9d35"
+down_revision: Union[str, None] = "8b1d6e4f2a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    # ?pipeline_id=&status= and ?pipeline_id= alone
+    "ix_deals_pipeline_status": ("deals", "pipeline_id, status, id"),
+    # ?status=
+    "ix_deals_status": ("deals", "status, id"),
+    # ?pipeline_id=&sort=-value
+    "ix_deals_pipeline_value": ("deals", "pipeline_id, value, id"),
+    # ?status=&sort=-value
+    "ix_deals_status_value": ("deals", "status, value, id"),
+    # ?sort=-value without filters
+    "ix_deals_value": ("deals", "value, id"),
+    # ?sort=created_at and ?sort=updated_at without filters
+    "ix_deals_created_at": ("deals", "created_at, id"),
+    "ix_deals_updated_at": ("deals", "updated_at, id"),
+    # ?status=&sort=due_date, with or without a due date range
+    "ix_tasks_status_due": ("tasks", "status, due_date, id"),
+    # ?status=&priority=&sort=due_date
+    "ix_tasks_status_priority_due": ("tasks", "status, priority, due_date, id"),
+    # ?contact_id=, optionally with status and sorted by due date
+    "ix_tasks_contact_status_due": ("tasks", "contact_id, status, due_date, id"),
+    # ?sort=due_date and due date ranges without other filters
+    "ix_tasks_due_date": ("tasks", "due_date, id"),
+    # ?sort=created_at and ?sort=updated_at without filters
+    "ix_tasks_created_at": ("tasks", "created_at, id"),
+    "ix_tasks_updated_at": ("tasks", "updated_at, id"),
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # Built concurrently so deals and tasks stay writable during the upgrade
+        with op.get_context().autocommit_block():
+            for name, (table, columns) in INDEXES.items():
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+    else:
+        for name, (table, columns) in INDEXES.items():
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -1,3 +1,3 @@
-from . import crud
+from . import crud, async_crud
 
-__all__ = ["crud"]
+__all__ = ["crud", "async_crud"]
@@ -0,0 +1,410 @@
+from sqlalchemy import Row, case, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+from ..models import Contact, Pipeline, Deal, Task
+from ..models.pipeline_summary import PipelineSummary
+from ..schemas import (
+    ContactCreate, ContactUpdate,
+    PipelineCreate, PipelineUpdate,
+    DealCreate, DealUpdate,
+    TaskCreate, TaskUpdate,
+    BulkItemResult
+)
+from . import crud
+from .cache import entity_cache
+from .filters import Sort
+
+
+# Entity cache
+async def _cached_get(db: AsyncSession, model, entity_id: int):
+    """Look up an entity by primary key through the entity cache"""
+    instance = db.sync_session.identity_map.get(db.sync_session.identity_key(model, entity_id))
+    if instance is not None:
+        return instance
+    row = await entity_cache.aget(model, entity_id)
+    if row is not None:
+        # Attach the cached state without a SELECT, so updates and deletes work as usual
+        return await db.merge(entity_cache.to_instance(model, row), load=False)
+    instance = await db.scalar(select(model).where(model.id == entity_id))
+    if instance is not None and entity_cache.should_cache(db.sync_session):
+        await entity_cache.aset(instance)
+    return instance
+
+
+async def load_included(db: AsyncSession, instance, include: Sequence[str]) -> None:
+    """Load the include= relations of one entity, reading the related rows through the entity cache"""
+    for name in include:
+        related = getattr(type(instance), name).property.mapper.class_
+        await _cached_get(db, related, getattr(instance, f"{name}_id"))
+    # The relations now resolve from the identity map
+    await db.run_sync(lambda session: [getattr(instance, name) for name in include])
+
+
+async def _update_returning(db: AsyncSession, model, entity_id: int, values: Dict[str, Any]):
+    """Apply an update with a single UPDATE ... RETURNING instead of SELECT, UPDATE and a refresh SELECT"""
+    stmt = update(model).where(model.id == entity_id).values(**values).returning(model)
+    return await db.scalar(stmt, execution_options={"synchronize_session": False, "populate_existing": True})
+
+
+# Contact CRUD
+async def create_contact(db: AsyncSession, contact: ContactCreate) -> Contact:
+    """Create a new contact"""
+    db_contact = Contact(**contact.model_dump())
+    db.add(db_contact)
+    await db.commit()
+    await db.refresh(db_contact)
+    return db_contact
+
+
+async def get_contact(db: AsyncSession, contact_id: int) -> Optional[Contact]:
+    """Get contact by ID"""
+    return await _cached_get(db, Contact, contact_id)
+
+
+async def get_contacts(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> List[Contact]:
+    """Get all contacts with offset or keyset pagination, loading only `fields` when given"""
+    query = select(Contact)
+    if fields:
+        query = query.options(crud.load_columns(Contact, fields))
+    if after_id is not None:
+        query = query.where(Contact.id > after_id)
+    result = await db.scalars(query.order_by(Contact.id).offset(skip).limit(limit))
+    return list(result)
+
+
+async def get_contact_versions(db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Row]:
+    """(id, updated_at) of the rows get_contacts returns, for ETag checks"""
+    query = select(Contact.id, Contact.updated_at)
+    if after_id is not None:
+        query = query.where(Contact.id > after_id)
+    result = await db.execute(query.order_by(Contact.id).offset(skip).limit(limit))
+    return list(result)
+
+
+async def update_contact(db: AsyncSession, contact_id: int, contact: ContactUpdate) -> Optional[Contact]:
+    """Update contact"""
+    values = contact.model_dump(exclude_unset=True)
+    db_contact = await _update_returning(db, Contact, contact_id, {**values, "updated_at": datetime.utcnow()})
+    if db_contact is None:
+        return None
+    await db.commit()
+    await entity_cache.ainvalidate(Contact, [contact_id])
+    return db_contact
+
+
+async def delete_contact(db: AsyncSession, contact_id: int) -> bool:
+    """Delete contact together with its deals and tasks"""
+    results = await db.run_sync(crud.bulk_delete_contacts, [contact_id])
+    return results[0].status == "deleted"
+
+
+async def search_contacts(db: AsyncSession, q: str, limit: int = 20) -> List[Contact]:
+    """Search contacts by name, email, company and notes, best matches first"""
+    query = crud.contact_search_query(db.bind.dialect.name, q, limit)
+    if query is None:
+        return []
+    result = await db.scalars(query)
+    return list(result)
+
+
+# Pipeline CRUD
+async def create_pipeline(db: AsyncSession, pipeline: PipelineCreate) -> Pipeline:
+    """Create a new pipeline"""
+    db_pipeline = Pipeline(**pipeline.model_dump())
+    db.add(db_pipeline)
+    await db.commit()
+    await db.refresh(db_pipeline)
+    return db_pipeline
+
+
+async def get_pipeline(db: AsyncSession, pipeline_id: int) -> Optional[Pipeline]:
+    """Get pipeline by ID"""
+    return await _cached_get(db, Pipeline, pipeline_id)
+
+
+async def get_pipelines(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> List[Pipeline]:
+    """Get all pipelines with offset or keyset pagination, loading only `fields` when given"""
+    query = select(Pipeline)
+    if fields:
+        query = query.options(crud.load_columns(Pipeline, fields))
+    if after_id is not None:
+        query = query.where(Pipeline.id > after_id)
+    result = await db.scalars(query.order_by(Pipeline.id).offset(skip).limit(limit))
+    return list(result)
+
+
+async def get_pipeline_versions(db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Row]:
+    """(id, updated_at) of the rows get_pipelines returns, for ETag checks"""
+    query = select(Pipeline.id, Pipeline.updated_at)
+    if after_id is not None:
+        query = query.where(Pipeline.id > after_id)
+    result = await db.execute(query.order_by(Pipeline.id).offset(skip).limit(limit))
+    return list(result)
+
+
+async def update_pipeline(db: AsyncSession, pipeline_id: int, pipeline: PipelineUpdate) -> Optional[Pipeline]:
+    """Update pipeline"""
+    values = pipeline.model_dump(exclude_unset=True)
+    db_pipeline = await _update_returning(db, Pipeline, pipeline_id, {**values, "updated_at": datetime.utcnow()})
+    if db_pipeline is None:
+        return None
+    await db.commit()
+    await entity_cache.ainvalidate(Pipeline, [pipeline_id])
+    return db_pipeline
+
+
+async def delete_pipeline(db: AsyncSession, pipeline_id: int) -> bool:
+    """Delete pipeline together with its deals"""
+    options = {"synchronize_session": False}
+    # Core deletes bypass ORM cascades, so remove dependent rows explicitly
+    deal_ids = list(await db.scalars(delete(Deal).where(Deal.pipeline_id == pipeline_id).returning(Deal.id), execution_options=options))
+    await db.execute(delete(PipelineSummary).where(PipelineSummary.pipeline_id == pipeline_id), execution_options=options)
+    deleted = await db.scalar(delete(Pipeline).where(Pipeline.id == pipeline_id).returning(Pipeline.id), execution_options=options)
+    if deleted is None:
+        await db.rollback()
+        return False
+    await db.commit()
+    await entity_cache.ainvalidate(Pipeline, [pipeline_id])
+    await entity_cache.ainvalidate(Deal, deal_ids)
+    return True
+
+
+# Deal CRUD
+async def create_deal(db: AsyncSession, deal: DealCreate) -> Deal:
+    """Create a new deal"""
+    db_deal = Deal(**deal.model_dump())
+    db.add(db_deal)
+    await db.flush()
+    await db.run_sync(crud.apply_summary_deltas, crud.deal_deltas(added=[crud.deal_summary_key(db_deal)]))
+    await db.commit()
+    await db.refresh(db_deal)
+    return db_deal
+
+
+async def get_deal(db: AsyncSession, deal_id: int) -> Optional[Deal]:
+    """Get deal by ID"""
+    return await _cached_get(db, Deal, deal_id)
+
+
+async def get_deals(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    after_value: Any = None,
+    sort: Sort = Sort(),
+    fields: Optional[Sequence[str]] = None,
+    include: Sequence[str] = (),
+    **filters: Any,
+) -> List[Deal]:
+    """Get deals matching the filters in sort order, with offset or keyset pagination.
+
+    Only `fields` are loaded when given; each relation in `include` costs one extra IN query.
+    """
+    query = crud.deals_query(sort=sort, after_id=after_id, after_value=after_value, **filters)
+    if fields:
+        query = query.options(crud.load_columns(Deal, fields, sort.field, *(f"{name}_id" for name in include)))
+    query = query.options(*crud.load_related(Deal, include))
+    result = await db.scalars(query.offset(skip).limit(limit))
+    return list(result)
+
+
+async def get_deal_versions(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    after_value: Any = None,
+    sort: Sort = Sort(),
+    include: Sequence[str] = (),
+    **filters: Any,
+) -> List[Row]:
+    """(id, updated_at, sort value, included rows' updated_at) of the rows get_deals returns, for ETag checks"""
+    columns = {column.key: column for column in (Deal.id, Deal.updated_at, sort.column(Deal))}
+    for name in include:
+        related = getattr(Deal, name).property.mapper.class_
+        columns[name] = related.updated_at.label(f"{name}_updated_at")
+    query = crud.deals_query(*columns.values(), sort=sort, after_id=after_id, after_value=after_value, **filters)
+    for name in include:
+        query = query.join(getattr(Deal, name))
+    result = await db.execute(query.offset(skip).limit(limit))
+    return list(result)
+
+
+async def update_deal(db: AsyncSession, deal_id: int, deal: DealUpdate) -> Optional[Deal]:
+    """Update deal"""
+    values = deal.model_dump(exclude_unset=True)
+    before = None
+    if values.keys() & {"pipeline_id", "status", "value"}:
+        # The rollup needs what the deal counted for before; the lock orders concurrent updates
+        before = (await db.execute(
+            select(Deal.pipeline_id, Deal.status, Deal.value).where(Deal.id == deal_id).with_for_update()
+        )).first()
+        if before is None:
+            return None
+    db_deal = await _update_returning(db, Deal, deal_id, {**values, "updated_at": datetime.utcnow()})
+    if db_deal is None:
+        return None
+    if before is not None:
+        deltas = crud.deal_deltas(added=[crud.deal_summary_key(db_deal)], removed=[tuple(before)])
+        await db.run_sync(crud.apply_summary_deltas, deltas)
+    await db.commit()
+    await entity_cache.ainvalidate(Deal, [deal_id])
+    return db_deal
+
+
+async def delete_deal(db: AsyncSession, deal_id: int) -> bool:
+    """Delete deal"""
+    stmt = delete(Deal).where(Deal.id == deal_id).returning(Deal.pipeline_id, Deal.status, Deal.value)
+    removed = (await db.execute(stmt, execution_options={"synchronize_session": False})).first()
+    if removed is None:
+        return False
+    await db.run_sync(crud.apply_summary_deltas, crud.deal_deltas(removed=[tuple(removed)]))
+    await db.commit()
+    await entity_cache.ainvalidate(Deal, [deal_id])
+    return True
+
+
+async def get_pipeline_summaries(db: AsyncSession, pipeline_id: Optional[int] = None) -> List[PipelineSummary]:
+    """Rollup rows of one pipeline, or of all pipelines"""
+    query = select(PipelineSummary).order_by(PipelineSummary.pipeline_id)
+    if pipeline_id is not None:
+        query = query.where(PipelineSummary.pipeline_id == pipeline_id)
+    result = await db.scalars(query)
+    return list(result)
+
+
+# Task CRUD
+async def create_task(db: AsyncSession, task: TaskCreate) -> Task:
+    """Create a new task"""
+    db_task = Task(**task.model_dump())
+    db.add(db_task)
+    await db.commit()
+    await db.refresh(db_task)
+    return db_task
+
+
+async def get_task(db: AsyncSession, task_id: int) -> Optional[Task]:
+    """Get task by ID"""
+    return await _cached_get(db, Task, task_id)
+
+
+async def get_tasks(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    after_value: Any = None,
+    sort: Sort = Sort(),
+    fields: Optional[Sequence[str]] = None,
+    include: Sequence[str] = (),
+    **filters: Any,
+) -> List[Task]:
+    """Get tasks matching the filters in sort order, with offset or keyset pagination.
+
+    Only `fields` are loaded when given; each relation in `include` costs one extra IN query.
+    """
+    query = crud.tasks_query(sort=sort, after_id=after_id, after_value=after_value, **filters)
+    if fields:
+        query = query.options(crud.load_columns(Task, fields, sort.field, *(f"{name}_id" for name in include)))
+    query = query.options(*crud.load_related(Task, include))
+    result = await db.scalars(query.offset(skip).limit(limit))
+    return list(result)
+
+
+async def get_task_versions(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    after_value: Any = None,
+    sort: Sort = Sort(),
+    include: Sequence[str] = (),
+    **filters: Any,
+) -> List[Row]:
+    """(id, updated_at, sort value, included rows' updated_at) of the rows get_tasks returns, for ETag checks"""
+    columns = {column.key: column for column in (Task.id, Task.updated_at, sort.column(Task))}
+    for name in include:
+        related = getattr(Task, name).property.mapper.class_
+        columns[name] = related.updated_at.label(f"{name}_updated_at")
+    query = crud.tasks_query(*columns.values(), sort=sort, after_id=after_id, after_value=after_value, **filters)
+    for name in include:
+        query = query.join(getattr(Task, name))
+    result = await db.execute(query.offset(skip).limit(limit))
+    return list(result)
+
+
+async def update_task(db: AsyncSession, task_id: int, task: TaskUpdate) -> Optional[Task]:
+    """Update task"""
+    now = datetime.utcnow()
+    values = task.model_dump(exclude_unset=True)
+    
+    # Mark as completed if status changed to completed
+    if task.status and task.status.value == "completed" and not values.get("is_completed"):
+        if "is_completed" in values:
+            values["completed_at"] = now
+        else:
+            # An already completed task keeps its original completion time
+            values["completed_at"] = case((Task.is_completed, Task.completed_at), else_=now)
+        values["is_completed"] = True
+    elif task.status and not values.get("is_completed"):
+        # Moving a task out of completed reopens it
+        values["is_completed"] = False
+        values["completed_at"] = None
+
+    db_task = await _update_returning(db, Task, task_id, {**values, "updated_at": now})
+    if db_task is None:
+        return None
+    await db.commit()
+    await entity_cache.ainvalidate(Task, [task_id])
+    return db_task
+
+
+async def delete_task(db: AsyncSession, task_id: int) -> bool:
+    """Delete task"""
+    results = await db.run_sync(crud.bulk_delete_tasks, [task_id])
+    return results[0].status == "deleted"
+
+
+# Bulk operations reuse the sync implementations on the async connection
+async def bulk_create_contacts(db: AsyncSession, contacts: Dict[int, ContactCreate], upsert: bool = False) -> List[BulkItemResult]:
+    """Create contacts in chunked multi-row inserts, optionally upserting by email"""
+    return await db.run_sync(crud.bulk_create_contacts, contacts, upsert)
+
+
+async def bulk_create_deals(db: AsyncSession, deals: Dict[int, DealCreate]) -> List[BulkItemResult]:
+    """Create deals in chunked multi-row inserts"""
+    return await db.run_sync(crud.bulk_create_deals, deals)
+
+
+async def bulk_create_tasks(db: AsyncSession, tasks: Dict[int, TaskCreate]) -> List[BulkItemResult]:
+    """Create tasks in chunked multi-row inserts"""
+    return await db.run_sync(crud.bulk_create_tasks, tasks)
+
+
+async def bulk_delete_contacts(db: AsyncSession, contact_ids: List[int]) -> List[BulkItemResult]:
+    """Delete contacts together with their deals and tasks"""
+    return await db.run_sync(crud.bulk_delete_contacts, contact_ids)
+
+
+async def bulk_delete_deals(db: AsyncSession, deal_ids: List[int]) -> List[BulkItemResult]:
+    """Delete deals"""
+    return await db.run_sync(crud.bulk_delete_deals, deal_ids)
+
+
+async def bulk_delete_tasks(db: AsyncSession, task_ids: List[int]) -> List[BulkItemResult]:
+    """Delete tasks"""
+    return await db.run_sync(crud.bulk_delete_tasks, task_ids)
@@ -0,0 +1,270 @@
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import DateTime, Enum, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from typing import Any, Dict, Iterable, Optional, Tuple
+import enum
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """In-process LRU with a per-entry TTL and a bound on the number of entries"""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry[1])
+
+    def set(self, key: str, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(row))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.get(key)
+
+    async def aset(self, key: str, row: Dict[str, Any]) -> None:
+        self.set(key, row)
+
+    async def adelete(self, keys: Iterable[str]) -> None:
+        self.delete(keys)
+
+    async def aevictions(self) -> int:
+        return self.evictions
+
+
+class RedisBackend:
+    """Shared cache on any server speaking the Redis protocol; entries expire after the TTL.
+
+    Size bound and evictions are left to the server (maxmemory / maxmemory-policy).
+    Sync calls serve crud, the asyncio client serves async_crud.
+    """
+
+    def __init__(self, url: str, ttl: float = 30.0, prefix: str = "crm:"):
+        import redis
+        import redis.asyncio
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+        self.async_client = redis.asyncio.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self.client.get(self.prefix + key)
+        return json.loads(data) if data is not None else None
+
+    def set(self, key: str, row: Dict[str, Any]) -> None:
+        self.client.set(self.prefix + key, json.dumps(row), px=int(self.ttl * 1000))
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        return None
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        data = await self.async_client.get(self.prefix + key)
+        return json.loads(data) if data is not None else None
+
+    async def aset(self, key: str, row: Dict[str, Any]) -> None:
+        await self.async_client.set(self.prefix + key, json.dumps(row), px=int(self.ttl * 1000))
+
+    async def adelete(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            await self.async_client.delete(*keys)
+
+    async def aevictions(self) -> Optional[int]:
+        try:
+            return (await self.async_client.info("stats")).get("evicted_keys")
+        except Exception:
+            return None
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+class EntityCache:
+    """Read-through cache of entity rows keyed by table and primary key.
+
+    Rows are stored as plain column values; a hit is turned back into a
+    persistent instance with Session.merge(load=False), so callers can update
+    or delete it as if it had been queried. Writes in crud/async_crud
+    invalidate the affected keys after they commit.
+    """
+
+    def __init__(self, backend: Optional[Any]):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "EntityCache":
+        kind = os.getenv("ENTITY_CACHE_BACKEND")
+        if kind is None:
+            # Each worker process would keep its own copy, serving rows and ETags another worker already changed
+            kind = "memory" if int(os.getenv("WEB_CONCURRENCY", "1")) <= 1 else "none"
+        ttl = float(os.getenv("ENTITY_CACHE_TTL", "30"))
+        if kind == "memory":
+            return cls(MemoryBackend(max_entries=int(os.getenv("ENTITY_CACHE_SIZE", "10000")), ttl=ttl))
+        if kind == "redis":
+            return cls(RedisBackend(os.getenv("ENTITY_CACHE_URL", "redis://localhost:6379/0"), ttl=ttl))
+        return cls(None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def key(model, entity_id: int) -> str:
+        return f"{model.__tablename__}:{entity_id}"
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @staticmethod
+    def should_cache(db: Session) -> bool:
+        # Sessions inside a larger transaction may see rows that are never committed
+        return db.info.get("cache_reads", True)
+
+    @staticmethod
+    def to_row(instance: Any) -> Dict[str, Any]:
+        return {attr.key: _encode(getattr(instance, attr.key)) for attr in inspect(instance).mapper.column_attrs}
+
+    @staticmethod
+    def to_instance(model, row: Dict[str, Any]) -> Any:
+        """Detached instance from a cached row, ready for Session.merge(load=False)"""
+        values = {}
+        for attr in inspect(model).column_attrs:
+            value = row.get(attr.key)
+            column_type = attr.columns[0].type
+            if value is not None and isinstance(column_type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif value is not None and isinstance(column_type, Enum) and column_type.enum_class is not None:
+                value = column_type.enum_class(value)
+            values[attr.key] = value
+        instance = model(**values)
+        make_transient_to_detached(instance)
+        return instance
+
+    def get(self, model, entity_id: int) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            row = self.backend.get(self.key(model, entity_id))
+        except Exception as e:
+            logger.warning(f"Entity cache get failed: {e}")
+            row = None
+        self._count(row is not None)
+        return row
+
+    def set(self, instance: Any) -> None:
+        if not self.enabled:
+            return
+        try:
+            self.backend.set(self.key(type(instance), instance.id), self.to_row(instance))
+        except Exception as e:
+            logger.warning(f"Entity cache set failed: {e}")
+
+    def invalidate(self, model, entity_ids: Iterable[int]) -> None:
+        if not self.enabled:
+            return
+        keys = [self.key(model, entity_id) for entity_id in entity_ids]
+        with self._lock:
+            self.invalidations += len(keys)
+        try:
+            self.backend.delete(keys)
+        except Exception as e:
+            logger.warning(f"Entity cache invalidation failed: {e}")
+
+    async def aget(self, model, entity_id: int) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            row = await self.backend.aget(self.key(model, entity_id))
+        except Exception as e:
+            logger.warning(f"Entity cache get failed: {e}")
+            row = None
+        self._count(row is not None)
+        return row
+
+    async def aset(self, instance: Any) -> None:
+        if not self.enabled:
+            return
+        try:
+            await self.backend.aset(self.key(type(instance), instance.id), self.to_row(instance))
+        except Exception as e:
+            logger.warning(f"Entity cache set failed: {e}")
+
+    async def ainvalidate(self, model, entity_ids: Iterable[int]) -> None:
+        if not self.enabled:
+            return
+        keys = [self.key(model, entity_id) for entity_id in entity_ids]
+        with self._lock:
+            self.invalidations += len(keys)
+        try:
+            await self.backend.adelete(keys)
+        except Exception as e:
+            logger.warning(f"Entity cache invalidation failed: {e}")
+
+    async def astats(self) -> Dict[str, Any]:
+        evictions = await self.backend.aevictions() if self.enabled else 0
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__ if self.enabled else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": evictions,
+                "invalidations": self.invalidations,
+                "size": self.backend.size() if self.enabled else 0,
+            }
+
+
+# Global entity cache
+entity_cache = EntityCache.from_env()
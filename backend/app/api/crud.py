@@ -1,14 +1,69 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import Integer, Select, String, bindparam, delete, func, insert, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, load_only, selectinload
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
+import re
 from ..models import Contact, Pipeline, Deal, Task
+from ..models.pipeline import DealStatus
+from ..models.pipeline_summary import PipelineSummary
+from ..models.task import TaskPriority, TaskStatus
+from .cache import entity_cache
+from .filters import Sort
 from ..schemas import (
-    ContactCreate, ContactUpdate,
-    PipelineCreate, PipelineUpdate,
-    DealCreate, DealUpdate,
-    TaskCreate, TaskUpdate
+    ContactCreate,
+    PipelineCreate,
+    DealCreate,
+    TaskCreate,
+    BulkItemResult
 )
 
+BULK_CHUNK_SIZE = 500
+
+# INSERT constructs supporting ON CONFLICT, by dialect
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Change in (deal count, total value) per (pipeline id, deal status)
+SummaryDeltas = Dict[Tuple[int, DealStatus], Tuple[int, float]]
+
+# Must match the index expressions of alembic revision 3f9a2c71d4e8
+CONTACT_SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(company, '') || ' ' || coalesce(notes, ''))"
+)
+CONTACT_SEARCH_TEXT = (
+    "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(company, ''))"
+)
+
+
+# Entity cache
+def _cached_get(db: Session, model, entity_id: int):
+    """Look up an entity by primary key through the entity cache"""
+    instance = db.identity_map.get(db.identity_key(model, entity_id))
+    if instance is not None:
+        return instance
+    row = entity_cache.get(model, entity_id)
+    if row is not None:
+        # Attach the cached state without a SELECT, so updates and deletes work as usual
+        return db.merge(entity_cache.to_instance(model, row), load=False)
+    instance = db.query(model).filter(model.id == entity_id).first()
+    if instance is not None and entity_cache.should_cache(db):
+        entity_cache.set(instance)
+    return instance
+
+
+# Field projection
+def load_columns(model, fields: Iterable[str], *required: str):
+    """load_only() option for a fields= selection; updated_at always loads for the ETag"""
+    return load_only(*(getattr(model, name) for name in dict.fromkeys([*fields, "updated_at", *required])))
+
+
+def load_related(model, include: Iterable[str]) -> list:
+    """selectinload() options for include=, one IN query per relation however long the page"""
+    return [selectinload(getattr(model, name)) for name in include]
+
 
 # Contact CRUD
 def create_contact(db: Session, contact: ContactCreate) -> Contact:
@@ -22,38 +77,59 @@ def create_contact(db: Session, contact: ContactCreate) -> Contact:
 
 def get_contact(db: Session, contact_id: int) -> Optional[Contact]:
     """Get contact by ID"""
-    return db.query(Contact).filter(Contact.id == contact_id).first()
-
-
-def get_contacts(db: Session, skip: int = 0, limit: int = 100) -> List[Contact]:
-    """Get all contacts with pagination"""
-    return db.query(Contact).offset(skip).limit(limit).all()
-
-
-def update_contact(db: Session, contact_id: int, contact: ContactUpdate) -> Optional[Contact]:
-    """Update contact"""
-    db_contact = get_contact(db, contact_id)
-    if db_contact is None:
-        return None
+    return _cached_get(db, Contact, contact_id)
+
+
+def get_contacts(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Contact]:
+    """Get all contacts with offset or keyset pagination"""
+    query = db.query(Contact)
+    if after_id is not None:
+        query = query.filter(Contact.id > after_id)
+    return query.order_by(Contact.id).offset(skip).limit(limit).all()
+
+
+def contact_search_query(dialect: str, q: str, limit: int = 20) -> Optional[Select]:
+    """Ranked contact search for the given dialect, or None if q has nothing to search for"""
+    if dialect == "postgresql":
+        # Full-text match on words, trigram word similarity for typos and partial words
+        statement = text(
+            f"SELECT contacts.* FROM contacts, websearch_to_tsquery('simple', :q) AS query "
+            f"WHERE {CONTACT_SEARCH_DOCUMENT} @@ query OR {CONTACT_SEARCH_TEXT} %> lower(:q) "
+            f"ORDER BY ts_rank({CONTACT_SEARCH_DOCUMENT}, query) "
+            f"+ word_similarity(lower(:q), {CONTACT_SEARCH_TEXT}) DESC, contacts.id "
+            f"LIMIT :limit"
+        )
+        # Typed parameters, so asyncpg does not have to infer them from lower()/word_similarity()
+        statement = statement.bindparams(bindparam("q", q, type_=String), bindparam("limit", limit, type_=Integer))
+        return select(Contact).from_statement(statement)
     
-    update_data = contact.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_contact, field, value)
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    if dialect == "sqlite":
+        # Every term as a quoted prefix, so user input cannot inject FTS5 syntax
+        statement = text(
+            "SELECT contacts.* FROM contacts_fts JOIN contacts ON contacts.id = contacts_fts.rowid "
+            "WHERE contacts_fts MATCH :q ORDER BY bm25(contacts_fts), contacts.id LIMIT :limit"
+        )
+        match = " ".join(f'"{term}"*' for term in terms)
+        return select(Contact).from_statement(statement.bindparams(q=match, limit=limit))
     
-    db_contact.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_contact)
-    return db_contact
+    columns = [Contact.first_name, Contact.last_name, Contact.email, Contact.company, Contact.notes]
+    return (
+        select(Contact)
+        .where(*[or_(*[column.ilike(f"%{term}%") for column in columns]) for term in terms])
+        .order_by(Contact.id)
+        .limit(limit)
+    )
 
 
-def delete_contact(db: Session, contact_id: int) -> bool:
-    """Delete contact"""
-    db_contact = get_contact(db, contact_id)
-    if db_contact is None:
-        return False
-    db.delete(db_contact)
-    db.commit()
-    return True
+def search_contacts(db: Session, q: str, limit: int = 20) -> List[Contact]:
+    """Search contacts by name, email, company and notes, best matches first"""
+    query = contact_search_query(db.get_bind().dialect.name, q, limit)
+    if query is None:
+        return []
+    return list(db.scalars(query))
 
 
 # Pipeline CRUD
@@ -68,38 +144,15 @@ def create_pipeline(db: Session, pipeline: PipelineCreate) -> Pipeline:
 
 def get_pipeline(db: Session, pipeline_id: int) -> Optional[Pipeline]:
     """Get pipeline by ID"""
-    return db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+    return _cached_get(db, Pipeline, pipeline_id)
 
 
-def get_pipelines(db: Session, skip: int = 0, limit: int = 100) -> List[Pipeline]:
-    """Get all pipelines with pagination"""
-    return db.query(Pipeline).offset(skip).limit(limit).all()
-
-
-def update_pipeline(db: Session, pipeline_id: int, pipeline: PipelineUpdate) -> Optional[Pipeline]:
-    """Update pipeline"""
-    db_pipeline = get_pipeline(db, pipeline_id)
-    if db_pipeline is None:
-        return None
-    
-    update_data = pipeline.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_pipeline, field, value)
-    
-    db_pipeline.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_pipeline)
-    return db_pipeline
-
-
-def delete_pipeline(db: Session, pipeline_id: int) -> bool:
-    """Delete pipeline"""
-    db_pipeline = get_pipeline(db, pipeline_id)
-    if db_pipeline is None:
-        return False
-    db.delete(db_pipeline)
-    db.commit()
-    return True
+def get_pipelines(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Pipeline]:
+    """Get all pipelines with offset or keyset pagination"""
+    query = db.query(Pipeline)
+    if after_id is not None:
+        query = query.filter(Pipeline.id > after_id)
+    return query.order_by(Pipeline.id).offset(skip).limit(limit).all()
 
 
 # Deal CRUD
@@ -107,6 +160,8 @@ def create_deal(db: Session, deal: DealCreate) -> Deal:
     """Create a new deal"""
     db_deal = Deal(**deal.model_dump())
     db.add(db_deal)
+    db.flush()
+    apply_summary_deltas(db, deal_deltas(added=[deal_summary_key(db_deal)]))
     db.commit()
     db.refresh(db_deal)
     return db_deal
@@ -114,38 +169,130 @@ def create_deal(db: Session, deal: DealCreate) -> Deal:
 
 def get_deal(db: Session, deal_id: int) -> Optional[Deal]:
     """Get deal by ID"""
-    return db.query(Deal).filter(Deal.id == deal_id).first()
-
-
-def get_deals(db: Session, skip: int = 0, limit: int = 100) -> List[Deal]:
-    """Get all deals with pagination"""
-    return db.query(Deal).offset(skip).limit(limit).all()
-
-
-def update_deal(db: Session, deal_id: int, deal: DealUpdate) -> Optional[Deal]:
-    """Update deal"""
-    db_deal = get_deal(db, deal_id)
-    if db_deal is None:
-        return None
-    
-    update_data = deal.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_deal, field, value)
-    
-    db_deal.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_deal)
-    return db_deal
-
-
-def delete_deal(db: Session, deal_id: int) -> bool:
-    """Delete deal"""
-    db_deal = get_deal(db, deal_id)
-    if db_deal is None:
-        return False
-    db.delete(db_deal)
+    return _cached_get(db, Deal, deal_id)
+
+
+def get_deals(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Deal]:
+    """Get all deals with offset or keyset pagination"""
+    query = db.query(Deal)
+    if after_id is not None:
+        query = query.filter(Deal.id > after_id)
+    return query.order_by(Deal.id).offset(skip).limit(limit).all()
+
+
+def deals_query(
+    *entities,
+    sort: Sort = Sort(),
+    after_id: Optional[int] = None,
+    after_value=None,
+    pipeline_id: Optional[int] = None,
+    status: Optional[DealStatus] = None,
+) -> Select:
+    """Filtered and sorted deal listing over Deal or a subset of its columns"""
+    query = select(*(entities or (Deal,)))
+    if pipeline_id is not None:
+        query = query.where(Deal.pipeline_id == pipeline_id)
+    if status is not None:
+        query = query.where(Deal.status == status)
+    if after_id is not None:
+        query = query.where(sort.after(Deal, after_id, sort.load_value(Deal, after_value)))
+    return query.order_by(*sort.order_by(Deal))
+
+
+# Pipeline summaries
+def deal_summary_key(deal: Deal) -> Tuple[int, DealStatus, Optional[float]]:
+    """What a deal contributes to the rollup: (pipeline_id, status, value)"""
+    return deal.pipeline_id, deal.status, deal.value
+
+
+def deal_deltas(
+    added: Iterable[Tuple[int, DealStatus, Optional[float]]] = (),
+    removed: Iterable[Tuple[int, DealStatus, Optional[float]]] = ()
+) -> SummaryDeltas:
+    """Summary changes for deals given as (pipeline_id, status, value)"""
+    deltas: SummaryDeltas = {}
+    for sign, deals in ((1, added), (-1, removed)):
+        for pipeline_id, status, value in deals:
+            count, total = deltas.get((pipeline_id, status), (0, 0.0))
+            deltas[(pipeline_id, status)] = (count + sign, total + sign * (value or 0.0))
+    return deltas
+
+
+def apply_summary_deltas(db: Session, deltas: SummaryDeltas) -> None:
+    """Add deltas to the pipeline summary rollup within the caller's transaction"""
+    rows = [
+        {"pipeline_id": pipeline_id, "status": status, "deal_count": count, "total_value": total}
+        for (pipeline_id, status), (count, total) in deltas.items()
+        if count or total
+    ]
+    if not rows:
+        return
+    if not supports_upsert(db.get_bind().dialect.name):
+        _add_summary_rows(db, rows)
+        return
+    stmt = _upsert_insert(db)(PipelineSummary).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PipelineSummary.pipeline_id, PipelineSummary.status],
+        set_={
+            "deal_count": PipelineSummary.deal_count + stmt.excluded.deal_count,
+            "total_value": PipelineSummary.total_value + stmt.excluded.total_value,
+        }
+    )
+    db.execute(stmt)
+
+
+def _add_summary_rows(db: Session, rows: List[dict]) -> None:
+    """UPDATE-then-INSERT fallback for dialects without ON CONFLICT"""
+    for row in rows:
+        increment = (
+            update(PipelineSummary)
+            .where(PipelineSummary.pipeline_id == row["pipeline_id"], PipelineSummary.status == row["status"])
+            .values(
+                deal_count=PipelineSummary.deal_count + row["deal_count"],
+                total_value=PipelineSummary.total_value + row["total_value"],
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if db.execute(increment).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(insert(PipelineSummary).values(row))
+        except IntegrityError:
+            # Another transaction created the row first
+            db.execute(increment)
+
+
+def subtract_deals_from_summaries(db: Session, *criteria) -> None:
+    """Take the deals matching criteria out of the rollup; call before deleting them"""
+    totals = db.execute(
+        select(Deal.pipeline_id, Deal.status, func.count(), func.coalesce(func.sum(Deal.value), 0.0))
+        .where(*criteria)
+        .group_by(Deal.pipeline_id, Deal.status)
+    )
+    apply_summary_deltas(db, {(pipeline_id, status): (-count, -total) for pipeline_id, status, count, total in totals})
+
+
+def get_pipeline_summaries(db: Session, pipeline_id: Optional[int] = None) -> List[PipelineSummary]:
+    """Rollup rows of one pipeline, or of all pipelines"""
+    query = select(PipelineSummary).order_by(PipelineSummary.pipeline_id)
+    if pipeline_id is not None:
+        query = query.where(PipelineSummary.pipeline_id == pipeline_id)
+    return list(db.scalars(query))
+
+
+def rebuild_pipeline_summaries(db: Session) -> int:
+    """Recompute the whole rollup from the deals table"""
+    db.execute(delete(PipelineSummary))
+    db.execute(
+        insert(PipelineSummary).from_select(
+            ["pipeline_id", "status", "deal_count", "total_value"],
+            select(Deal.pipeline_id, Deal.status, func.count(), func.coalesce(func.sum(Deal.value), 0.0))
+            .group_by(Deal.pipeline_id, Deal.status)
+        )
+    )
     db.commit()
-    return True
+    return db.scalar(select(func.count()).select_from(PipelineSummary))
 
 
 # Task CRUD
@@ -160,40 +307,187 @@ def create_task(db: Session, task: TaskCreate) -> Task:
 
 def get_task(db: Session, task_id: int) -> Optional[Task]:
     """Get task by ID"""
-    return db.query(Task).filter(Task.id == task_id).first()
+    return _cached_get(db, Task, task_id)
+
+
+def get_tasks(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Task]:
+    """Get all tasks with offset or keyset pagination"""
+    query = db.query(Task)
+    if after_id is not None:
+        query = query.filter(Task.id > after_id)
+    return query.order_by(Task.id).offset(skip).limit(limit).all()
+
+
+def tasks_query(
+    *entities,
+    sort: Sort = Sort(),
+    after_id: Optional[int] = None,
+    after_value=None,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    contact_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+) -> Select:
+    """Filtered and sorted task listing over Task or a subset of its columns"""
+    query = select(*(entities or (Task,)))
+    if status is not None:
+        query = query.where(Task.status == status)
+    if priority is not None:
+        query = query.where(Task.priority == priority)
+    if contact_id is not None:
+        query = query.where(Task.contact_id == contact_id)
+    if due_after is not None:
+        query = query.where(Task.due_date >= due_after)
+    if due_before is not None:
+        query = query.where(Task.due_date < due_before)
+    if after_id is not None:
+        query = query.where(sort.after(Task, after_id, sort.load_value(Task, after_value)))
+    return query.order_by(*sort.order_by(Task))
+
+
+# Bulk operations
+def _chunks(items: list, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _write_in_chunks(
+    db: Session,
+    items: Dict[int, dict],
+    write_chunk: Callable[[List[Tuple[int, dict]]], List[BulkItemResult]]
+) -> List[BulkItemResult]:
+    """Write rows one multi-row statement per chunk, isolating failing rows"""
+    results = []
+    for chunk in _chunks(list(items.items())):
+        try:
+            with db.begin_nested():
+                results.extend(write_chunk(chunk))
+        except SQLAlchemyError:
+            # Replay the failed chunk row by row so only the offending rows are rejected
+            for entry in chunk:
+                try:
+                    with db.begin_nested():
+                        results.extend(write_chunk([entry]))
+                except SQLAlchemyError as e:
+                    results.append(BulkItemResult(index=entry[0], status="error", error=str(getattr(e, "orig", e))))
+    db.commit()
+    return results
+
+
+def _insert_chunk(db: Session, model) -> Callable[[List[Tuple[int, dict]]], List[BulkItemResult]]:
+    def write_chunk(chunk: List[Tuple[int, dict]]) -> List[BulkItemResult]:
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        ids = db.scalars(stmt, [row for _, row in chunk]).all()
+        return [BulkItemResult(index=index, id=id_, status="created") for (index, _), id_ in zip(chunk, ids)]
+    return write_chunk
+
+
+def supports_upsert(dialect: str) -> bool:
+    """Whether the dialect has INSERT ... ON CONFLICT"""
+    return dialect in UPSERT_INSERTS
+
+
+def _upsert_insert(db: Session):
+    """Dialect-specific INSERT construct supporting ON CONFLICT; check supports_upsert first"""
+    return UPSERT_INSERTS[db.get_bind().dialect.name]
+
+
+def bulk_create_contacts(db: Session, contacts: Dict[int, ContactCreate], upsert: bool = False) -> List[BulkItemResult]:
+    """Create contacts in chunked multi-row inserts, optionally upserting by email"""
+    results = []
+    rows, seen_emails = {}, set()
+    for index, contact in contacts.items():
+        if contact.email in seen_emails:
+            results.append(BulkItemResult(index=index, status="error", error="Duplicate email in batch"))
+            continue
+        seen_emails.add(contact.email)
+        rows[index] = contact.model_dump()
+
+    if not upsert:
+        return results + _write_in_chunks(db, rows, _insert_chunk(db, Contact))
+
+    insert_for_dialect = _upsert_insert(db)
+
+    def write_chunk(chunk: List[Tuple[int, dict]]) -> List[BulkItemResult]:
+        emails = [row["email"] for _, row in chunk]
+        existing = set(db.scalars(select(Contact.email).where(Contact.email.in_(emails))))
+        stmt = insert_for_dialect(Contact).values([row for _, row in chunk])
+        update_columns = {name: stmt.excluded[name] for name in chunk[0][1] if name != "email"}
+        update_columns["updated_at"] = datetime.utcnow()
+        stmt = stmt.on_conflict_do_update(index_elements=[Contact.email], set_=update_columns)
+        ids_by_email = dict(db.execute(stmt.returning(Contact.email, Contact.id)).tuples().all())
+        return [
+            BulkItemResult(
+                index=index,
+                id=ids_by_email[row["email"]],
+                status="updated" if row["email"] in existing else "created"
+            )
+            for index, row in chunk
+        ]
+
+    results += _write_in_chunks(db, rows, write_chunk)
+    entity_cache.invalidate(Contact, [result.id for result in results if result.status == "updated"])
+    return results
+
+
+def bulk_create_deals(db: Session, deals: Dict[int, DealCreate]) -> List[BulkItemResult]:
+    """Create deals in chunked multi-row inserts"""
+    rows = {index: deal.model_dump() for index, deal in deals.items()}
+    insert_chunk = _insert_chunk(db, Deal)
+    
+    def write_chunk(chunk: List[Tuple[int, dict]]) -> List[BulkItemResult]:
+        results = insert_chunk(chunk)
+        # Inside the chunk's savepoint, so the rollup only counts rows that were inserted
+        apply_summary_deltas(db, deal_deltas(added=[(row["pipeline_id"], row["status"], row["value"]) for _, row in chunk]))
+        return results
+    
+    return _write_in_chunks(db, rows, write_chunk)
+
+
+def bulk_create_tasks(db: Session, tasks: Dict[int, TaskCreate]) -> List[BulkItemResult]:
+    """Create tasks in chunked multi-row inserts"""
+    rows = {index: task.model_dump() for index, task in tasks.items()}
+    return _write_in_chunks(db, rows, _insert_chunk(db, Task))
+
+
+def _bulk_delete(db: Session, model, ids: List[int], children: Tuple = ()) -> List[BulkItemResult]:
+    """Delete rows by id in chunked DELETE ... RETURNING statements"""
+    deleted, invalidated = set(), []
+    for chunk in _chunks(list(dict.fromkeys(ids))):
+        # Core deletes bypass ORM cascades, so remove dependent rows explicitly
+        for child, foreign_key in children:
+            if child is Deal:
+                subtract_deals_from_summaries(db, foreign_key.in_(chunk))
+            child_ids = db.scalars(
+                delete(child).where(foreign_key.in_(chunk)).returning(child.id),
+                execution_options={"synchronize_session": False}
+            )
+            invalidated.append((child, list(child_ids)))
+        if model is Deal:
+            subtract_deals_from_summaries(db, Deal.id.in_(chunk))
+        stmt = delete(model).where(model.id.in_(chunk)).returning(model.id)
+        deleted.update(db.scalars(stmt, execution_options={"synchronize_session": False}))
+    db.commit()
+    entity_cache.invalidate(model, deleted)
+    for child, child_ids in invalidated:
+        entity_cache.invalidate(child, child_ids)
+    return [
+        BulkItemResult(index=index, id=id_, status="deleted" if id_ in deleted else "not_found")
+        for index, id_ in enumerate(ids)
+    ]
 
 
-def get_tasks(db: Session, skip: int = 0, limit: int = 100) -> List[Task]:
-    """Get all tasks with pagination"""
-    return db.query(Task).offset(skip).limit(limit).all()
+def bulk_delete_contacts(db: Session, contact_ids: List[int]) -> List[BulkItemResult]:
+    """Delete contacts together with their deals and tasks"""
+    return _bulk_delete(db, Contact, contact_ids, children=((Deal, Deal.contact_id), (Task, Task.contact_id)))
 
 
-def update_task(db: Session, task_id: int, task: TaskUpdate) -> Optional[Task]:
-    """Update task"""
-    db_task = get_task(db, task_id)
-    if db_task is None:
-        return None
-    
-    update_data = task.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
-    
-    # Mark as completed if status changed to completed
-    if task.status and task.status.value == "completed" and not db_task.is_completed:
-        db_task.is_completed = True
-        db_task.completed_at = datetime.utcnow()
-    
-    db_task.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_task)
-    return db_task
+def bulk_delete_deals(db: Session, deal_ids: List[int]) -> List[BulkItemResult]:
+    """Delete deals"""
+    return _bulk_delete(db, Deal, deal_ids)
 
 
-def delete_task(db: Session, task_id: int) -> bool:
-    """Delete task"""
-    db_task = get_task(db, task_id)
-    if db_task is None:
-        return False
-    db.delete(db_task)
-    db.commit()
-    return True
+def bulk_delete_tasks(db: Session, task_ids: List[int]) -> List[BulkItemResult]:
+    """Delete tasks"""
+    return _bulk_delete(db, Task, task_ids)
@@ -0,0 +1,55 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, Optional, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import Row
+
+ETAG_HEADER = "ETag"
+
+
+def _isoformat(value: Optional[datetime]) -> str:
+    return value.isoformat() if value else ""
+
+
+def _related_updated_at(row: Any, name: str) -> Optional[datetime]:
+    # Version rows carry <relation>_updated_at columns; entities carry the loaded relation itself
+    if isinstance(row, Row):
+        return getattr(row, f"{name}_updated_at")
+    related = getattr(row, name)
+    return related.updated_at if related is not None else None
+
+
+def make_etag(request: Request, versions: Iterable[Any], include: Sequence[str] = ()) -> str:
+    """Strong ETag over the request's representation options and the updated_at of every row (and included row) in it"""
+    digest = hashlib.sha1(f"{request.url.path}?{request.url.query}".encode())
+    for row in versions:
+        digest.update(f"|{row.id}:{_isoformat(row.updated_at)}".encode())
+        for name in include:
+            digest.update(f",{name}:{_isoformat(_related_updated_at(row, name))}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether If-None-Match already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def not_modified_response(request: Request, versions: Iterable[Any], include: Sequence[str] = ()) -> Optional[Response]:
+    """A 304 response when the client's copy matches the current versions, else None"""
+    etag = make_etag(request, versions, include)
+    if not is_not_modified(request, etag):
+        return None
+    return Response(status_code=304, headers={ETAG_HEADER: etag, "Cache-Control": "no-cache"})
+
+
+def set_etag(request: Request, response: Response, versions: Iterable[Any], include: Sequence[str] = ()) -> None:
+    """Tag a 200 response; no-cache makes browsers revalidate it on every poll"""
+    response.headers[ETAG_HEADER] = make_etag(request, versions, include)
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,69 @@
+import csv
+import io
+from enum import Enum
+from typing import AsyncIterator, List, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select
+
+from ..database import AsyncSessionLocal
+from ..models import Contact, Deal, Task
+from ..schemas import ContactResponse, DealResponse, TaskResponse
+
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORTABLE = {
+    "contacts": (Contact, ContactResponse),
+    "deals": (Deal, DealResponse),
+    "tasks": (Task, TaskResponse),
+}
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+async def _stream_batches(model, schema: Type[BaseModel]) -> AsyncIterator[List[BaseModel]]:
+    """Read rows through a server-side cursor, one batch at a time"""
+    # The generator outlives the request dependencies, so it owns its session
+    async with AsyncSessionLocal() as db:
+        query = select(model).order_by(model.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        result = await db.stream_scalars(query)
+        async for partition in result.partitions():
+            yield [schema.model_validate(row) for row in partition]
+
+
+async def _ndjson_lines(model, schema: Type[BaseModel]) -> AsyncIterator[str]:
+    async for batch in _stream_batches(model, schema):
+        yield "".join(item.model_dump_json() + "\n" for item in batch)
+
+
+async def _csv_lines(model, schema: Type[BaseModel]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(schema.model_fields))
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for batch in _stream_batches(model, schema):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(item.model_dump(mode="json") for item in batch)
+        yield buffer.getvalue()
+
+
+def export_response(name: str, format: ExportFormat) -> StreamingResponse:
+    """Stream every row of a table as NDJSON or CSV in constant memory"""
+    model, schema = EXPORTABLE[name]
+    lines = _ndjson_lines if format == ExportFormat.NDJSON else _csv_lines
+    return StreamingResponse(
+        lines(model, schema),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'}
+    )
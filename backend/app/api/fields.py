@@ -0,0 +1,78 @@
+import functools
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+# Many-to-one relations that include= may embed
+DEAL_RELATIONS = ("contact", "pipeline")
+TASK_RELATIONS = ("contact",)
+
+
+@functools.lru_cache(maxsize=256)
+def _partial_model(model: Type[BaseModel], names: Tuple[str, ...]) -> Type[BaseModel]:
+    """Response model with only the named fields of `model`, built once per selection"""
+    fields = {name: (model.model_fields[name].annotation, model.model_fields[name]) for name in names}
+    return create_model(f"{model.__name__}Fields", __config__=ConfigDict(from_attributes=True), **fields)
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+@functools.lru_cache(maxsize=256)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+class FieldSet:
+    """A validated `fields=`/`include=` selection: the columns and relations to load and the slimmer model to serialize them with"""
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        names: Tuple[str, ...],
+        include: Tuple[str, ...] = (),
+        columns: Optional[Tuple[str, ...]] = None,
+    ):
+        self.names = names
+        self.include = include
+        # Columns to restrict loading to; None loads them all
+        self.columns = columns
+        self.model = _partial_model(model, names + include)
+
+    @classmethod
+    def parse(
+        cls,
+        value: Optional[str],
+        model: Type[BaseModel],
+        include: Optional[str] = None,
+        relations: Sequence[str] = (),
+    ) -> Optional["FieldSet"]:
+        if not value and not include:
+            return None
+        own = [name for name in model.model_fields if name not in relations]
+        requested = _split(value) or own
+        unknown = [name for name in requested if name not in own]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(own)}",
+            )
+        included = _split(include)
+        unknown = [name for name in included if name not in relations]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot include {', '.join(unknown)}; choose from {', '.join(relations) or 'nothing'}",
+            )
+        # id is always returned; pagination cursors and ETags are built on it
+        names = tuple(dict.fromkeys(["id", *requested]))
+        return cls(model, names, tuple(dict.fromkeys(included)), names if value else None)
+
+    def render(self, items: Sequence[Any]) -> Response:
+        adapter = _list_adapter(self.model)
+        return Response(adapter.dump_json(adapter.validate_python(items, from_attributes=True)), media_type="application/json")
+
+    def render_one(self, item: Any) -> Response:
+        return Response(self.model.model_validate(item).model_dump_json(), media_type="application/json")
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, and_, or_, tuple_
+
+DEAL_SORT_FIELDS = ("id", "value", "created_at", "updated_at")
+TASK_SORT_FIELDS = ("id", "due_date", "created_at", "updated_at")
+
+
+class Sort:
+    """Whitelisted list ordering: one column ascending with NULLs last, or its exact reverse, tie-broken by id.
+
+    Composite indexes ending in (column, id) serve both directions, and the
+    keyset criterion continues a page from the last row's (value, id).
+    """
+
+    def __init__(self, field: str = "id", descending: bool = False):
+        self.field = field
+        self.descending = descending
+
+    @classmethod
+    def parse(cls, value: str, allowed: Sequence[str]) -> "Sort":
+        field = value.removeprefix("-")
+        if field not in allowed:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot sort by '{field}'; use one of {', '.join(allowed)}, prefixed with - for descending",
+            )
+        return cls(field, value.startswith("-"))
+
+    def __str__(self) -> str:
+        return f"-{self.field}" if self.descending else self.field
+
+    def column(self, model):
+        return getattr(model, self.field)
+
+    def order_by(self, model) -> list:
+        if self.field == "id":
+            return [model.id.desc() if self.descending else model.id.asc()]
+        if self.descending:
+            return [self.column(model).desc().nulls_first(), model.id.desc()]
+        return [self.column(model).asc().nulls_last(), model.id.asc()]
+
+    def after(self, model, after_id: int, after_value: Any = None):
+        """Criterion for the rows that follow (after_value, after_id) in this ordering"""
+        column = self.column(model)
+        if self.field == "id":
+            return model.id < after_id if self.descending else model.id > after_id
+        if self.descending:
+            if after_value is None:
+                return or_(and_(column.is_(None), model.id < after_id), column.is_not(None))
+            return tuple_(column, model.id) < tuple_(after_value, after_id)
+        if after_value is None:
+            return and_(column.is_(None), model.id > after_id)
+        return or_(tuple_(column, model.id) > tuple_(after_value, after_id), column.is_(None))
+
+    def load_value(self, model, value: Any) -> Any:
+        """Sort value from a cursor back to the column's Python type"""
+        if value is not None and isinstance(self.column(model).type, DateTime):
+            return datetime.fromisoformat(value)
+        return value
+
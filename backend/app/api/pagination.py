@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(type(value))
+
+
+def encode_cursor(last_id: int, sort: Optional[str] = None, value: Any = None) -> str:
+    """Encode the last seen primary key, and its sort value for ordered lists, as an opaque cursor"""
+    payload: Dict[str, Any] = {"id": last_id}
+    if sort is not None:
+        payload.update(sort=sort, value=value)
+    raw = json.dumps(payload, separators=(",", ":"), default=_encode_value).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _load_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(payload["id"], int):
+            raise ValueError(payload)
+        return payload
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decode an opaque cursor back to the last seen primary key"""
+    if not cursor:
+        return None
+    return _load_cursor(cursor)["id"]
+
+
+def decode_sort_cursor(cursor: Optional[str], sort: str) -> Tuple[Optional[int], Any]:
+    """Decode a cursor issued for the given sort order back to the last seen (id, sort value)"""
+    if not cursor:
+        return None, None
+    payload = _load_cursor(cursor)
+    if payload.get("sort", "id") != sort:
+        raise HTTPException(status_code=400, detail="Pagination cursor belongs to a different sort order")
+    return payload["id"], payload.get("value")
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int, sort: Optional[str] = None) -> None:
+    """Expose the cursor for the following page when the current page is full"""
+    if limit > 0 and len(items) == limit:
+        last = items[-1]
+        if sort is None or sort == "id":
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.id)
+        else:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.id, sort, getattr(last, sort.removeprefix("-")))
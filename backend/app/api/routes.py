@@ -1,179 +1,579 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-
-from ..database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from functools import partial
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+import json
+
+from ..database import get_async_db
+from ..models.pipeline import DealStatus
+from ..models.task import TaskPriority, TaskStatus
 from ..schemas import (
     ContactCreate, ContactUpdate, ContactResponse,
     PipelineCreate, PipelineUpdate, PipelineResponse,
-    DealCreate, DealUpdate, DealResponse,
-    TaskCreate, TaskUpdate, TaskResponse,
-    ChatMessage, ChatResponse
+    DealStatusSummary, PipelineSummaryResponse, PipelinesSummaryResponse,
+    DealCreate, DealUpdate, DealResponse, DealWithRelationsResponse,
+    TaskCreate, TaskUpdate, TaskResponse, TaskWithRelationsResponse,
+    ChatMessage, ChatResponse,
+    BulkCreateRequest, ContactBulkCreateRequest, BulkDeleteRequest,
+    BulkItemResult, BulkResponse
 )
-from . import crud
+from . import async_crud, crud
+from .cache import entity_cache
+from .etag import not_modified_response, set_etag
+from .export import ExportFormat, export_response
+from .fields import DEAL_RELATIONS, TASK_RELATIONS, FieldSet
+from .filters import DEAL_SORT_FIELDS, TASK_SORT_FIELDS, Sort
+from .pagination import decode_cursor, decode_sort_cursor, set_next_cursor
 from ..services.ai_agent import ai_agent
+from ..services.inference import InferenceCancelled, InferenceQueueFull, InferenceTimeout, inference_worker
 
 router = APIRouter()
 
+
+async def _conditional_page(
+    request: Request,
+    response: Response,
+    limit: int,
+    versions,
+    page,
+    sort: Optional[str] = None,
+    fields: Optional[FieldSet] = None,
+):
+    """Answer 304 from the page's (id, updated_at) alone when the client's copy is current, else load and tag the page"""
+    include = fields.include if fields is not None else ()
+    if request.headers.get("if-none-match"):
+        current = await versions()
+        not_modified = not_modified_response(request, current, include)
+        if not_modified is not None:
+            set_next_cursor(not_modified, current, limit, sort)
+            return not_modified
+    items = await page()
+    if fields is not None:
+        response = fields.render(items)
+    set_next_cursor(response, items, limit, sort)
+    set_etag(request, response, items, include)
+    return response if fields is not None else items
+
+
+def _conditional_entity(request: Request, response: Response, instance, fields: Optional[FieldSet] = None):
+    """304 when If-None-Match names the instance's current ETag, else tag the response and return it"""
+    include = fields.include if fields is not None else ()
+    not_modified = not_modified_response(request, [instance], include)
+    if not_modified is not None:
+        return not_modified
+    if fields is not None:
+        response = fields.render_one(instance)
+    set_etag(request, response, [instance], include)
+    return response if fields is not None else instance
+
+
+def _validate_bulk_items(schema: Type[BaseModel], items: List[Dict[str, Any]]):
+    """Validate bulk rows individually, collecting per-row errors"""
+    valid, errors = {}, []
+    for index, item in enumerate(items):
+        try:
+            valid[index] = schema.model_validate(item)
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            errors.append(BulkItemResult(index=index, status="error", error=message))
+    return valid, errors
+
+
+def _bulk_response(results: List[BulkItemResult]) -> BulkResponse:
+    results = sorted(results, key=lambda result: result.index)
+    counts = {status: 0 for status in ("created", "updated", "deleted", "error")}
+    for result in results:
+        if result.status in counts:
+            counts[result.status] += 1
+    return BulkResponse(
+        created=counts["created"],
+        updated=counts["updated"],
+        deleted=counts["deleted"],
+        failed=counts["error"],
+        results=results
+    )
+
+
 # Contact endpoints
 @router.post("/contacts", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
-def create_contact(contact: ContactCreate, db: Session = Depends(get_db)):
+async def create_contact(contact: ContactCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new contact"""
-    return crud.create_contact(db, contact)
+    return await async_crud.create_contact(db, contact)
+
+
+@router.post("/contacts/bulk", response_model=BulkResponse)
+async def bulk_create_contacts(request: ContactBulkCreateRequest, db: AsyncSession = Depends(get_async_db)):
+    """Create contacts in batches, upserting by email when requested"""
+    dialect = db.bind.dialect.name
+    if request.upsert and not crud.supports_upsert(dialect):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Bulk upsert is not supported on {dialect}; send upsert=false"
+        )
+    valid, errors = _validate_bulk_items(ContactCreate, request.items)
+    return _bulk_response(errors + await async_crud.bulk_create_contacts(db, valid, upsert=request.upsert))
+
+
+@router.post("/contacts/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_contacts(request: BulkDeleteRequest, db: AsyncSession = Depends(get_async_db)):
+    """Delete contacts in batches"""
+    return _bulk_response(await async_crud.bulk_delete_contacts(db, request.ids))
 
 
 @router.get("/contacts", response_model=List[ContactResponse])
-def get_contacts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all contacts"""
-    return crud.get_contacts(db, skip=skip, limit=limit)
+async def get_contacts(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,first_name,email"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all contacts; pass the X-Next-Cursor header back as `after` for the next page"""
+    projection = FieldSet.parse(fields, ContactResponse)
+    after_id = decode_cursor(after)
+    return await _conditional_page(
+        request, response, limit,
+        versions=lambda: async_crud.get_contact_versions(db, skip=skip, limit=limit, after_id=after_id),
+        page=lambda: async_crud.get_contacts(
+            db, skip=skip, limit=limit, after_id=after_id, fields=projection.columns if projection else None
+        ),
+        fields=projection,
+    )
+
+
+@router.get("/contacts/search", response_model=List[ContactResponse])
+async def search_contacts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search contacts by name, email, company and notes, best matches first"""
+    return await async_crud.search_contacts(db, q, limit)
+
+
+@router.get("/contacts/export", response_class=StreamingResponse)
+async def export_contacts(format: ExportFormat = ExportFormat.NDJSON):
+    """Stream all contacts as NDJSON or CSV"""
+    return export_response("contacts", format)
 
 
 @router.get("/contacts/{contact_id}", response_model=ContactResponse)
-def get_contact(contact_id: int, db: Session = Depends(get_db)):
+async def get_contact(
+    contact_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,first_name,email"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get a specific contact"""
-    contact = crud.get_contact(db, contact_id)
+    contact = await async_crud.get_contact(db, contact_id)
     if contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
+    return _conditional_entity(request, response, contact, FieldSet.parse(fields, ContactResponse))
 
 
 @router.put("/contacts/{contact_id}", response_model=ContactResponse)
-def update_contact(contact_id: int, contact: ContactUpdate, db: Session = Depends(get_db)):
+@router.patch("/contacts/{contact_id}", response_model=ContactResponse)
+async def update_contact(contact_id: int, contact: ContactUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a contact"""
-    updated_contact = crud.update_contact(db, contact_id, contact)
+    updated_contact = await async_crud.update_contact(db, contact_id, contact)
     if updated_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
     return updated_contact
 
 
 @router.delete("/contacts/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_contact(contact_id: int, db: Session = Depends(get_db)):
+async def delete_contact(contact_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a contact"""
-    if not crud.delete_contact(db, contact_id):
+    if not await async_crud.delete_contact(db, contact_id):
         raise HTTPException(status_code=404, detail="Contact not found")
     return None
 
 
 # Pipeline endpoints
 @router.post("/pipelines", response_model=PipelineResponse, status_code=status.HTTP_201_CREATED)
-def create_pipeline(pipeline: PipelineCreate, db: Session = Depends(get_db)):
+async def create_pipeline(pipeline: PipelineCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new pipeline"""
-    return crud.create_pipeline(db, pipeline)
+    return await async_crud.create_pipeline(db, pipeline)
 
 
 @router.get("/pipelines", response_model=List[PipelineResponse])
-def get_pipelines(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all pipelines"""
-    return crud.get_pipelines(db, skip=skip, limit=limit)
+async def get_pipelines(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all pipelines; pass the X-Next-Cursor header back as `after` for the next page"""
+    projection = FieldSet.parse(fields, PipelineResponse)
+    after_id = decode_cursor(after)
+    return await _conditional_page(
+        request, response, limit,
+        versions=lambda: async_crud.get_pipeline_versions(db, skip=skip, limit=limit, after_id=after_id),
+        page=lambda: async_crud.get_pipelines(
+            db, skip=skip, limit=limit, after_id=after_id, fields=projection.columns if projection else None
+        ),
+        fields=projection,
+    )
+
+
+def _status_summaries(rows) -> List[DealStatusSummary]:
+    """One entry per deal status, summing rollup rows and filling in statuses without deals"""
+    totals = {status: DealStatusSummary(status=status) for status in DealStatus}
+    for row in rows:
+        totals[row.status].deal_count += row.deal_count
+        totals[row.status].total_value += row.total_value
+    return list(totals.values())
+
+
+def _pipeline_summary(pipeline_id: int, rows) -> PipelineSummaryResponse:
+    statuses = _status_summaries(rows)
+    return PipelineSummaryResponse(
+        pipeline_id=pipeline_id,
+        deal_count=sum(s.deal_count for s in statuses),
+        total_value=sum(s.total_value for s in statuses),
+        statuses=statuses
+    )
+
+
+@router.get("/pipelines/summary", response_model=PipelinesSummaryResponse)
+async def get_pipelines_summary(db: AsyncSession = Depends(get_async_db)):
+    """Deal count and value per status for every pipeline with deals, and across all of them"""
+    rows = await async_crud.get_pipeline_summaries(db)
+    by_pipeline: Dict[int, list] = {}
+    for row in rows:
+        by_pipeline.setdefault(row.pipeline_id, []).append(row)
+    pipelines = [_pipeline_summary(pipeline_id, pipeline_rows) for pipeline_id, pipeline_rows in by_pipeline.items()]
+    statuses = _status_summaries(rows)
+    return PipelinesSummaryResponse(
+        deal_count=sum(s.deal_count for s in statuses),
+        total_value=sum(s.total_value for s in statuses),
+        statuses=statuses,
+        pipelines=pipelines
+    )
+
+
+@router.get("/pipelines/{pipeline_id}/summary", response_model=PipelineSummaryResponse)
+async def get_pipeline_summary(pipeline_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Deal count and value per status for a pipeline"""
+    if await async_crud.get_pipeline(db, pipeline_id) is None:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+    return _pipeline_summary(pipeline_id, await async_crud.get_pipeline_summaries(db, pipeline_id))
 
 
 @router.get("/pipelines/{pipeline_id}", response_model=PipelineResponse)
-def get_pipeline(pipeline_id: int, db: Session = Depends(get_db)):
+async def get_pipeline(
+    pipeline_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get a specific pipeline"""
-    pipeline = crud.get_pipeline(db, pipeline_id)
+    pipeline = await async_crud.get_pipeline(db, pipeline_id)
     if pipeline is None:
         raise HTTPException(status_code=404, detail="Pipeline not found")
-    return pipeline
+    return _conditional_entity(request, response, pipeline, FieldSet.parse(fields, PipelineResponse))
 
 
 @router.put("/pipelines/{pipeline_id}", response_model=PipelineResponse)
-def update_pipeline(pipeline_id: int, pipeline: PipelineUpdate, db: Session = Depends(get_db)):
+@router.patch("/pipelines/{pipeline_id}", response_model=PipelineResponse)
+async def update_pipeline(pipeline_id: int, pipeline: PipelineUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a pipeline"""
-    updated_pipeline = crud.update_pipeline(db, pipeline_id, pipeline)
+    updated_pipeline = await async_crud.update_pipeline(db, pipeline_id, pipeline)
     if updated_pipeline is None:
         raise HTTPException(status_code=404, detail="Pipeline not found")
     return updated_pipeline
 
 
 @router.delete("/pipelines/{pipeline_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_pipeline(pipeline_id: int, db: Session = Depends(get_db)):
+async def delete_pipeline(pipeline_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a pipeline"""
-    if not crud.delete_pipeline(db, pipeline_id):
+    if not await async_crud.delete_pipeline(db, pipeline_id):
         raise HTTPException(status_code=404, detail="Pipeline not found")
     return None
 
 
 # Deal endpoints
 @router.post("/deals", response_model=DealResponse, status_code=status.HTTP_201_CREATED)
-def create_deal(deal: DealCreate, db: Session = Depends(get_db)):
+async def create_deal(deal: DealCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new deal"""
-    return crud.create_deal(db, deal)
+    return await async_crud.create_deal(db, deal)
+
+
+@router.post("/deals/bulk", response_model=BulkResponse)
+async def bulk_create_deals(request: BulkCreateRequest, db: AsyncSession = Depends(get_async_db)):
+    """Create deals in batches"""
+    valid, errors = _validate_bulk_items(DealCreate, request.items)
+    return _bulk_response(errors + await async_crud.bulk_create_deals(db, valid))
+
+
+@router.post("/deals/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_deals(request: BulkDeleteRequest, db: AsyncSession = Depends(get_async_db)):
+    """Delete deals in batches"""
+    return _bulk_response(await async_crud.bulk_delete_deals(db, request.ids))
 
 
 @router.get("/deals", response_model=List[DealResponse])
-def get_deals(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all deals"""
-    return crud.get_deals(db, skip=skip, limit=limit)
+async def get_deals(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    pipeline_id: Optional[int] = None,
+    deal_status: Optional[DealStatus] = Query(None, alias="status"),
+    sort: str = Query("id", description=f"One of {', '.join(DEAL_SORT_FIELDS)}; prefix with - for descending"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,value,status"),
+    include: Optional[str] = Query(None, description="Related objects to embed: contact,pipeline"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get deals, optionally filtered and sorted; pass the X-Next-Cursor header back as `after` for the next page"""
+    projection = FieldSet.parse(fields, DealWithRelationsResponse, include, DEAL_RELATIONS)
+    order = Sort.parse(sort, DEAL_SORT_FIELDS)
+    after_id, after_value = decode_sort_cursor(after, str(order))
+    params = dict(
+        skip=skip, limit=limit, after_id=after_id, after_value=after_value, sort=order,
+        pipeline_id=pipeline_id, status=deal_status,
+        include=projection.include if projection else (),
+    )
+    return await _conditional_page(
+        request, response, limit,
+        versions=lambda: async_crud.get_deal_versions(db, **params),
+        page=lambda: async_crud.get_deals(db, fields=projection.columns if projection else None, **params),
+        sort=str(order),
+        fields=projection,
+    )
+
+
+@router.get("/deals/export", response_class=StreamingResponse)
+async def export_deals(format: ExportFormat = ExportFormat.NDJSON):
+    """Stream all deals as NDJSON or CSV"""
+    return export_response("deals", format)
 
 
 @router.get("/deals/{deal_id}", response_model=DealResponse)
-def get_deal(deal_id: int, db: Session = Depends(get_db)):
+async def get_deal(
+    deal_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,value,status"),
+    include: Optional[str] = Query(None, description="Related objects to embed: contact,pipeline"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get a specific deal"""
-    deal = crud.get_deal(db, deal_id)
+    deal = await async_crud.get_deal(db, deal_id)
     if deal is None:
         raise HTTPException(status_code=404, detail="Deal not found")
-    return deal
+    projection = FieldSet.parse(fields, DealWithRelationsResponse, include, DEAL_RELATIONS)
+    if projection is not None:
+        await async_crud.load_included(db, deal, projection.include)
+    return _conditional_entity(request, response, deal, projection)
 
 
 @router.put("/deals/{deal_id}", response_model=DealResponse)
-def update_deal(deal_id: int, deal: DealUpdate, db: Session = Depends(get_db)):
+@router.patch("/deals/{deal_id}", response_model=DealResponse)
+async def update_deal(deal_id: int, deal: DealUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a deal"""
-    updated_deal = crud.update_deal(db, deal_id, deal)
+    updated_deal = await async_crud.update_deal(db, deal_id, deal)
     if updated_deal is None:
         raise HTTPException(status_code=404, detail="Deal not found")
     return updated_deal
 
 
 @router.delete("/deals/{deal_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_deal(deal_id: int, db: Session = Depends(get_db)):
+async def delete_deal(deal_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a deal"""
-    if not crud.delete_deal(db, deal_id):
+    if not await async_crud.delete_deal(db, deal_id):
         raise HTTPException(status_code=404, detail="Deal not found")
     return None
 
 
 # Task endpoints
 @router.post("/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(task: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task: TaskCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new task"""
-    return crud.create_task(db, task)
+    return await async_crud.create_task(db, task)
+
+
+@router.post("/tasks/bulk", response_model=BulkResponse)
+async def bulk_create_tasks(request: BulkCreateRequest, db: AsyncSession = Depends(get_async_db)):
+    """Create tasks in batches"""
+    valid, errors = _validate_bulk_items(TaskCreate, request.items)
+    return _bulk_response(errors + await async_crud.bulk_create_tasks(db, valid))
+
+
+@router.post("/tasks/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_tasks(request: BulkDeleteRequest, db: AsyncSession = Depends(get_async_db)):
+    """Delete tasks in batches"""
+    return _bulk_response(await async_crud.bulk_delete_tasks(db, request.ids))
 
 
 @router.get("/tasks", response_model=List[TaskResponse])
-def get_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all tasks"""
-    return crud.get_tasks(db, skip=skip, limit=limit)
+async def get_tasks(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    task_status: Optional[TaskStatus] = Query(None, alias="status"),
+    priority: Optional[TaskPriority] = None,
+    contact_id: Optional[int] = None,
+    due_after: Optional[datetime] = Query(None, description="Tasks due at or after this time"),
+    due_before: Optional[datetime] = Query(None, description="Tasks due before this time"),
+    sort: str = Query("id", description=f"One of {', '.join(TASK_SORT_FIELDS)}; prefix with - for descending"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status,due_date"),
+    include: Optional[str] = Query(None, description="Related objects to embed: contact"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get tasks, optionally filtered and sorted; pass the X-Next-Cursor header back as `after` for the next page"""
+    projection = FieldSet.parse(fields, TaskWithRelationsResponse, include, TASK_RELATIONS)
+    order = Sort.parse(sort, TASK_SORT_FIELDS)
+    after_id, after_value = decode_sort_cursor(after, str(order))
+    params = dict(
+        skip=skip, limit=limit, after_id=after_id, after_value=after_value, sort=order,
+        status=task_status, priority=priority, contact_id=contact_id, due_after=due_after, due_before=due_before,
+        include=projection.include if projection else (),
+    )
+    return await _conditional_page(
+        request, response, limit,
+        versions=lambda: async_crud.get_task_versions(db, **params),
+        page=lambda: async_crud.get_tasks(db, fields=projection.columns if projection else None, **params),
+        sort=str(order),
+        fields=projection,
+    )
+
+
+@router.get("/tasks/export", response_class=StreamingResponse)
+async def export_tasks(format: ExportFormat = ExportFormat.NDJSON):
+    """Stream all tasks as NDJSON or CSV"""
+    return export_response("tasks", format)
 
 
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, db: Session = Depends(get_db)):
+async def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status,due_date"),
+    include: Optional[str] = Query(None, description="Related objects to embed: contact"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get a specific task"""
-    task = crud.get_task(db, task_id)
+    task = await async_crud.get_task(db, task_id)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    projection = FieldSet.parse(fields, TaskWithRelationsResponse, include, TASK_RELATIONS)
+    if projection is not None:
+        await async_crud.load_included(db, task, projection.include)
+    return _conditional_entity(request, response, task, projection)
 
 
 @router.put("/tasks/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, task: TaskUpdate, db: Session = Depends(get_db)):
+@router.patch("/tasks/{task_id}", response_model=TaskResponse)
+async def update_task(task_id: int, task: TaskUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a task"""
-    updated_task = crud.update_task(db, task_id, task)
+    updated_task = await async_crud.update_task(db, task_id, task)
     if updated_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     return updated_task
 
 
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(task_id: int, db: Session = Depends(get_db)):
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a task"""
-    if not crud.delete_task(db, task_id):
+    if not await async_crud.delete_task(db, task_id):
         raise HTTPException(status_code=404, detail="Task not found")
     return None
 
 
-# AI Chat endpoint
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit, miss and eviction counters of the entity cache"""
+    return await entity_cache.astats()
+
+
+# AI Chat endpoints
+MODEL_LOADING_RETRY_AFTER = 10
+
+
+def _require_model() -> None:
+    """Start loading the model if needed and reject chat until it is ready"""
+    if ai_agent.start_loading() == "loading":
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI model is loading, please retry later",
+            headers={"Retry-After": str(MODEL_LOADING_RETRY_AFTER)}
+        )
+
+
+def _agent_busy(error: InferenceQueueFull) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="AI agent is busy, please retry later",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
 @router.post("/chat", response_model=ChatResponse)
-def chat(message: ChatMessage):
+async def chat(message: ChatMessage, request: Request):
     """Send a message to the AI agent"""
-    result = ai_agent.process_message(message.message)
+    if ai_agent.is_fast_path(message.message):
+        # Routed commands only touch the database, so they skip the inference queue
+        result = await run_in_threadpool(ai_agent.process_message, message.message, message.session_id)
+        return ChatResponse(**result)
+    _require_model()
+    try:
+        result = await inference_worker.run(
+            partial(ai_agent.process_message, message.message, message.session_id),
+            is_disconnected=request.is_disconnected
+        )
+    except InferenceQueueFull as e:
+        raise _agent_busy(e)
+    except InferenceTimeout:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI agent timed out")
+    except InferenceCancelled:
+        raise HTTPException(status_code=499, detail="Client closed request")
     return ChatResponse(**result)
+
+
+@router.get("/chat/stats")
+async def chat_stats():
+    """Model state, prompt prefix cache and tool calling statistics for the AI agent"""
+    return {
+        "model": ai_agent.model_status(),
+        "prompt_cache": ai_agent.prompt_cache_stats(),
+        "tool_calls": ai_agent.tool_call_stats()
+    }
+
+
+@router.post("/chat/stream", response_class=StreamingResponse)
+async def chat_stream(message: ChatMessage):
+    """Stream the AI agent's tokens, tool calls and final answer as Server-Sent Events"""
+    if not ai_agent.is_fast_path(message.message):
+        _require_model()
+    try:
+        agent_events = ai_agent.stream_message(message.message, message.session_id)
+    except InferenceQueueFull as e:
+        raise _agent_busy(e)
+    
+    async def events():
+        async for event in agent_events:
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,27 @@
+"""Maintenance commands, run as `python -m app.cli <command>` from the backend directory"""
+import argparse
+
+from . import models  # noqa: F401  (registers the tables)
+from .api import crud
+from .database import SessionLocal
+
+
+def rebuild_pipeline_summaries(args: argparse.Namespace) -> None:
+    """Recompute the pipeline summary rollup from the deals table"""
+    with SessionLocal() as db:
+        rows = crud.rebuild_pipeline_summaries(db)
+    print(f"Rebuilt pipeline summaries: {rows} rows")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="CRM maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "rebuild-pipeline-summaries", help=rebuild_pipeline_summaries.__doc__
+    ).set_defaults(handler=rebuild_pipeline_summaries)
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
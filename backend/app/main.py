@@ -1,33 +1,24 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from prometheus_client import CONTENT_TYPE_LATEST
 from contextlib import asynccontextmanager
 import logging
 import os
 import time
+import uuid
 
-from .database import init_db
+from .database import async_engine, init_db
+from .logging_config import RequestSampler, setup_logging
+from . import metrics, profiling
 from .api.routes import router
 from .services.ai_agent import ai_agent
+from .services.inference import inference_worker
 
-# Configure logging
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-
-# Create logs directory if it doesn't exist
-log_dir = "logs"
-os.makedirs(log_dir, exist_ok=True)
-
-# Setup logging handlers
-handlers = [
-    logging.StreamHandler(),
-    logging.FileHandler(os.path.join(log_dir, "app.log"))
-]
-
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=handlers
-)
+# Configure logging: records are queued and written to stdout and logs/app.log by a background thread
+log_queue_handler = setup_logging()
+request_sampler = RequestSampler.from_env()
 logger = logging.getLogger(__name__)
 
 
@@ -45,17 +36,20 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
     
-    logger.info("Initializing AI agent...")
-    if ai_agent.initialize():
-        logger.info("AI agent initialized successfully.")
+    # The model loads in the background so CRUD traffic is served right away
+    if os.getenv("MODEL_PRELOAD", "true").lower() == "true":
+        logger.info("Loading AI agent in the background...")
+        ai_agent.start_loading()
     else:
-        logger.warning("AI agent initialization failed. Chat functionality will be limited.")
+        logger.info("AI agent will be loaded on the first chat request.")
     
     logger.info("Application startup complete.")
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    inference_worker.shutdown()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -73,33 +67,51 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Request-ID"],
 )
 
-# Request logging middleware
+# Request logging, metrics and SQL profiling middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Log request
-    logger.info(f"Request: {request.method} {request.url.path}")
+    start_time = time.perf_counter()
+    # Kept from a proxy that already assigned one, so its logs and ours can be joined
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    profile = profiling.start(request.method, request.scope)
     
     try:
         response = await call_next(request)
-        
-        # Log response
-        process_time = time.time() - start_time
-        logger.info(
-            f"Response: {request.method} {request.url.path} "
-            f"Status: {response.status_code} Duration: {process_time:.3f}s"
-        )
-        
-        return response
     except Exception as e:
-        logger.error(f"Request failed: {request.method} {request.url.path} Error: {str(e)}")
+        metrics.observe_request(request.method, metrics.route_label(request.scope), 500, time.perf_counter() - start_time)
+        logger.error(
+            "Request failed",
+            exc_info=True,
+            extra={"request_id": request_id, "method": request.method, "path": request.url.path, "error": str(e)},
+        )
         return JSONResponse(
             status_code=500,
-            content={"detail": "Internal server error"}
+            content={"detail": "Internal server error"},
+            headers={"X-Request-ID": request_id}
+        )
+    
+    duration = time.perf_counter() - start_time
+    duration_ms = duration * 1000
+    response.headers["X-Request-ID"] = request_id
+    metrics.observe_request(request.method, metrics.route_label(request.scope), response.status_code, duration)
+    if profile is not None:
+        profiling.finish(profile, response)
+    # One record per finished request; successful fast requests are sampled
+    if request_sampler.should_log(response.status_code, duration_ms):
+        logger.info(
+            "Request completed",
+            extra={
+                "request_id": request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 2),
+            },
         )
+    return response
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -124,7 +136,37 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus metrics: HTTP traffic, database pools and the AI agent"""
+    return Response(metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness probe: the database is reachable. The model state is reported, not required;
+    /chat answers 503 on its own while the model loads"""
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        database = "ok"
+    except Exception as e:
+        logger.error(f"Readiness check failed: {e}")
+        database = "unavailable"
+    ready = database == "ok"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "database": database, "model": ai_agent.model_status()}
+    )
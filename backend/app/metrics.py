@@ -0,0 +1,117 @@
+"""Prometheus metrics for HTTP traffic, the database pools and the AI agent.
+
+Everything lives in the default registry of this process and is served by
+GET /metrics. Pool gauges are read when the endpoint is scraped, so they add
+nothing to request handling.
+"""
+from prometheus_client import Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Any, Dict, Iterator, Tuple
+import time
+
+# HTTP
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0),
+)
+
+# Database pools
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection, including opening new ones", ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+# LLM and agent
+LLM_PROMPT_TOKENS = Counter("llm_prompt_tokens_total", "Prompt tokens sent to the model")
+LLM_COMPLETION_TOKENS = Counter("llm_completion_tokens_total", "Tokens generated by the model")
+LLM_TOKENS_PER_SECOND = Histogram(
+    "llm_tokens_per_second", "Generation speed of each LLM call",
+    buckets=(1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 200),
+)
+AGENT_ITERATIONS = Histogram(
+    "agent_iterations", "Agent steps per chat request", buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15)
+)
+AGENT_TOOL_LATENCY = Histogram(
+    "agent_tool_duration_seconds", "Agent tool call latency by tool", ["tool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+
+class _TimedCheckout:
+    metrics_label: str
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_label).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that records how long each checkout waited"""
+
+    metrics_label = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited"""
+
+    metrics_label = "async"
+
+
+class PoolCollector:
+    """Connection pool gauges, read from the engines at scrape time"""
+
+    def __init__(self, engines: Dict[str, Any]):
+        self.engines = engines
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        gauges = {
+            "size": GaugeMetricFamily("db_pool_size", "Connections the pool keeps open", labels=["pool"]),
+            "checkedout": GaugeMetricFamily("db_pool_checked_out", "Connections currently in use", labels=["pool"]),
+            "checkedin": GaugeMetricFamily("db_pool_checked_in", "Idle connections in the pool", labels=["pool"]),
+            "overflow": GaugeMetricFamily(
+                "db_pool_overflow", "Connections open beyond pool_size (negative while below it)", labels=["pool"]
+            ),
+        }
+        for label, engine in self.engines.items():
+            pool = engine.pool
+            for name, gauge in gauges.items():
+                gauge.add_metric([label], getattr(pool, name)())
+        yield from gauges.values()
+
+
+def register_pools(engines: Dict[str, Any]) -> None:
+    REGISTRY.register(PoolCollector(engines))
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """Route template of a request; it keeps label cardinality bounded, and unmatched paths share one label"""
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+# Labelled children resolved once per (method, route, status); labels() itself costs several microseconds
+_request_children: Dict[Tuple[str, str, int], Tuple[Any, Any]] = {}
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    children = _request_children.get((method, route, status))
+    if children is None:
+        children = HTTP_REQUESTS.labels(method, route, str(status)), HTTP_LATENCY.labels(method, route)
+        _request_children[(method, route, status)] = children
+    children[0].inc()
+    children[1].observe(seconds)
+
+
+def observe_tool(tool: str, seconds: float) -> None:
+    AGENT_TOOL_LATENCY.labels(tool).observe(seconds)
+
+
+def render() -> bytes:
+    return generate_latest(REGISTRY)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, Enum
+from ..database import Base
+from .pipeline import DealStatus
+
+
+class PipelineSummary(Base):
+    """Deal count and total value per pipeline and deal status, kept up to date by the deal CRUD"""
+    __tablename__ = "pipeline_summaries"
+
+    pipeline_id = Column(Integer, ForeignKey("pipelines.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(DealStatus), primary_key=True)
+    deal_count = Column(Integer, nullable=False, default=0)
+    total_value = Column(Float, nullable=False, default=0.0)
@@ -0,0 +1,164 @@
+"""Opt-in per-request SQL profiling (SQL_PROFILE=true).
+
+Cursor events on the sync and async engines attribute every statement to the
+request that issued it through a ContextVar. At the end of the request the
+totals go into a Server-Timing header and a log record (streamed bodies are
+logged when the stream ends, without the header); statements slower than
+SQL_SLOW_QUERY_MS are logged as they finish, and statements repeated at least
+SQL_NPLUS1_THRESHOLD times within one request are reported as likely N+1.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import heapq
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import event
+
+from .metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() == "true"
+SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+NPLUS1_THRESHOLD = int(os.getenv("SQL_NPLUS1_THRESHOLD", "5"))
+SLOWEST_KEPT = 3
+STATEMENT_LOG_CHARS = 500
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("sql_profile", default=None)
+
+
+class RequestProfile:
+    """Statements issued on behalf of one request"""
+
+    def __init__(self, method: str, scope: Dict[str, Any]):
+        self.method = method
+        self.scope = scope
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.slowest: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def route(self) -> str:
+        return route_label(self.scope)
+
+    def record(self, statement: str, seconds: float) -> None:
+        # Agent tools record from the inference thread while the request waits
+        with self._lock:
+            self.query_count += 1
+            self.db_seconds += seconds
+            # Parameters are bound separately, so equal text means equal shape
+            self.shapes[statement] += 1
+            if len(self.slowest) < SLOWEST_KEPT:
+                heapq.heappush(self.slowest, (seconds, statement))
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (seconds, statement))
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= NPLUS1_THRESHOLD]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_seconds * 1000:.2f};desc="{self.query_count} queries"'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _current.get()
+    if profile is None or not conn.info.get("query_started"):
+        return
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    profile.record(statement, seconds)
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query",
+            extra={
+                "method": profile.method,
+                "route": profile.route,
+                "duration_ms": round(seconds * 1000, 2),
+                "statement": statement[:STATEMENT_LOG_CHARS],
+            },
+        )
+
+
+def instrument(*engines: Any) -> None:
+    """Attach the cursor events; a no-op unless SQL_PROFILE is set"""
+    if not SQL_PROFILE:
+        return
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def start(method: str, scope: Dict[str, Any]) -> Optional[RequestProfile]:
+    """Begin profiling the current request, or return None when profiling is off"""
+    if not SQL_PROFILE:
+        return None
+    profile = RequestProfile(method, scope)
+    _current.set(profile)
+    return profile
+
+
+def finish(profile: RequestProfile, response: Any) -> None:
+    """Add the Server-Timing header and log the request's totals and likely N+1 statements.
+
+    Streamed bodies (exports, chat streaming) keep querying after the headers are
+    sent, so for those the totals are logged once the stream ends and no
+    Server-Timing header is added.
+    """
+    if _streamed(response):
+        response.body_iterator = _report_after(profile, response.body_iterator)
+        return
+    response.headers.append("Server-Timing", profile.server_timing())
+    _report(profile)
+
+
+def _streamed(response: Any) -> bool:
+    # Bodies rendered in full carry a Content-Length; 204 and 304 have no body at all
+    return "content-length" not in response.headers and response.status_code not in (204, 304)
+
+
+async def _report_after(profile: RequestProfile, body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        # Also runs when the client disconnects mid-stream
+        _report(profile)
+
+
+def _report(profile: RequestProfile) -> None:
+    _current.set(None)
+    if not profile.query_count:
+        return
+    logger.info(
+        "SQL profile",
+        extra={
+            "method": profile.method,
+            "route": profile.route,
+            "query_count": profile.query_count,
+            "db_ms": round(profile.db_seconds * 1000, 2),
+            "slowest": [
+                {"duration_ms": round(seconds * 1000, 2), "statement": statement[:STATEMENT_LOG_CHARS]}
+                for seconds, statement in sorted(profile.slowest, reverse=True)
+            ],
+        },
+    )
+    for statement, count in profile.repeated():
+        logger.warning(
+            "Likely N+1 query",
+            extra={
+                "method": profile.method,
+                "route": profile.route,
+                "count": count,
+                "statement": statement[:STATEMENT_LOG_CHARS],
+            },
+        )
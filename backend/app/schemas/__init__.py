@@ -1,12 +1,22 @@
 from .contact import ContactCreate, ContactUpdate, ContactResponse
-from .pipeline import PipelineCreate, PipelineUpdate, PipelineResponse, DealCreate, DealUpdate, DealResponse
-from .task import TaskCreate, TaskUpdate, TaskResponse
+from .pipeline import (
+    PipelineCreate, PipelineUpdate, PipelineResponse, DealCreate, DealUpdate, DealResponse, DealWithRelationsResponse,
+    DealStatusSummary, PipelineSummaryResponse, PipelinesSummaryResponse
+)
+from .task import TaskCreate, TaskUpdate, TaskResponse, TaskWithRelationsResponse
 from .chat import ChatMessage, ChatResponse
+from .bulk import (
+    BulkCreateRequest, ContactBulkCreateRequest, BulkDeleteRequest,
+    BulkItemResult, BulkResponse
+)
 
 __all__ = [
     "ContactCreate", "ContactUpdate", "ContactResponse",
     "PipelineCreate", "PipelineUpdate", "PipelineResponse",
-    "DealCreate", "DealUpdate", "DealResponse",
-    "TaskCreate", "TaskUpdate", "TaskResponse",
-    "ChatMessage", "ChatResponse"
+    "DealCreate", "DealUpdate", "DealResponse", "DealWithRelationsResponse",
+    "DealStatusSummary", "PipelineSummaryResponse", "PipelinesSummaryResponse",
+    "TaskCreate", "TaskUpdate", "TaskResponse", "TaskWithRelationsResponse",
+    "ChatMessage", "ChatResponse",
+    "BulkCreateRequest", "ContactBulkCreateRequest", "BulkDeleteRequest",
+    "BulkItemResult", "BulkResponse"
 ]
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+BULK_MAX_ITEMS = 10000
+
+
+class BulkCreateRequest(BaseModel):
+    # Rows are validated one by one so a bad row does not reject the whole batch
+    items: List[Dict[str, Any]] = Field(..., max_length=BULK_MAX_ITEMS)
+
+
+class ContactBulkCreateRequest(BulkCreateRequest):
+    upsert: bool = False  # Update existing contacts matched by email instead of failing
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str  # created, updated, deleted, not_found or error
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    results: List[BulkItemResult]
@@ -5,8 +5,10 @@ from typing import Optional
 class ChatMessage(BaseModel):
     message: str
     context: Optional[str] = None
+    session_id: Optional[str] = None  # Continue an earlier conversation; a new one is started if omitted
 
 
 class ChatResponse(BaseModel):
     response: str
     action_taken: Optional[str] = None
+    session_id: Optional[str] = None
@@ -1,7 +1,8 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from ..models.pipeline import DealStatus
+from .contact import ContactResponse
 
 
 class PipelineBase(BaseModel):
@@ -57,3 +58,28 @@ class DealResponse(DealBase):
 
     class Config:
         from_attributes = True
+
+
+class DealWithRelationsResponse(DealResponse):
+    contact: Optional[ContactResponse] = None
+    pipeline: Optional[PipelineResponse] = None
+
+
+class DealStatusSummary(BaseModel):
+    status: DealStatus
+    deal_count: int = 0
+    total_value: float = 0.0
+
+
+class PipelineSummaryResponse(BaseModel):
+    pipeline_id: int
+    deal_count: int
+    total_value: float
+    statuses: List[DealStatusSummary]
+
+
+class PipelinesSummaryResponse(BaseModel):
+    deal_count: int
+    total_value: float
+    statuses: List[DealStatusSummary]
+    pipelines: List[PipelineSummaryResponse]
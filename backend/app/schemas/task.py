@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 from ..models.task import TaskPriority, TaskStatus
+from .contact import ContactResponse
 
 
 class TaskBase(BaseModel):
@@ -36,3 +37,7 @@ class TaskResponse(TaskBase):
 
     class Config:
         from_attributes = True
+
+
+class TaskWithRelationsResponse(TaskResponse):
+    contact: Optional[ContactResponse] = None
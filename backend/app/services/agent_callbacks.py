@@ -0,0 +1,143 @@
+"""LangChain callback handlers used by the CRM agent.
+
+Kept apart from ai_agent so importing the agent does not pull in LangChain
+before the model is loaded.
+"""
+from typing import Any, Callable, Dict, List, Tuple
+from uuid import UUID
+from langchain.callbacks.base import BaseCallbackHandler
+import threading
+import time
+
+from .. import metrics
+from .ai_agent import AgentStats
+from .inference import InferenceCancelled
+from .prompt_cache import PromptPrefixCache
+
+
+class StreamingEventHandler(BaseCallbackHandler):
+    """Forward LLM tokens and tool calls to a consumer as they happen"""
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], None]):
+        self.emit = emit
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self.emit({"event": "token", "data": {"token": token}})
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> None:
+        self.emit({"event": "tool_start", "data": {"tool": serialized.get("name"), "input": input_str}})
+
+    def on_tool_end(self, output: str, **kwargs: Any) -> None:
+        self.emit({"event": "tool_end", "data": {"tool": kwargs.get("name"), "output": str(output)}})
+
+    def on_tool_error(self, error: BaseException, **kwargs: Any) -> None:
+        self.emit({"event": "tool_end", "data": {"tool": kwargs.get("name"), "error": str(error)}})
+
+
+class CancellationHandler(BaseCallbackHandler):
+    """Abort generation at the next token or tool call once a request is abandoned"""
+    
+    raise_error = True
+
+    def __init__(self, cancelled: threading.Event):
+        self.cancelled = cancelled
+
+    def _check(self) -> None:
+        if self.cancelled.is_set():
+            raise InferenceCancelled()
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self._check()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        self._check()
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> None:
+        self._check()
+
+
+class PromptCacheHandler(BaseCallbackHandler):
+    """Record how much of each prompt is served from the llama.cpp prefix cache"""
+
+    def __init__(self, prompt_cache: PromptPrefixCache):
+        self.prompt_cache = prompt_cache
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        for prompt in prompts:
+            self.prompt_cache.record(prompt)
+
+
+class AgentStatsHandler(BaseCallbackHandler):
+    """Classify each agent step for AgentStats"""
+
+    def __init__(self, stats: AgentStats, tool_names: List[str]):
+        self.stats = stats
+        self.tool_names = tool_names
+
+    def on_agent_action(self, action: Any, **kwargs: Any) -> None:
+        # AgentExecutor reports unparseable output as a step of the "_Exception" pseudo tool
+        if action.tool == "_Exception":
+            self.stats.add(iterations=1, parse_failures=1)
+        elif action.tool not in self.tool_names:
+            self.stats.add(iterations=1, invalid_tools=1)
+        else:
+            self.stats.add(iterations=1)
+
+    def on_agent_finish(self, finish: Any, **kwargs: Any) -> None:
+        if str(finish.return_values.get("output", "")).startswith("Agent stopped due to"):
+            self.stats.add(iteration_limit_hits=1)
+        else:
+            self.stats.add(iterations=1)
+
+
+class MetricsHandler(BaseCallbackHandler):
+    """Token counts, generation speed, tool latency and agent steps of one request, for /metrics"""
+
+    def __init__(self, count_tokens: Callable[[str], int]):
+        self.count_tokens = count_tokens
+        self.iterations = 0
+        self._llm_started: Dict[UUID, float] = {}
+        self._streamed: Dict[UUID, int] = {}
+        self._tools_started: Dict[UUID, Tuple[str, float]] = {}
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._llm_started[run_id] = time.perf_counter()
+        self._streamed[run_id] = 0
+        metrics.LLM_PROMPT_TOKENS.inc(sum(self.count_tokens(prompt) for prompt in prompts))
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._streamed[run_id] = self._streamed.get(run_id, 0) + 1
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        elapsed = time.perf_counter() - self._llm_started.pop(run_id, time.perf_counter())
+        tokens = self._streamed.pop(run_id, 0)
+        if not tokens:
+            # Not streamed: count the generated text instead
+            tokens = sum(self.count_tokens(g.text) for generations in response.generations for g in generations)
+        metrics.LLM_COMPLETION_TOKENS.inc(tokens)
+        if elapsed > 0 and tokens:
+            metrics.LLM_TOKENS_PER_SECOND.observe(tokens / elapsed)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._llm_started.pop(run_id, None)
+        self._streamed.pop(run_id, None)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._tools_started[run_id] = (serialized.get("name", "unknown"), time.perf_counter())
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._observe_tool(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._observe_tool(run_id)
+
+    def _observe_tool(self, run_id: UUID) -> None:
+        started = self._tools_started.pop(run_id, None)
+        if started is not None:
+            metrics.observe_tool(started[0], time.perf_counter() - started[1])
+
+    def on_agent_action(self, action: Any, **kwargs: Any) -> None:
+        self.iterations += 1
+
+    def on_agent_finish(self, finish: Any, **kwargs: Any) -> None:
+        self.iterations += 1
@@ -1,51 +1,133 @@
-from typing import Optional, Dict, Any
-from langchain.llms import LlamaCpp
-from langchain.agents import Tool, AgentExecutor, create_react_agent
-from langchain.prompts import PromptTemplate
-from langchain.memory import ConversationBufferMemory
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List
 from sqlalchemy.orm import Session
+import asyncio
+import logging
 import os
 import json
+import threading
+import time
+import uuid
 
+from .. import metrics
 from ..api import crud
+from ..database import unit_of_work
 from ..schemas import ContactCreate, PipelineCreate, DealCreate, TaskCreate
+from .inference import InferenceJob, inference_worker
+from .intent_router import RoutedCommand, route
+from .llm_backends import BackendUnavailable, LLMBackend, backend_from_env
+from .memory import SessionMemoryStore
+from .prompt_cache import PromptPrefixCache
+
+logger = logging.getLogger(__name__)
+
+
+class AgentStats:
+    """Counts agent iterations that went to malformed output instead of useful tool calls"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.requests = 0
+        self.iterations = 0
+        self.parse_failures = 0
+        self.invalid_tools = 0
+        self.iteration_limit_hits = 0
+        self._lock = threading.Lock()
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            wasted = self.parse_failures + self.invalid_tools
+            return {
+                "mode": self.mode,
+                "requests": self.requests,
+                "iterations": self.iterations,
+                "parse_failures": self.parse_failures,
+                "invalid_tools": self.invalid_tools,
+                "wasted_iterations": wasted,
+                "wasted_ratio": wasted / self.iterations if self.iterations else 0.0,
+                "iteration_limit_hits": self.iteration_limit_hits,
+            }
 
 
 class CRMAIAgent:
-    """AI Agent for CRM operations using LangChain and llama-cpp-python"""
+    """AI Agent for CRM operations using LangChain and llama-cpp-python, or another LLM backend"""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        # Resolved from LLM_BACKEND in initialize(), so a bad setting fails the load and not the import
+        self.backend = backend
         self.llm = None
         self.agent_executor = None
-        self.memory = ConversationBufferMemory(memory_key="chat_history")
+        self.prompt_cache: Optional[PromptPrefixCache] = None
+        self.sessions = SessionMemoryStore.from_env()
+        self.tool_mode = os.getenv("AGENT_TOOL_MODE", "react")
+        self.tool_names: List[str] = []
+        self.agent_stats = AgentStats(self.tool_mode)
+        self.state = "idle"
+        self.load_error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self._load_lock = threading.Lock()
         
+    def start_loading(self) -> str:
+        """Start loading the model on a background thread, once, and return the load state"""
+        with self._load_lock:
+            if self.state == "idle":
+                self.state = "loading"
+                threading.Thread(target=self._load, name="model-loader", daemon=True).start()
+            return self.state
+    
+    def _load(self) -> None:
+        started = time.monotonic()
+        try:
+            ready = self.initialize()
+        except Exception as e:
+            logger.error(f"AI agent initialization failed: {e}", exc_info=True)
+            self.load_error = str(e)
+            ready = False
+        self.load_seconds = time.monotonic() - started
+        self.state = "ready" if ready else "failed"
+        if ready:
+            logger.info(f"AI agent initialized in {self.load_seconds:.1f}s.")
+        else:
+            logger.warning("AI agent initialization failed. Chat functionality will be limited.")
+    
+    def model_status(self) -> Dict[str, Any]:
+        """Load state of the model: idle, loading, ready or failed"""
+        return {"state": self.state, "error": self.load_error, "load_seconds": self.load_seconds}
+    
     def initialize(self):
         """Initialize the LLM and agent"""
-        model_path = os.getenv("MODEL_PATH", "./models/model.gguf")
-        n_ctx = int(os.getenv("MODEL_N_CTX", "2048"))
-        n_gpu_layers = int(os.getenv("MODEL_N_GPU_LAYERS", "0"))
-        
-        # Check if model exists
-        if not os.path.exists(model_path):
-            print(f"Warning: Model file not found at {model_path}. AI agent will not be available.")
+        try:
+            if self.backend is None:
+                self.backend = backend_from_env()
+            self.llm = self.backend.create_llm()
+        except BackendUnavailable as e:
+            logger.warning(f"{e}. AI agent will not be available.")
+            self.load_error = str(e)
             return False
         
-        # Initialize LlamaCpp
-        self.llm = LlamaCpp(
-            model_path=model_path,
-            n_ctx=n_ctx,
-            n_gpu_layers=n_gpu_layers,
-            temperature=0.7,
-            max_tokens=512,
-            top_p=0.95,
-            verbose=False
-        )
+        # LangChain is imported only once a model is actually loaded
+        from langchain.agents import AgentExecutor, create_react_agent
+        from langchain.prompts import PromptTemplate
+        from langchain.tools.render import render_text_description
+        from .tool_calling import JSON_AGENT_TEMPLATE, create_json_tool_agent
+        
+        # Budget session history with the model's own tokenizer
+        self.sessions.count_tokens = self.llm.get_num_tokens
         
         # Create tools
         tools = self._create_tools()
+        self.tool_names = [tool.name for tool in tools]
         
         # Create agent prompt
-        template = """Answer the following questions as best you can. You have access to the following tools:
+        if self.tool_mode == "grammar":
+            template = JSON_AGENT_TEMPLATE
+        else:
+            template = """Answer the following questions as best you can. You have access to the following tools:
 
 {tools}
 
@@ -69,14 +151,24 @@ Thought: {agent_scratchpad}"""
 
         prompt = PromptTemplate.from_template(template)
         
+        # The static prefix (instructions and tools) is the same for every request
+        static_prefix = PromptTemplate.from_template(template.split("Chat History:")[0]).format(
+            tools=render_text_description(tools),
+            tool_names=", ".join(tool.name for tool in tools)
+        )
+        self.prompt_cache = self.backend.prompt_cache(self.llm, static_prefix)
+        
         # Create agent
-        agent = create_react_agent(self.llm, tools, prompt)
+        if self.tool_mode == "grammar":
+            # Every step is sampled under a grammar built from the tool input schemas, where the backend has one
+            agent = create_json_tool_agent(self.llm, tools, prompt, self.backend.grammar(self.tool_names))
+        else:
+            agent = create_react_agent(self.llm, tools, prompt)
         
         # Create agent executor
         self.agent_executor = AgentExecutor(
             agent=agent,
             tools=tools,
-            memory=self.memory,
             verbose=True,
             handle_parsing_errors=True,
             max_iterations=3
@@ -86,6 +178,8 @@ Thought: {agent_scratchpad}"""
     
     def _create_tools(self):
         """Create LangChain tools for CRM operations"""
+        from langchain.agents import Tool
+        
         return [
             Tool(
                 name="create_contact",
@@ -102,6 +196,11 @@ Thought: {agent_scratchpad}"""
                 func=self._tool_get_contact,
                 description="Get a specific contact by ID. Input should be the contact ID as a number."
             ),
+            Tool(
+                name="search_contacts",
+                func=self._tool_search_contacts,
+                description="Search contacts by name, email, company or notes. Input should be the search text. Example: acme"
+            ),
             Tool(
                 name="create_pipeline",
                 func=self._tool_create_pipeline,
@@ -134,156 +233,266 @@ Thought: {agent_scratchpad}"""
             ),
         ]
     
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """Session of one tool call, in its own short transaction: committed when the tool
+        succeeds, rolled back entirely when an exception leaves the block.
+
+        The transaction is never held across LLM calls, so rows the tool locked (e.g. a
+        pipeline_summaries rollup row) are released as soon as the tool returns.
+        """
+        with unit_of_work() as unit:
+            yield unit.session
+    
     # Tool implementation methods
     def _tool_create_contact(self, input_str: str) -> str:
         """Tool to create a contact"""
         try:
-            from ..database import SessionLocal
             data = json.loads(input_str)
             contact_data = ContactCreate(**data)
-            db = SessionLocal()
-            contact = crud.create_contact(db, contact_data)
-            db.close()
-            return f"Contact created successfully with ID {contact.id}: {contact.first_name} {contact.last_name} ({contact.email})"
+            with self._session() as db:
+                contact = crud.create_contact(db, contact_data)
+                return f"Contact created successfully with ID {contact.id}: {contact.first_name} {contact.last_name} ({contact.email})"
         except Exception as e:
             return f"Error creating contact: {str(e)}"
     
     def _tool_get_contacts(self, input_str: str) -> str:
         """Tool to get all contacts"""
         try:
-            from ..database import SessionLocal
-            db = SessionLocal()
-            contacts = crud.get_contacts(db, skip=0, limit=10)
-            db.close()
-            if not contacts:
-                return "No contacts found."
-            result = "Contacts:\n"
-            for c in contacts:
-                result += f"- ID {c.id}: {c.first_name} {c.last_name} ({c.email}) - {c.company or 'No company'}\n"
-            return result
+            with self._session() as db:
+                contacts = crud.get_contacts(db, skip=0, limit=10)
+                if not contacts:
+                    return "No contacts found."
+                result = "Contacts:\n"
+                for c in contacts:
+                    result += f"- ID {c.id}: {c.first_name} {c.last_name} ({c.email}) - {c.company or 'No company'}\n"
+                return result
         except Exception as e:
             return f"Error getting contacts: {str(e)}"
     
     def _tool_get_contact(self, input_str: str) -> str:
         """Tool to get a specific contact"""
         try:
-            from ..database import SessionLocal
             contact_id = int(input_str)
-            db = SessionLocal()
-            contact = crud.get_contact(db, contact_id)
-            db.close()
-            if not contact:
-                return f"Contact with ID {contact_id} not found."
-            return f"Contact ID {contact.id}: {contact.first_name} {contact.last_name}\nEmail: {contact.email}\nPhone: {contact.phone or 'N/A'}\nCompany: {contact.company or 'N/A'}\nPosition: {contact.position or 'N/A'}\nNotes: {contact.notes or 'N/A'}"
+            with self._session() as db:
+                contact = crud.get_contact(db, contact_id)
+                if not contact:
+                    return f"Contact with ID {contact_id} not found."
+                return f"Contact ID {contact.id}: {contact.first_name} {contact.last_name}\nEmail: {contact.email}\nPhone: {contact.phone or 'N/A'}\nCompany: {contact.company or 'N/A'}\nPosition: {contact.position or 'N/A'}\nNotes: {contact.notes or 'N/A'}"
         except Exception as e:
             return f"Error getting contact: {str(e)}"
     
+    def _tool_search_contacts(self, input_str: str) -> str:
+        """Tool to search contacts"""
+        try:
+            with self._session() as db:
+                contacts = crud.search_contacts(db, input_str.strip().strip("\"'"), limit=10)
+                if not contacts:
+                    return f"No contacts found matching '{input_str}'."
+                result = "Contacts:\n"
+                for c in contacts:
+                    result += f"- ID {c.id}: {c.first_name} {c.last_name} ({c.email}) - {c.company or 'No company'}\n"
+                return result
+        except Exception as e:
+            return f"Error searching contacts: {str(e)}"
+    
     def _tool_create_pipeline(self, input_str: str) -> str:
         """Tool to create a pipeline"""
         try:
-            from ..database import SessionLocal
             data = json.loads(input_str)
             pipeline_data = PipelineCreate(**data)
-            db = SessionLocal()
-            pipeline = crud.create_pipeline(db, pipeline_data)
-            db.close()
-            return f"Pipeline created successfully with ID {pipeline.id}: {pipeline.name}"
+            with self._session() as db:
+                pipeline = crud.create_pipeline(db, pipeline_data)
+                return f"Pipeline created successfully with ID {pipeline.id}: {pipeline.name}"
         except Exception as e:
             return f"Error creating pipeline: {str(e)}"
     
     def _tool_get_pipelines(self, input_str: str) -> str:
         """Tool to get all pipelines"""
         try:
-            from ..database import SessionLocal
-            db = SessionLocal()
-            pipelines = crud.get_pipelines(db, skip=0, limit=10)
-            db.close()
-            if not pipelines:
-                return "No pipelines found."
-            result = "Pipelines:\n"
-            for p in pipelines:
-                result += f"- ID {p.id}: {p.name} - {p.description or 'No description'}\n"
-            return result
+            with self._session() as db:
+                pipelines = crud.get_pipelines(db, skip=0, limit=10)
+                if not pipelines:
+                    return "No pipelines found."
+                result = "Pipelines:\n"
+                for p in pipelines:
+                    result += f"- ID {p.id}: {p.name} - {p.description or 'No description'}\n"
+                return result
         except Exception as e:
             return f"Error getting pipelines: {str(e)}"
     
     def _tool_create_deal(self, input_str: str) -> str:
         """Tool to create a deal"""
         try:
-            from ..database import SessionLocal
             data = json.loads(input_str)
             deal_data = DealCreate(**data)
-            db = SessionLocal()
-            deal = crud.create_deal(db, deal_data)
-            db.close()
-            return f"Deal created successfully with ID {deal.id}: {deal.title} (${deal.value}) - Status: {deal.status}"
+            with self._session() as db:
+                deal = crud.create_deal(db, deal_data)
+                return f"Deal created successfully with ID {deal.id}: {deal.title} (${deal.value}) - Status: {deal.status}"
         except Exception as e:
             return f"Error creating deal: {str(e)}"
     
     def _tool_get_deals(self, input_str: str) -> str:
         """Tool to get all deals"""
         try:
-            from ..database import SessionLocal
-            db = SessionLocal()
-            deals = crud.get_deals(db, skip=0, limit=10)
-            db.close()
-            if not deals:
-                return "No deals found."
-            result = "Deals:\n"
-            for d in deals:
-                result += f"- ID {d.id}: {d.title} (${d.value}) - Status: {d.status} - Pipeline ID: {d.pipeline_id}\n"
-            return result
+            with self._session() as db:
+                deals = crud.get_deals(db, skip=0, limit=10)
+                if not deals:
+                    return "No deals found."
+                result = "Deals:\n"
+                for d in deals:
+                    result += f"- ID {d.id}: {d.title} (${d.value}) - Status: {d.status} - Pipeline ID: {d.pipeline_id}\n"
+                return result
         except Exception as e:
             return f"Error getting deals: {str(e)}"
     
     def _tool_create_task(self, input_str: str) -> str:
         """Tool to create a task"""
         try:
-            from ..database import SessionLocal
             data = json.loads(input_str)
             task_data = TaskCreate(**data)
-            db = SessionLocal()
-            task = crud.create_task(db, task_data)
-            db.close()
-            return f"Task created successfully with ID {task.id}: {task.title} - Priority: {task.priority}, Status: {task.status}"
+            with self._session() as db:
+                task = crud.create_task(db, task_data)
+                return f"Task created successfully with ID {task.id}: {task.title} - Priority: {task.priority}, Status: {task.status}"
         except Exception as e:
             return f"Error creating task: {str(e)}"
     
     def _tool_get_tasks(self, input_str: str) -> str:
         """Tool to get all tasks"""
         try:
-            from ..database import SessionLocal
-            db = SessionLocal()
-            tasks = crud.get_tasks(db, skip=0, limit=10)
-            db.close()
-            if not tasks:
-                return "No tasks found."
-            result = "Tasks:\n"
-            for t in tasks:
-                result += f"- ID {t.id}: {t.title} - Priority: {t.priority}, Status: {t.status}, Contact ID: {t.contact_id}\n"
-            return result
+            with self._session() as db:
+                tasks = crud.get_tasks(db, skip=0, limit=10)
+                if not tasks:
+                    return "No tasks found."
+                result = "Tasks:\n"
+                for t in tasks:
+                    result += f"- ID {t.id}: {t.title} - Priority: {t.priority}, Status: {t.status}, Contact ID: {t.contact_id}\n"
+                return result
         except Exception as e:
             return f"Error getting tasks: {str(e)}"
     
-    def process_message(self, message: str) -> Dict[str, Any]:
-        """Process a user message through the AI agent"""
+    def process_message(
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        callbacks: Optional[List[Any]] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """Process a user message through the AI agent, within the history of its session"""
+        session_id = session_id or uuid.uuid4().hex
+        command = route(message)
+        if command is not None:
+            return self._run_fast_path(command, message, session_id)
+        
         if not self.agent_executor:
             return {
                 "response": "AI agent is not initialized. Please ensure the model file is available.",
-                "action_taken": None
+                "action_taken": None,
+                "session_id": session_id
             }
         
+        from .agent_callbacks import AgentStatsHandler, CancellationHandler, MetricsHandler, PromptCacheHandler
+        
+        metrics_handler = MetricsHandler(self.llm.get_num_tokens)
+        callbacks = list(callbacks or [])
+        if self.prompt_cache is not None:
+            callbacks.append(PromptCacheHandler(self.prompt_cache))
+        if cancelled is not None:
+            callbacks.append(CancellationHandler(cancelled))
+        callbacks.append(AgentStatsHandler(self.agent_stats, self.tool_names))
+        callbacks.append(metrics_handler)
+        self.agent_stats.add(requests=1)
+        
         try:
-            result = self.agent_executor.invoke({"input": message})
+            try:
+                result = self.agent_executor.invoke(
+                    {"input": message, "chat_history": self.sessions.history(session_id)},
+                    config={"callbacks": callbacks}
+                )
+            finally:
+                metrics.AGENT_ITERATIONS.observe(metrics_handler.iterations)
+            output = result.get("output", "No response generated.")
+            self.sessions.save(session_id, message, output)
             return {
-                "response": result.get("output", "No response generated."),
-                "action_taken": "Processed through AI agent"
+                "response": output,
+                "action_taken": "Processed through AI agent",
+                "session_id": session_id
             }
         except Exception as e:
             return {
                 "response": f"Error processing message: {str(e)}",
-                "action_taken": None
+                "action_taken": None,
+                "session_id": session_id
             }
+    
+    def is_fast_path(self, message: str) -> bool:
+        """Whether a message is answered by the intent router instead of the LLM"""
+        return route(message) is not None
+    
+    def _run_fast_path(self, command: RoutedCommand, message: str, session_id: str) -> Dict[str, Any]:
+        """Answer a routed command by calling its tool directly"""
+        started = time.perf_counter()
+        output = getattr(self, f"_tool_{command.tool}")(command.tool_input)
+        metrics.observe_tool(command.tool, time.perf_counter() - started)
+        self.sessions.save(session_id, message, output)
+        return {
+            "response": output,
+            "action_taken": f"Fast path: {command.tool}",
+            "session_id": session_id
+        }
+    
+    def prompt_cache_stats(self) -> Dict[str, Any]:
+        """Token reuse of the llama.cpp prompt prefix cache"""
+        if self.prompt_cache is None:
+            return {"static_prefix_tokens": 0, "prompt_tokens": 0, "cache_hit_tokens": 0, "hit_ratio": 0.0, "cache_bytes": 0}
+        return self.prompt_cache.stats()
+    
+    def tool_call_stats(self) -> Dict[str, Any]:
+        """Agent iterations, parse failures and wasted iterations for the active tool mode"""
+        return self.agent_stats.stats()
+    
+    def stream_message(self, message: str, session_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Queue a message on the inference worker and return an iterator over its events.
+        
+        Raises InferenceQueueFull straight away, before any event is produced.
+        Routed commands skip the queue and yield only their final event.
+        """
+        if self.is_fast_path(message):
+            return self._stream_fast_path(message, session_id)
+        
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        def emit(event: Optional[Dict[str, Any]]) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+        
+        def run(cancelled: threading.Event) -> None:
+            try:
+                from .agent_callbacks import StreamingEventHandler
+                
+                result = self.process_message(
+                    message, session_id, callbacks=[StreamingEventHandler(emit)], cancelled=cancelled
+                )
+                emit({"event": "final", "data": result})
+            finally:
+                emit(None)
+        
+        return self._drain_events(events, inference_worker.submit(run))
+    
+    async def _stream_fast_path(self, message: str, session_id: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, self.process_message, message, session_id)
+        yield {"event": "final", "data": result}
+    
+    async def _drain_events(self, events: asyncio.Queue, job: InferenceJob) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            while (event := await asyncio.wait_for(events.get(), job.remaining())) is not None:
+                yield event
+        except asyncio.TimeoutError:
+            yield {"event": "error", "data": {"detail": "AI agent timed out"}}
+        finally:
+            # Runs on completion, timeout and client disconnect alike
+            job.cancel()
 
 
 # Global agent instance
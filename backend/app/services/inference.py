@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import contextvars
+import math
+import os
+import threading
+import time
+
+# How often a waiting request checks whether its client went away
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference queue cannot accept another request"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class InferenceTimeout(Exception):
+    """Raised when a request does not finish within the inference timeout"""
+
+
+class InferenceCancelled(Exception):
+    """Raised inside a running job once its request has been abandoned"""
+
+
+class InferenceJob:
+    """Handle to a queued or running inference call"""
+
+    def __init__(self, future: asyncio.Future, cancelled: threading.Event, deadline: float):
+        self.future = future
+        self.cancelled = cancelled
+        self.deadline = deadline
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self) -> None:
+        """Drop the job if it is still queued, or ask it to stop if it is running"""
+        if not self.future.done():
+            self.cancelled.set()
+            self.future.cancel()
+
+
+class InferenceWorker:
+    """Runs blocking LLM calls on dedicated threads behind a bounded queue.
+
+    Inference never touches the default threadpool, so CRUD traffic keeps its
+    capacity however many chat requests are waiting.
+    """
+
+    def __init__(self, concurrency: int = 1, queue_size: int = 8, timeout: float = 120.0):
+        self.concurrency = concurrency
+        self.max_pending = concurrency + queue_size
+        self.timeout = timeout
+        self.pending = 0
+        self._avg_duration = 10.0
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="inference")
+
+    @classmethod
+    def from_env(cls) -> "InferenceWorker":
+        return cls(
+            concurrency=int(os.getenv("LLM_CONCURRENCY", "1")),
+            queue_size=int(os.getenv("LLM_QUEUE_SIZE", "8")),
+            timeout=float(os.getenv("LLM_TIMEOUT", "120")),
+        )
+
+    def retry_after(self) -> int:
+        """Estimate in seconds until a queue slot frees up"""
+        return max(1, math.ceil(self._avg_duration * self.pending / self.concurrency))
+
+    def _release(self) -> None:
+        self.pending -= 1
+
+    def submit(self, fn: Callable[..., Any]) -> InferenceJob:
+        """Queue fn(cancelled=<threading.Event>) or raise InferenceQueueFull"""
+        if self.pending >= self.max_pending:
+            raise InferenceQueueFull(self.retry_after())
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+
+        def job() -> Any:
+            # Cancelling the asyncio future reaches the executor only on the loop's next turn
+            if cancelled.is_set():
+                raise InferenceCancelled()
+            started = time.monotonic()
+            try:
+                return fn(cancelled=cancelled)
+            finally:
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.monotonic() - started)
+
+        self.pending += 1
+        # Carry the request's context (its SQL profile, for one) into the worker thread
+        future = self._executor.submit(contextvars.copy_context().run, job)
+        # The slot is freed only when the thread is done, not when the caller gives up
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return InferenceJob(asyncio.wrap_future(future), cancelled, time.monotonic() + self.timeout)
+
+    async def run(self, fn: Callable[..., Any], is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None) -> Any:
+        """Queue fn, wait for its result and cancel it on timeout or client disconnect"""
+        job = self.submit(fn)
+        try:
+            while True:
+                if job.remaining() <= 0:
+                    raise InferenceTimeout()
+                done, _ = await asyncio.wait({job.future}, timeout=min(job.remaining(), DISCONNECT_POLL_INTERVAL))
+                if done:
+                    return job.future.result()
+                if is_disconnected is not None and await is_disconnected():
+                    raise InferenceCancelled()
+        finally:
+            job.cancel()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global inference worker
+inference_worker = InferenceWorker.from_env()
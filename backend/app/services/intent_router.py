@@ -0,0 +1,49 @@
+from typing import NamedTuple, Optional
+import json
+import re
+
+
+class RoutedCommand(NamedTuple):
+    tool: str
+    tool_input: str
+
+
+_POLITE = r"(?:please\s+)?(?:can\s+you\s+)?"
+
+_LIST = re.compile(
+    rf"^{_POLITE}(?:show|list|get|display|view)\s+(?:me\s+)?(?:all\s+)?(?:(?:of\s+)?(?:my|the)\s+)?"
+    r"(contacts|pipelines|deals|tasks)$",
+    re.IGNORECASE,
+)
+_WHAT_DO_I_HAVE = re.compile(r"^what\s+(contacts|pipelines|deals|tasks)\s+do\s+(?:i|we)\s+have$", re.IGNORECASE)
+_SHOW_CONTACT = re.compile(
+    rf"^{_POLITE}(?:show|get|display|view|find)\s+(?:me\s+)?contact\s+(?:with\s+)?(?:(?:id|number|no\.?)\s*)?#?(\d+)$",
+    re.IGNORECASE,
+)
+_CREATE_PIPELINE = re.compile(
+    rf"^{_POLITE}(?:create|add|make)\s+(?:a\s+)?(?:new\s+)?pipeline\s+(?:called|named)\s+(.+)$",
+    re.IGNORECASE,
+)
+# Names that look like they carry a second instruction are left to the agent
+_COMPOUND = re.compile(r"\b(?:and|then|with)\b|[,;:\n]", re.IGNORECASE)
+
+
+def route(message: str) -> Optional[RoutedCommand]:
+    """Match unambiguous chat commands to a tool call, or return None to use the agent"""
+    text = message.strip().rstrip(".!?").strip()
+
+    match = _LIST.match(text) or _WHAT_DO_I_HAVE.match(text)
+    if match:
+        return RoutedCommand(f"get_{match.group(1).lower()}", "all")
+
+    match = _SHOW_CONTACT.match(text)
+    if match:
+        return RoutedCommand("get_contact", match.group(1))
+
+    match = _CREATE_PIPELINE.match(text)
+    if match:
+        name = match.group(1).strip().strip("\"'").strip()
+        if name and len(name) <= 100 and not _COMPOUND.search(name):
+            return RoutedCommand("create_pipeline", json.dumps({"name": name}))
+
+    return None
@@ -0,0 +1,141 @@
+"""LLM backends the CRM agent can run on, selected with LLM_BACKEND.
+
+"llamacpp" (the default) loads the local GGUF model. "scripted" replays canned
+agent outputs at configurable token rates, so the agent loop can be exercised
+and benchmarked without a model and without sampling noise.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Type
+import json
+import os
+
+from .prompt_cache import PromptPrefixCache
+
+
+class BackendUnavailable(Exception):
+    """Raised when the backend cannot be loaded, e.g. an unknown LLM_BACKEND or a missing model file"""
+
+
+class LLMBackend(ABC):
+    """Creates the LangChain LLM for the agent, and the llama.cpp extras where the backend has them"""
+
+    name = "base"
+
+    @abstractmethod
+    def create_llm(self) -> Any:
+        """The LangChain LLM; raises BackendUnavailable when it cannot be loaded"""
+
+    def prompt_cache(self, llm: Any, static_prefix: str) -> Optional[PromptPrefixCache]:
+        """Prefix cache warmed with the static part of the prompt, or None without one"""
+        return None
+
+    def grammar(self, tool_names: Sequence[str]) -> Any:
+        """Grammar constraining JSON tool-calling steps, or None to sample unconstrained"""
+        return None
+
+
+class LlamaCppBackend(LLMBackend):
+    """Local GGUF model through llama-cpp-python"""
+
+    name = "llamacpp"
+
+    def __init__(self, model_path: str, n_ctx: int = 2048, n_gpu_layers: int = 0):
+        self.model_path = model_path
+        self.n_ctx = n_ctx
+        self.n_gpu_layers = n_gpu_layers
+
+    @classmethod
+    def from_env(cls) -> "LlamaCppBackend":
+        return cls(
+            model_path=os.getenv("MODEL_PATH", "./models/model.gguf"),
+            n_ctx=int(os.getenv("MODEL_N_CTX", "2048")),
+            n_gpu_layers=int(os.getenv("MODEL_N_GPU_LAYERS", "0")),
+        )
+
+    def create_llm(self) -> Any:
+        if not os.path.exists(self.model_path):
+            raise BackendUnavailable(f"Model file not found at {self.model_path}")
+        from langchain.llms import LlamaCpp
+
+        return LlamaCpp(
+            model_path=self.model_path,
+            n_ctx=self.n_ctx,
+            n_gpu_layers=self.n_gpu_layers,
+            temperature=0.7,
+            max_tokens=512,
+            top_p=0.95,
+            streaming=True,
+            verbose=False
+        )
+
+    def prompt_cache(self, llm: Any, static_prefix: str) -> PromptPrefixCache:
+        # Evaluate the static prefix (instructions and tools) once and keep its KV state
+        cache = PromptPrefixCache.from_env(llm.client)
+        cache.warm(static_prefix)
+        return cache
+
+    def grammar(self, tool_names: Sequence[str]) -> Any:
+        from llama_cpp import LlamaGrammar
+        from .tool_calling import build_tool_call_grammar
+
+        return LlamaGrammar.from_string(build_tool_call_grammar(tool_names), verbose=False)
+
+
+class ScriptedBackend(LLMBackend):
+    """Canned completions replayed in order; see ScriptedLLM"""
+
+    name = "scripted"
+
+    def __init__(
+        self,
+        script: Optional[Sequence[str]] = None,
+        script_path: Optional[str] = None,
+        tokens_per_second: float = 0.0,
+        prompt_tokens_per_second: float = 0.0
+    ):
+        self.script = list(script) if script is not None else None
+        self.script_path = script_path
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+
+    @classmethod
+    def from_env(cls) -> "ScriptedBackend":
+        return cls(
+            script_path=os.getenv("LLM_SCRIPT"),
+            tokens_per_second=float(os.getenv("LLM_SCRIPT_TOKENS_PER_SECOND", "0")),
+            prompt_tokens_per_second=float(os.getenv("LLM_SCRIPT_PROMPT_TOKENS_PER_SECOND", "0")),
+        )
+
+    def _load_script(self) -> List[str]:
+        script = self.script
+        if script is None:
+            if not self.script_path or not os.path.exists(self.script_path):
+                raise BackendUnavailable(f"LLM script not found at {self.script_path}")
+            with open(self.script_path) as f:
+                script = json.load(f)
+        if not isinstance(script, list) or not script or not all(isinstance(step, str) for step in script):
+            raise BackendUnavailable(f"{self.script_path or 'The LLM script'} must hold a non-empty list of completions")
+        return script
+
+    def create_llm(self) -> Any:
+        from .scripted_llm import ScriptedLLM
+
+        return ScriptedLLM(
+            script=self._load_script(),
+            tokens_per_second=self.tokens_per_second,
+            prompt_tokens_per_second=self.prompt_tokens_per_second,
+        )
+
+
+BACKENDS: Dict[str, Type[LLMBackend]] = {
+    LlamaCppBackend.name: LlamaCppBackend,
+    ScriptedBackend.name: ScriptedBackend,
+}
+
+
+def backend_from_env() -> LLMBackend:
+    """The backend named by LLM_BACKEND, configured from its own environment variables"""
+    name = os.getenv("LLM_BACKEND", LlamaCppBackend.name)
+    if name not in BACKENDS:
+        raise BackendUnavailable(f"Unknown LLM_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name].from_env()
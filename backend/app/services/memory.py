@@ -0,0 +1,109 @@
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Optional, Tuple
+import os
+import threading
+import time
+
+
+def approximate_tokens(text: str) -> int:
+    """Rough token count used until the model tokenizer is available"""
+    return max(1, len(text) // 4)
+
+
+class ChatSession:
+    """Conversation turns of one session, trimmed to a token budget"""
+
+    def __init__(self):
+        self.turns: Deque[Tuple[str, str, int]] = deque()
+        self.tokens = 0
+        self.last_used = time.monotonic()
+
+
+class SessionMemoryStore:
+    """Per-session chat history with a token window per session and LRU/TTL eviction across sessions.
+
+    Each session keeps only its most recent turns within max_session_tokens, so the
+    prompt sent to the model stops growing with the conversation. The store as a
+    whole is capped by session count, idle time and total tokens held.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        ttl: float = 3600.0,
+        max_session_tokens: int = 512,
+        max_total_tokens: int = 1_000_000,
+        count_tokens: Callable[[str], int] = approximate_tokens
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_session_tokens = max_session_tokens
+        self.max_total_tokens = max_total_tokens
+        self.count_tokens = count_tokens
+        self.total_tokens = 0
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SessionMemoryStore":
+        return cls(
+            max_sessions=int(os.getenv("CHAT_MAX_SESSIONS", "1000")),
+            ttl=float(os.getenv("CHAT_SESSION_TTL", "3600")),
+            max_session_tokens=int(os.getenv("CHAT_HISTORY_TOKENS", "512")),
+            max_total_tokens=int(os.getenv("CHAT_MEMORY_MAX_TOKENS", "1000000")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _drop(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id)
+        self.total_tokens -= session.tokens
+
+    def _expire(self, now: float) -> None:
+        # Sessions are kept in least-recently-used order, so stale ones sit at the front
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_used < self.ttl:
+                break
+            self._drop(session_id)
+
+    def history(self, session_id: Optional[str]) -> str:
+        """Render a session's retained turns for the prompt"""
+        if not session_id:
+            return ""
+        with self._lock:
+            self._expire(time.monotonic())
+            session = self._sessions.get(session_id)
+            if session is None:
+                return ""
+            return "\n".join(f"Human: {human}\nAI: {ai}" for human, ai, _ in session.turns)
+
+    def save(self, session_id: str, human: str, ai: str) -> None:
+        """Append a turn, trimming the session window and evicting sessions over the caps"""
+        tokens = self.count_tokens(human) + self.count_tokens(ai)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = ChatSession()
+            self._sessions.move_to_end(session_id)
+            session.last_used = now
+            session.turns.append((human, ai, tokens))
+            session.tokens += tokens
+            self.total_tokens += tokens
+            # Always keep the latest turn, even if it alone exceeds the budget
+            while session.tokens > self.max_session_tokens and len(session.turns) > 1:
+                _, _, dropped = session.turns.popleft()
+                session.tokens -= dropped
+                self.total_tokens -= dropped
+            while len(self._sessions) > self.max_sessions or (
+                self.total_tokens > self.max_total_tokens and len(self._sessions) > 1
+            ):
+                self._drop(next(iter(self._sessions)))
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            if session_id in self._sessions:
+                self._drop(session_id)
@@ -0,0 +1,66 @@
+from typing import Any, Dict
+import os
+import threading
+
+
+class PromptPrefixCache:
+    """Reuses llama.cpp KV state across generations that share a prompt prefix.
+
+    The static part of the agent prompt (instructions and tool descriptions) is
+    evaluated once and saved; llama.cpp's RAM cache then restores the longest
+    saved prefix before each generation, which also covers the per-session
+    history, since every completion is saved under its full token sequence.
+    """
+
+    def __init__(self, llama: Any, capacity_bytes: int):
+        from llama_cpp import LlamaRAMCache
+
+        self.llama = llama
+        self.static_prefix_tokens = 0
+        self.prompt_tokens = 0
+        self.cache_hit_tokens = 0
+        self._lock = threading.Lock()
+        llama.set_cache(LlamaRAMCache(capacity_bytes=capacity_bytes))
+
+    @classmethod
+    def from_env(cls, llama: Any) -> "PromptPrefixCache":
+        return cls(llama, capacity_bytes=int(os.getenv("MODEL_PROMPT_CACHE_BYTES", str(2 << 30))))
+
+    def _tokenize(self, text: str):
+        # Same tokenization llama-cpp-python applies to completion prompts
+        return self.llama.tokenize(text.encode("utf-8"), special=True)
+
+    def warm(self, prefix: str) -> int:
+        """Evaluate the static prefix once and save its state"""
+        tokens = self._tokenize(prefix)
+        self.llama.reset()
+        self.llama.eval(tokens)
+        self.llama.cache[tokens] = self.llama.save_state()
+        self.static_prefix_tokens = len(tokens)
+        return len(tokens)
+
+    def record(self, prompt: str) -> int:
+        """Count the prompt tokens llama.cpp will restore instead of evaluating"""
+        from llama_cpp import Llama
+
+        tokens = self._tokenize(prompt)
+        reused = Llama.longest_token_prefix(self.llama._input_ids.tolist(), tokens)
+        try:
+            cached = self.llama.cache[tokens]
+            reused = max(reused, Llama.longest_token_prefix(cached.input_ids.tolist(), tokens))
+        except KeyError:
+            pass
+        with self._lock:
+            self.prompt_tokens += len(tokens)
+            self.cache_hit_tokens += reused
+        return reused
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "static_prefix_tokens": self.static_prefix_tokens,
+                "prompt_tokens": self.prompt_tokens,
+                "cache_hit_tokens": self.cache_hit_tokens,
+                "hit_ratio": self.cache_hit_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+                "cache_bytes": self.llama.cache.cache_size,
+            }
@@ -0,0 +1,67 @@
+"""Scripted stand-in for the llama.cpp LLM.
+
+Kept apart from llm_backends so selecting a backend does not import LangChain.
+"""
+from typing import Any, List, Optional
+import re
+import threading
+import time
+
+from langchain.callbacks.manager import CallbackManagerForLLMRun
+from langchain.llms.base import LLM
+
+# A word or punctuation mark with its leading whitespace: a rough stand-in for model tokens
+_TOKEN = re.compile(r"\s*(?:\w+|[^\w\s])|\s+")
+
+_lock = threading.Lock()
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into pseudo-tokens that join back to the original text"""
+    return _TOKEN.findall(text)
+
+
+class ScriptedLLM(LLM):
+    """Replays canned completions in order, cycling, at configured token rates.
+
+    Each completion is cut at the first stop sequence and streamed token by token
+    through the callbacks, like LlamaCpp with streaming=True, so the agent, the
+    stream endpoint and the metrics see the same events as with a real model.
+    Requests share one position in the script, so run them one at a time.
+    """
+
+    script: List[str]
+    tokens_per_second: float = 0.0  # 0 generates instantly
+    prompt_tokens_per_second: float = 0.0  # 0 skips simulated prompt evaluation
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def get_num_tokens(self, text: str) -> int:
+        return len(split_tokens(text))
+
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        if self.prompt_tokens_per_second > 0:
+            time.sleep(self.get_num_tokens(prompt) / self.prompt_tokens_per_second)
+        with _lock:
+            text = self.script[self.calls % len(self.script)]
+            self.calls += 1
+        for sequence in stop or []:
+            index = text.find(sequence)
+            if index != -1:
+                text = text[:index]
+        delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for token in split_tokens(text):
+            if delay:
+                time.sleep(delay)
+            if run_manager:
+                run_manager.on_llm_new_token(token)
+        return text
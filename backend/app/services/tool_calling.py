@@ -0,0 +1,174 @@
+"""Grammar-constrained JSON tool calling for the CRM agent.
+
+Instead of free-text ReAct, every agent step is a single JSON object whose
+shape is enforced by a llama.cpp GBNF grammar generated from the tool input
+schemas, so the output always parses and names a real tool.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+import json
+
+from langchain.agents import AgentOutputParser
+from langchain.prompts import PromptTemplate
+from langchain.schema import AgentAction, AgentFinish, OutputParserException
+from langchain.schema.runnable import RunnablePassthrough
+from langchain.tools.render import render_text_description
+from pydantic import BaseModel
+
+from ..schemas import ContactCreate, PipelineCreate, DealCreate, TaskCreate
+
+# Input accepted by each tool: a schema for JSON objects, int for ids, str for free text, None for "all"
+TOOL_INPUTS: Dict[str, Union[Type[BaseModel], Type[int], Type[str], None]] = {
+    "create_contact": ContactCreate,
+    "get_contacts": None,
+    "get_contact": int,
+    "search_contacts": str,
+    "create_pipeline": PipelineCreate,
+    "get_pipelines": None,
+    "create_deal": DealCreate,
+    "get_deals": None,
+    "create_task": TaskCreate,
+    "get_tasks": None,
+}
+
+JSON_AGENT_TEMPLATE = """Answer the following questions as best you can. You have access to the following tools:
+
+{tools}
+
+Reply at every step with exactly one JSON object and nothing else.
+To use a tool: {{"thought": "what to do next", "action": "one of [{tool_names}]", "action_input": <tool input>}}
+Tool input is a JSON object for create_* tools, the numeric ID for get_contact, the search text for search_contacts and "all" for the other get_* tools.
+When you know the answer: {{"thought": "I now know the final answer", "final_answer": "the final answer to the original input question"}}
+
+Begin!
+
+Chat History: {chat_history}
+
+Question: {input}
+{agent_scratchpad}"""
+
+_PRIMITIVES = {
+    "ws": '" "?',
+    "string": r'"\"" ( [^"\\\x00-\x1F] | "\\" ( ["\\/bfnrt] | "u" [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] ) )* "\""',
+    "integer": '"-"? ( [0-9] | [1-9] [0-9]* )',
+    "number": '"-"? ( [0-9] | [1-9] [0-9]* ) ( "." [0-9]+ )? ( [eE] [-+]? [0-9]+ )?',
+    "boolean": '"true" | "false"',
+    "null": '"null"',
+}
+
+
+def _literal(text: str) -> str:
+    """GBNF literal matching text exactly"""
+    return json.dumps(text)
+
+
+def _json_literal(value: Any) -> str:
+    """GBNF literal matching value serialized as JSON"""
+    return _literal(json.dumps(value))
+
+
+class _GrammarBuilder:
+    def __init__(self):
+        self.rules: Dict[str, str] = dict(_PRIMITIVES)
+
+    def value(self, schema: Dict[str, Any], defs: Dict[str, Any]) -> str:
+        """Inline GBNF expression for a JSON schema value"""
+        if "$ref" in schema:
+            return self.value(defs[schema["$ref"].split("/")[-1]], defs)
+        if "allOf" in schema and len(schema["allOf"]) == 1:
+            return self.value(schema["allOf"][0], defs)
+        if "anyOf" in schema:
+            return "( " + " | ".join(self.value(option, defs) for option in schema["anyOf"]) + " )"
+        if "enum" in schema:
+            return "( " + " | ".join(_json_literal(option) for option in schema["enum"]) + " )"
+        if schema.get("type") in _PRIMITIVES:
+            return schema["type"]
+        raise ValueError(f"Unsupported schema for tool grammar: {schema}")
+
+    def model(self, name: str, model: Type[BaseModel]) -> str:
+        """Object rule with required fields in order, then each optional field"""
+        schema = model.model_json_schema()
+        defs = schema.get("$defs", {})
+        properties = schema["properties"]
+        required = [key for key in properties if key in schema.get("required", [])] or list(properties)[:1]
+
+        def member(key: str) -> str:
+            return f'{_json_literal(key)} ws ":" ws {self.value(properties[key], defs)}'
+
+        rule = '"{" ws ' + ' "," ws '.join(member(key) for key in required)
+        for key in properties:
+            if key not in required:
+                rule += f' ( "," ws {member(key)} )?'
+        self.rules[name] = rule + ' ws "}"'
+        return name
+
+    def tool_call(self, tool: str, tool_input: Union[Type[BaseModel], Type[int], Type[str], None]) -> str:
+        if tool_input is None:
+            input_rule = _json_literal("all")
+        elif tool_input is int:
+            input_rule = "integer"
+        elif tool_input is str:
+            input_rule = "string"
+        else:
+            input_rule = self.model(f"{tool.replace('_', '-')}-input", tool_input)
+        name = f"call-{tool.replace('_', '-')}"
+        self.rules[name] = f'{_json_literal("action")} ws ":" ws {_json_literal(tool)} ws "," ws {_json_literal("action_input")} ws ":" ws {input_rule}'
+        return name
+
+    def build(self, tools: Sequence[str]) -> str:
+        steps = [self.tool_call(tool, TOOL_INPUTS[tool]) for tool in tools]
+        self.rules["final"] = f'{_json_literal("final_answer")} ws ":" ws string'
+        self.rules["root"] = (
+            f'"{{" ws {_json_literal("thought")} ws ":" ws string "," ws ( '
+            + " | ".join(steps + ["final"]) + ' ) ws "}"'
+        )
+        ordered = {"root": self.rules.pop("root"), **self.rules}
+        return "\n".join(f"{name} ::= {rule}" for name, rule in ordered.items())
+
+
+def build_tool_call_grammar(tools: Sequence[str]) -> str:
+    """GBNF grammar accepting one JSON tool call or final answer for the given tools"""
+    return _GrammarBuilder().build(tools)
+
+
+class JSONToolCallParser(AgentOutputParser):
+    """Parse one JSON agent step into an AgentAction or AgentFinish"""
+
+    def parse(self, text: str) -> Union[AgentAction, AgentFinish]:
+        try:
+            step = json.loads(text)
+            if "final_answer" in step:
+                return AgentFinish({"output": step["final_answer"]}, text)
+            tool_input = step["action_input"]
+            if not isinstance(tool_input, str):
+                tool_input = json.dumps(tool_input)
+            return AgentAction(step["action"], tool_input, text)
+        except (ValueError, KeyError, TypeError) as e:
+            raise OutputParserException(
+                f"Could not parse tool call: {text}",
+                observation="Invalid step: reply with a single JSON object in the required format.",
+                llm_output=text,
+                send_to_llm=True
+            ) from e
+
+    @property
+    def _type(self) -> str:
+        return "json-tool-call"
+
+
+def format_json_steps(intermediate_steps: List[Tuple[AgentAction, str]]) -> str:
+    return "".join(f"{action.log}\nObservation: {observation}\n" for action, observation in intermediate_steps)
+
+
+def create_json_tool_agent(llm: Any, tools: Sequence[Any], prompt: PromptTemplate, grammar: Optional[Any] = None):
+    """Runnable agent emitting grammar-constrained JSON steps, analogous to create_react_agent"""
+    prompt = prompt.partial(
+        tools=render_text_description(list(tools)),
+        tool_names=", ".join(tool.name for tool in tools),
+    )
+    llm_with_grammar = llm.bind(grammar=grammar) if grammar is not None else llm
+    return (
+        RunnablePassthrough.assign(agent_scratchpad=lambda x: format_json_steps(x["intermediate_steps"]))
+        | prompt
+        | llm_with_grammar
+        | JSONToolCallParser()
+    )
@@ -0,0 +1,7 @@
+"""Reproducible benchmarks for the CRM API and the AI agent, run from the backend directory.
+
+    python -m benchmarks.seed --contacts 100000 --reset
+    python -m benchmarks.load --dataset bench-dataset.json --output run.json
+    python -m benchmarks.compare baseline.json run.json
+    python -m benchmarks.agent --output agent.json
+"""
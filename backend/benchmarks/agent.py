@@ -0,0 +1,339 @@
+"""Measure the agent's own overhead per chat request, with a scripted LLM instead of a model.
+
+Each scenario is a canned conversation that CRMAIAgent.process_message runs
+against the real tools and database (DATABASE_URL). Inference time is whatever
+the configured token rates make it, 0 by default, so the report isolates
+prompt assembly, output parsing, tool execution, DB sessions and iterations.
+"""
+from collections import defaultdict
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple, Union
+from uuid import UUID
+import argparse
+import json
+import os
+import time
+import uuid
+
+from langchain.callbacks.base import BaseCallbackHandler
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.api import crud
+from app.database import SessionLocal, engine, init_db
+from app.models import Contact, Pipeline
+from app.schemas import ContactCreate, PipelineCreate
+from app.services.ai_agent import CRMAIAgent
+from app.services.llm_backends import ScriptedBackend
+
+from .load import percentile
+
+BENCH_EMAIL = "agent-bench@example.com"
+BENCH_PIPELINE = "Agent benchmark"
+
+# A step is (thought, tool, tool input); a string is the final answer; None is output the parser rejects
+Step = Union[Tuple[str, str, Any], str, None]
+
+# Messages are phrased so the intent router leaves them to the agent
+SCENARIOS: Dict[str, Tuple[str, List[Step]]] = {
+    "answer_only": (
+        "What can you help me with?",
+        ["I can create and look up contacts, pipelines, deals and tasks."],
+    ),
+    "list_contacts": (
+        "Who is in my CRM at the moment?",
+        [("I should list the contacts", "get_contacts", "all"), "These are your most recent contacts."],
+    ),
+    "search_then_get": (
+        "Find the Acme benchmark contact and tell me their phone number",
+        [
+            ("I should search for the contact", "search_contacts", "Acme"),
+            ("I should fetch the contact's details", "get_contact", "{contact_id}"),
+            "Their phone number is +1-555-0100.",
+        ],
+    ),
+    "create_contact": (
+        "Add Jane Roe from Initech as a new contact",
+        [
+            ("I should create the contact", "create_contact", {
+                "first_name": "Jane", "last_name": "Roe", "email": "jane-{run}-{n}@example.com", "company": "Initech",
+            }),
+            "Jane Roe has been added.",
+        ],
+    ),
+    "create_deal": (
+        "Open a 5000 dollar deal for contact {contact_id} in pipeline {pipeline_id}",
+        [
+            ("I should create the deal", "create_deal", {
+                "title": "Benchmark deal {n}", "value": 5000, "pipeline_id": "{pipeline_id}", "contact_id": "{contact_id}",
+            }),
+            "The deal has been created.",
+        ],
+    ),
+    "recover_from_bad_output": (
+        "Remind me to call contact {contact_id} tomorrow",
+        [
+            None,
+            ("I should create a task", "create_task", {
+                "title": "Call contact {contact_id}", "contact_id": "{contact_id}", "priority": "high",
+            }),
+            "The reminder has been created.",
+        ],
+    ),
+}
+
+
+def _fill(value: Any, params: Dict[str, Any]) -> Any:
+    """Substitute {placeholders}; a value that is only a placeholder takes the parameter's type"""
+    if isinstance(value, dict):
+        return {key: _fill(item, params) for key, item in value.items()}
+    if isinstance(value, str):
+        if value.startswith("{") and value.endswith("}") and value[1:-1] in params:
+            return params[value[1:-1]]
+        return value.format(**params)
+    return value
+
+
+def render_step(step: Step, tool_mode: str, params: Dict[str, Any]) -> str:
+    """The completion a model would produce for a step, in the format of the agent's tool mode"""
+    if step is None:
+        return "I am not sure what to do next." if tool_mode == "react" else "not a tool call"
+    if isinstance(step, str):
+        answer = _fill(step, params)
+        if tool_mode == "react":
+            return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+        return json.dumps({"thought": "I now know the final answer", "final_answer": answer})
+    thought, tool, tool_input = step
+    tool_input = _fill(tool_input, params)
+    if tool_mode == "react":
+        text = json.dumps(tool_input) if isinstance(tool_input, dict) else str(tool_input)
+        return f"Thought: {thought}\nAction: {tool}\nAction Input: {text}"
+    return json.dumps({"thought": thought, "action": tool, "action_input": tool_input})
+
+
+class OverheadHandler(BaseCallbackHandler):
+    """Time spent in each part of one agent request"""
+
+    def __init__(self, count_tokens: Callable[[str], int]):
+        self.count_tokens = count_tokens
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._started: Dict[UUID, Tuple[str, float]] = {}
+
+    def _start(self, kind: str, run_id: UUID) -> None:
+        self._started[run_id] = (kind, time.perf_counter())
+
+    def _end(self, run_id: UUID) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.seconds[started[0]] += time.perf_counter() - started[1]
+
+    def on_chain_start(self, serialized: Dict[str, Any], inputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        # The scratchpad is formatted by a RunnableAssign ahead of the prompt template
+        if kwargs.get("run_type") == "prompt" or str(kwargs.get("name", "")).startswith("RunnableAssign"):
+            self._start("prompt", run_id)
+        elif kwargs.get("run_type") == "parser":
+            self._start("parse", run_id)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self.counts["llm_calls"] += 1
+        self.counts["prompt_tokens"] += sum(self.count_tokens(prompt) for prompt in prompts)
+        self._start("llm", run_id)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self.counts["tool_calls"] += 1
+        self._start("tool", run_id)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_agent_action(self, action: Any, **kwargs: Any) -> None:
+        self.counts["iterations"] += 1
+
+    def on_agent_finish(self, finish: Any, **kwargs: Any) -> None:
+        self.counts["iterations"] += 1
+
+
+class DatabaseCounter:
+    """Sessions, pool checkouts and statements seen since the last reset"""
+
+    def __init__(self):
+        self.sessions: set = set()
+        self.connections = 0
+        self.queries = 0
+        event.listen(Session, "after_begin", self._after_begin)
+        event.listen(engine, "checkout", self._checkout)
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+
+    def reset(self) -> None:
+        self.sessions = set()
+        self.connections = 0
+        self.queries = 0
+
+    def _after_begin(self, session: Session, transaction: Any, connection: Any) -> None:
+        self.sessions.add(id(session))
+
+    def _checkout(self, *args: Any) -> None:
+        self.connections += 1
+
+    def _before_cursor_execute(self, *args: Any) -> None:
+        self.queries += 1
+
+
+def _fixtures() -> Dict[str, int]:
+    """Ids of the contact and pipeline the scenarios refer to, created on first use"""
+    with SessionLocal() as db:
+        contact = db.scalar(select(Contact).where(Contact.email == BENCH_EMAIL))
+        if contact is None:
+            contact = crud.create_contact(db, ContactCreate(
+                first_name="Bench", last_name="Mark", email=BENCH_EMAIL, phone="+1-555-0100", company="Acme",
+            ))
+        pipeline = db.scalar(select(Pipeline).where(Pipeline.name == BENCH_PIPELINE))
+        if pipeline is None:
+            pipeline = crud.create_pipeline(db, PipelineCreate(name=BENCH_PIPELINE))
+        return {"contact_id": contact.id, "pipeline_id": pipeline.id}
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "mean": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50": round(percentile(ordered, 0.50), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+    }
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Any]:
+    timings = ("total_ms", "overhead_ms", "prompt_ms", "parse_ms", "tool_ms", "llm_ms")
+    counts = ("iterations", "llm_calls", "tool_calls", "prompt_tokens", "db_sessions", "db_connections", "queries")
+    summary: Dict[str, Any] = {"requests": len(samples)}
+    for name in timings:
+        summary[name] = _distribution([sample[name] for sample in samples])
+    for name in counts:
+        summary[name] = round(sum(sample[name] for sample in samples) / len(samples), 2) if samples else 0.0
+    return summary
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    os.environ["AGENT_TOOL_MODE"] = args.tool_mode
+    init_db()
+    params = _fixtures()
+    run_token = uuid.uuid4().hex[:8]
+    total = args.warmup + args.requests
+
+    plan: List[Tuple[str, str, int]] = []
+    script: List[str] = []
+    for n in range(total):
+        name = args.scenarios[n % len(args.scenarios)]
+        message, steps = SCENARIOS[name]
+        values = dict(params, run=run_token, n=n)
+        plan.append((name, _fill(message, values), len(steps)))
+        script.extend(render_step(step, args.tool_mode, values) for step in steps)
+
+    agent = CRMAIAgent(ScriptedBackend(
+        script, tokens_per_second=args.tokens_per_second, prompt_tokens_per_second=args.prompt_tokens_per_second,
+    ))
+    if not agent.initialize():
+        raise SystemExit(f"Agent failed to initialize: {agent.load_error}")
+    database = DatabaseCounter()
+
+    samples: Dict[str, List[Dict[str, float]]] = defaultdict(list)
+    # AgentExecutor runs with verbose=True; keep its trace out of the report
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for n, (name, message, expected_steps) in enumerate(plan):
+            handler = OverheadHandler(agent.llm.get_num_tokens)
+            database.reset()
+            started = time.perf_counter()
+            agent.process_message(message, callbacks=[handler])
+            total_ms = (time.perf_counter() - started) * 1000
+            if handler.counts["llm_calls"] != expected_steps:
+                raise SystemExit(
+                    f"Scenario {name} made {handler.counts['llm_calls']} LLM calls instead of {expected_steps}; "
+                    "the script is out of step with the agent"
+                )
+            if n < args.warmup:
+                continue
+            seconds = {kind: value * 1000 for kind, value in handler.seconds.items()}
+            samples[name].append({
+                "total_ms": total_ms,
+                "overhead_ms": total_ms - seconds.get("llm", 0.0) - seconds.get("tool", 0.0),
+                "prompt_ms": seconds.get("prompt", 0.0),
+                "parse_ms": seconds.get("parse", 0.0),
+                "tool_ms": seconds.get("tool", 0.0),
+                "llm_ms": seconds.get("llm", 0.0),
+                "iterations": handler.counts["iterations"],
+                "llm_calls": handler.counts["llm_calls"],
+                "tool_calls": handler.counts["tool_calls"],
+                "prompt_tokens": handler.counts["prompt_tokens"],
+                "db_sessions": len(database.sessions),
+                "db_connections": database.connections,
+                "queries": database.queries,
+            })
+
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "database": engine.dialect.name,
+            "tool_mode": args.tool_mode,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "tokens_per_second": args.tokens_per_second,
+            "prompt_tokens_per_second": args.prompt_tokens_per_second,
+            "scenarios": args.scenarios,
+        },
+        "summary": summarize([sample for scenario in samples.values() for sample in scenario]),
+        "scenarios": {name: summarize(samples[name]) for name in args.scenarios if name in samples},
+    }
+
+
+def _scenarios(value: str) -> List[str]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(SCENARIOS))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown scenarios: {', '.join(unknown)}")
+    return names
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.agent", description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300, help="Measured requests, spread evenly over the scenarios")
+    parser.add_argument("--warmup", type=int, default=30, help="Requests run before measuring starts")
+    parser.add_argument("--tool-mode", choices=("react", "grammar"), default=os.getenv("AGENT_TOOL_MODE", "react"))
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated generation speed; 0 is instant")
+    parser.add_argument(
+        "--prompt-tokens-per-second", type=float, default=0.0, help="Simulated prompt evaluation speed; 0 is instant"
+    )
+    parser.add_argument(
+        "--scenarios", type=_scenarios, default=list(SCENARIOS),
+        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
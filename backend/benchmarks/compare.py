@@ -0,0 +1,68 @@
+"""Compare two load benchmark reports and fail when latency or throughput regressed"""
+from typing import Any, Dict, List
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+# p99 is shown but not gated on; it is too noisy across short runs
+GATED_METRICS = ("p50_ms", "p95_ms", "throughput_rps")
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float) -> List[str]:
+    """Print a per-operation table and return the regressions beyond `max_regression`"""
+    regressions = []
+    rows = [("summary", baseline["summary"], current["summary"])] + [
+        (name, baseline["operations"][name], stats)
+        for name, stats in current["operations"].items()
+        if name in baseline["operations"]
+    ]
+    print(f"{'operation':<20}" + "".join(f"{metric:>22}" for metric in METRICS))
+    for name, before, after in rows:
+        cells = []
+        for metric in METRICS:
+            change = _change(before[metric], after[metric])
+            cells.append(f"{after[metric]:>12.2f} ({change:+6.1%})")
+            # Latency regresses upwards, throughput downwards
+            regressed = -change if metric == "throughput_rps" else change
+            if metric in GATED_METRICS and regressed > max_regression:
+                regressions.append(f"{name} {metric}: {before[metric]} -> {after[metric]} ({change:+.1%})")
+        print(f"{name:<20}" + "".join(f"{cell:>22}" for cell in cells))
+    if baseline.get("dataset") != current.get("dataset"):
+        print("Warning: the reports were produced against different datasets")
+    if {k: v for k, v in baseline["config"].items() if k != "base_url"} != {
+        k: v for k, v in current["config"].items() if k != "base_url"
+    }:
+        print("Warning: the reports were produced with different load settings")
+    return regressions
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description=__doc__)
+    parser.add_argument("baseline", help="Report from benchmarks.load to compare against")
+    parser.add_argument("current", help="Report from benchmarks.load for the change under test")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.10,
+        help="Allowed relative slowdown of p50/p95 and drop in throughput, e.g. 0.10 for 10%%",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.max_regression)
+    if regressions:
+        print("Regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Drive the /api/v1 CRUD endpoints with concurrent clients and report latency percentiles as JSON.
+
+Each worker thread keeps one keep-alive connection and draws its operations
+from its own seeded random stream, so a run against the same dataset with the
+same arguments sends the same requests. Updates modify seeded rows, so reseed
+before runs that are meant to be compared.
+"""
+from datetime import datetime, timezone
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+
+from app.api.pagination import encode_cursor
+
+API_PREFIX = "/api/v1"
+PAGE_SIZE = 50
+DEEP_PAGE_SIZE = 100
+
+# Relative weight of each operation in the default mix: mostly reads, a fifth writes
+OPERATIONS = {
+    "list_contacts": 8, "list_deals": 8, "list_tasks": 8,
+    "get_contact": 12, "get_deal": 12, "get_task": 12,
+    "create_contact": 3, "create_deal": 3, "create_task": 3,
+    "update_contact": 3, "update_deal": 3, "update_task": 3,
+    "delete_contact": 2, "delete_deal": 2, "delete_task": 2,
+    "deep_page_cursor": 5, "deep_page_offset": 5,
+}
+
+DEAL_STATUSES = ["lead", "qualified", "proposal", "negotiation", "won", "lost"]
+TASK_STATUSES = ["todo", "in_progress", "completed", "cancelled"]
+TASK_PRIORITIES = ["low", "medium", "high", "urgent"]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, seconds: float) -> Dict[str, Any]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / seconds, 1) if seconds else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+class Worker(threading.Thread):
+    """One simulated client: a connection, a random stream and the rows it created"""
+
+    def __init__(self, index: int, args: argparse.Namespace, dataset: Dict[str, Any], measure_from: float, deadline: float):
+        super().__init__(name=f"bench-worker-{index}", daemon=True)
+        self.index = index
+        self.url = urlsplit(args.base_url)
+        self.timeout = args.timeout
+        self.dataset = dataset
+        self.measure_from = measure_from
+        self.deadline = deadline
+        self.rng = random.Random(f"{args.seed}-{index}")
+        self.operations = [name for name in OPERATIONS if name in args.ops]
+        self.weights = [OPERATIONS[name] for name in self.operations]
+        self.email_prefix = f"load-{args.run_token}-{index}"
+        self.created: Dict[str, List[int]] = {"contacts": [], "deals": [], "tasks": []}
+        self.latencies: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+        self.errors: Dict[str, int] = {name: 0 for name in OPERATIONS}
+        self.sequence = 0
+        self.conn: Optional[HTTPConnection] = None
+
+    # HTTP
+    def _connect(self) -> HTTPConnection:
+        cls = HTTPSConnection if self.url.scheme == "https" else HTTPConnection
+        return cls(self.url.hostname, self.url.port, timeout=self.timeout)
+
+    def request(self, name: str, method: str, path: str, body: Any = None) -> Tuple[int, bytes]:
+        """Send one request, recording its latency under `name` once the warmup is over"""
+        if self.conn is None:
+            self.conn = self._connect()
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        payload = json.dumps(body).encode() if body is not None else None
+        started = time.perf_counter()
+        try:
+            self.conn.request(method, API_PREFIX + path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            status, data = response.status, response.read()
+        except (HTTPException, OSError):
+            self.conn.close()
+            self.conn = None
+            status, data = 0, b""
+        elapsed = time.perf_counter() - started
+        if started >= self.measure_from:
+            if status == 0 or status >= 400:
+                self.errors[name] += 1
+            else:
+                self.latencies[name].append(elapsed)
+        return status, data
+
+    # Dataset helpers
+    def _random_id(self, table: str) -> int:
+        ids = self.dataset[table]
+        return self.rng.randint(ids["min_id"], ids["max_id"])
+
+    def _created(self, table: str, status: int, data: bytes) -> None:
+        if status == 201:
+            self.created[table].append(json.loads(data)["id"])
+
+    # Operations
+    def list_contacts(self) -> None:
+        self.request("list_contacts", "GET", f"/contacts?limit={PAGE_SIZE}")
+
+    def list_deals(self) -> None:
+        params = {"limit": PAGE_SIZE, "status": self.rng.choice(DEAL_STATUSES), "sort": "-value"}
+        self.request("list_deals", "GET", f"/deals?{urlencode(params)}")
+
+    def list_tasks(self) -> None:
+        params = {"limit": PAGE_SIZE, "status": self.rng.choice(TASK_STATUSES), "sort": "due_date"}
+        self.request("list_tasks", "GET", f"/tasks?{urlencode(params)}")
+
+    def get_contact(self) -> None:
+        self.request("get_contact", "GET", f"/contacts/{self._random_id('contacts')}")
+
+    def get_deal(self) -> None:
+        self.request("get_deal", "GET", f"/deals/{self._random_id('deals')}")
+
+    def get_task(self) -> None:
+        self.request("get_task", "GET", f"/tasks/{self._random_id('tasks')}")
+
+    def create_contact(self) -> None:
+        self.sequence += 1
+        body = {
+            "first_name": "Load", "last_name": f"Test {self.sequence}",
+            "email": f"{self.email_prefix}-{self.sequence}@example.com", "company": "Benchmark",
+        }
+        self._created("contacts", *self.request("create_contact", "POST", "/contacts", body))
+
+    def create_deal(self) -> None:
+        body = {
+            "title": "Load test deal", "value": round(self.rng.uniform(100, 50000), 2),
+            "status": self.rng.choice(DEAL_STATUSES),
+            "pipeline_id": self._random_id("pipelines"), "contact_id": self._random_id("contacts"),
+        }
+        self._created("deals", *self.request("create_deal", "POST", "/deals", body))
+
+    def create_task(self) -> None:
+        body = {
+            "title": "Load test task", "priority": self.rng.choice(TASK_PRIORITIES),
+            "contact_id": self._random_id("contacts"),
+        }
+        self._created("tasks", *self.request("create_task", "POST", "/tasks", body))
+
+    def update_contact(self) -> None:
+        body = {"position": self.rng.choice(["CEO", "CTO", "Engineer", "Buyer"])}
+        self.request("update_contact", "PATCH", f"/contacts/{self._random_id('contacts')}", body)
+
+    def update_deal(self) -> None:
+        if self.rng.random() < 0.5:
+            body: Dict[str, Any] = {"value": round(self.rng.uniform(100, 50000), 2)}
+        else:
+            body = {"status": self.rng.choice(DEAL_STATUSES)}
+        self.request("update_deal", "PATCH", f"/deals/{self._random_id('deals')}", body)
+
+    def update_task(self) -> None:
+        body = {"status": self.rng.choice(TASK_STATUSES)}
+        self.request("update_task", "PATCH", f"/tasks/{self._random_id('tasks')}", body)
+
+    def _delete_created(self, name: str, table: str, create) -> None:
+        # Only rows this worker created are deleted, so the seeded dataset stays whole
+        if not self.created[table]:
+            create()
+            return
+        self.request(name, "DELETE", f"/{table}/{self.created[table].pop()}")
+
+    def delete_contact(self) -> None:
+        self._delete_created("delete_contact", "contacts", self.create_contact)
+
+    def delete_deal(self) -> None:
+        self._delete_created("delete_deal", "deals", self.create_deal)
+
+    def delete_task(self) -> None:
+        self._delete_created("delete_task", "tasks", self.create_task)
+
+    def deep_page_cursor(self) -> None:
+        after = encode_cursor(self._random_id("deals"))
+        self.request("deep_page_cursor", "GET", f"/deals?limit={DEEP_PAGE_SIZE}&after={after}")
+
+    def deep_page_offset(self) -> None:
+        skip = self.rng.randrange(max(1, self.dataset["deals"]["count"]))
+        self.request("deep_page_offset", "GET", f"/deals?limit={DEEP_PAGE_SIZE}&skip={skip}")
+
+    def run(self) -> None:
+        while time.perf_counter() < self.deadline:
+            name = self.rng.choices(self.operations, self.weights)[0]
+            getattr(self, name)()
+        if self.conn is not None:
+            self.conn.close()
+
+
+def run(args: argparse.Namespace, dataset: Dict[str, Any]) -> Dict[str, Any]:
+    started_at = datetime.now(timezone.utc).isoformat()
+    measure_from = time.perf_counter() + args.warmup
+    deadline = measure_from + args.duration
+    workers = [Worker(i, args, dataset, measure_from, deadline) for i in range(args.concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    operations = {}
+    all_latencies: List[float] = []
+    all_errors = 0
+    for name in OPERATIONS:
+        if name not in args.ops:
+            continue
+        latencies = [value for worker in workers for value in worker.latencies[name]]
+        errors = sum(worker.errors[name] for worker in workers)
+        operations[name] = summarize(latencies, errors, args.duration)
+        all_latencies.extend(latencies)
+        all_errors += errors
+
+    return {
+        "started_at": started_at,
+        "config": {
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "operations": {name: OPERATIONS[name] for name in OPERATIONS if name in args.ops},
+        },
+        "dataset": dataset,
+        "summary": summarize(all_latencies, all_errors, args.duration),
+        "operations": operations,
+    }
+
+
+def _operations(value: str) -> List[str]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(OPERATIONS))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown operations: {', '.join(unknown)}")
+    return names
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--dataset", default="bench-dataset.json", help="Manifest written by benchmarks.seed")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds of load before measuring starts")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument(
+        "--ops", type=_operations, default=list(OPERATIONS),
+        help=f"Comma-separated subset of the mix: {', '.join(OPERATIONS)}",
+    )
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    args = parser.parse_args(argv)
+    args.run_token = uuid.uuid4().hex[:8]
+
+    with open(args.dataset) as f:
+        dataset = json.load(f)
+    report = run(args, dataset)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Seed a deterministic benchmark dataset into DATABASE_URL and write its manifest.
+
+The same arguments always produce the same rows, so runs against different
+commits compare like with like. On PostgreSQL run `alembic upgrade head` first
+so the benchmark sees the production indexes.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select, text
+from typing import Any, Dict, Iterator, List
+import argparse
+import json
+import random
+import time
+
+from app.api import crud
+from app.database import SessionLocal, engine, init_db
+from app.models import Contact, Deal, DealStatus, Pipeline, Task, TaskPriority, TaskStatus
+from app.models.pipeline_summary import PipelineSummary
+
+BATCH_SIZE = 5000
+EPOCH = datetime(2024, 1, 1)
+
+FIRST_NAMES = ["Ada", "Alan", "Barbara", "Claude", "Edsger", "Frances", "Grace", "Ken", "Linus", "Margaret"]
+LAST_NAMES = ["Hopper", "Turing", "Liskov", "Shannon", "Dijkstra", "Allen", "Lovelace", "Thompson", "Hamilton"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Tyrell", None]
+POSITIONS = ["CEO", "CTO", "Engineer", "Buyer", "Sales Manager", "Analyst", None]
+DEAL_STATUSES = list(DealStatus)
+DEAL_STATUS_WEIGHTS = [30, 20, 15, 10, 15, 10]
+TASK_STATUSES = list(TaskStatus)
+TASK_STATUS_WEIGHTS = [40, 20, 35, 5]
+
+
+def _contacts(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        created = EPOCH + timedelta(minutes=i)
+        yield {
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "email": f"bench{i}@example.com",
+            "phone": f"+1-555-{i % 10000:04d}",
+            "company": rng.choice(COMPANIES),
+            "position": rng.choice(POSITIONS),
+            "notes": f"Benchmark contact {i}",
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def _deals(rng: random.Random, contact_ids: range, pipeline_ids: range, per_contact: int) -> Iterator[Dict[str, Any]]:
+    n = 0
+    for contact_id in contact_ids:
+        for _ in range(per_contact):
+            status = rng.choices(DEAL_STATUSES, DEAL_STATUS_WEIGHTS)[0]
+            created = EPOCH + timedelta(minutes=n)
+            yield {
+                "title": f"Deal {n}",
+                "description": None,
+                "value": round(rng.lognormvariate(8, 1.2), 2),
+                "status": status,
+                "pipeline_id": rng.choice(pipeline_ids),
+                "contact_id": contact_id,
+                "created_at": created,
+                "updated_at": created,
+                "closed_at": created + timedelta(days=30) if status in (DealStatus.WON, DealStatus.LOST) else None,
+            }
+            n += 1
+
+
+def _tasks(rng: random.Random, contact_ids: range, per_contact: int) -> Iterator[Dict[str, Any]]:
+    n = 0
+    for contact_id in contact_ids:
+        for _ in range(per_contact):
+            status = rng.choices(TASK_STATUSES, TASK_STATUS_WEIGHTS)[0]
+            created = EPOCH + timedelta(minutes=n)
+            due = EPOCH + timedelta(days=rng.randrange(730)) if rng.random() < 0.9 else None
+            yield {
+                "title": f"Task {n}",
+                "description": None,
+                "priority": rng.choice(list(TaskPriority)),
+                "status": status,
+                "is_completed": status == TaskStatus.COMPLETED,
+                "contact_id": contact_id,
+                "due_date": due,
+                "completed_at": created + timedelta(days=7) if status == TaskStatus.COMPLETED else None,
+                "created_at": created,
+                "updated_at": created,
+            }
+            n += 1
+
+
+def _insert(model: Any, rows: Iterator[Dict[str, Any]]) -> Dict[str, int]:
+    """Insert rows in batches and return the id range they were given"""
+    table = model.__table__
+    before = _max_id(model)
+    batch: List[Dict[str, Any]] = []
+    count = 0
+    with engine.begin() as conn:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                conn.execute(insert(table), batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            conn.execute(insert(table), batch)
+            count += len(batch)
+    with engine.connect() as conn:
+        min_id, max_id = conn.execute(select(func.min(model.id), func.max(model.id)).where(model.id > before)).one()
+    if count and max_id - min_id + 1 != count:
+        raise SystemExit(f"{table.name}: ids are not contiguous; was another writer active during seeding?")
+    print(f"Seeded {count} {table.name}")
+    return {"count": count, "min_id": min_id or 0, "max_id": max_id or 0}
+
+
+def _max_id(model: Any) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.coalesce(func.max(model.id), 0)))
+
+
+def _reset() -> None:
+    """Empty the CRM tables; on PostgreSQL the id sequences restart too, so ids match across runs"""
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("TRUNCATE tasks, deals, pipeline_summaries, pipelines, contacts RESTART IDENTITY CASCADE"))
+        else:
+            for model in (Task, Deal, PipelineSummary, Pipeline, Contact):
+                conn.execute(model.__table__.delete())
+
+
+def seed(args: argparse.Namespace) -> Dict[str, Any]:
+    init_db()
+    if args.reset:
+        _reset()
+    else:
+        with engine.connect() as conn:
+            existing = conn.scalar(select(func.count()).select_from(Contact))
+        if existing:
+            raise SystemExit(f"The database already has {existing} contacts; pass --reset to replace them")
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    pipelines = _insert(Pipeline, (
+        {"name": f"Pipeline {i}", "description": None, "created_at": EPOCH, "updated_at": EPOCH}
+        for i in range(args.pipelines)
+    ))
+    contacts = _insert(Contact, _contacts(rng, args.contacts))
+    contact_ids = range(contacts["min_id"], contacts["max_id"] + 1)
+    pipeline_ids = range(pipelines["min_id"], pipelines["max_id"] + 1)
+    deals = _insert(Deal, _deals(rng, contact_ids, pipeline_ids, args.deals_per_contact))
+    tasks = _insert(Task, _tasks(rng, contact_ids, args.tasks_per_contact))
+
+    with SessionLocal() as db:
+        crud.rebuild_pipeline_summaries(db)
+    # Fresh planner statistics, so the first run does not measure a stale plan
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    return {
+        "database": engine.dialect.name,
+        "seed": args.seed,
+        "contacts": contacts,
+        "pipelines": pipelines,
+        "deals": deals,
+        "tasks": tasks,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed", description=__doc__.splitlines()[0])
+    parser.add_argument("--contacts", type=int, default=10000, help="Contacts to create, e.g. 10000, 100000 or 1000000")
+    parser.add_argument("--deals-per-contact", type=int, default=2)
+    parser.add_argument("--tasks-per-contact", type=int, default=3)
+    parser.add_argument("--pipelines", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same rows")
+    parser.add_argument("--reset", action="store_true", help="Delete all CRM rows before seeding")
+    parser.add_argument("--manifest", default="bench-dataset.json", help="Where to write the dataset description")
+    args = parser.parse_args(argv)
+
+    manifest = seed(args)
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Seeded in {manifest['seconds']}s; dataset written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Shared fixtures: the API and CRUD layer run against a throwaway SQLite database"""
+import os
+import tempfile
+
+# Set before the app is imported, since app.database creates its engines at import time
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="crm-tests-"), "crm.db")
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["MODEL_PRELOAD"] = "false"
+os.environ["ENTITY_CACHE_BACKEND"] = "memory"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.cache import MemoryBackend, entity_cache
+from app.database import Base, SessionLocal, engine, init_db
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clean_database(monkeypatch):
+    """Start every test from empty tables and an empty entity cache"""
+    init_db()
+    # SQLite reuses ids once the tables are emptied, so cached rows must not outlive a test
+    monkeypatch.setattr(entity_cache, "backend", MemoryBackend())
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def client(app_client):
+    return app_client
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def make_contact(client):
+    """Create a contact through the API and return its JSON"""
+    count = 0
+
+    def make(**fields):
+        nonlocal count
+        count += 1
+        body = {"first_name": "Test", "last_name": f"Contact {count}", "email": f"contact{count}@example.com", **fields}
+        response = client.post("/api/v1/contacts", json=body)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return make
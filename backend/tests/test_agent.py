@@ -0,0 +1,151 @@
+import json
+import threading
+
+import pytest
+from langchain.callbacks.base import BaseCallbackHandler
+from sqlalchemy import func, select
+
+from app.api import crud
+from app.models import Contact, Pipeline
+from app.services.ai_agent import CRMAIAgent
+from app.services.llm_backends import BackendUnavailable, LLMBackend, ScriptedBackend, backend_from_env
+
+
+def react(thought, tool, tool_input):
+    text = json.dumps(tool_input) if isinstance(tool_input, dict) else tool_input
+    return f"Thought: {thought}\nAction: {tool}\nAction Input: {text}"
+
+
+def react_answer(answer):
+    return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+
+def json_step(thought, tool, tool_input):
+    return json.dumps({"thought": thought, "action": tool, "action_input": tool_input})
+
+
+def json_answer(answer):
+    return json.dumps({"thought": "I now know the final answer", "final_answer": answer})
+
+
+JANE = {"first_name": "Jane", "last_name": "Roe", "email": "jane@example.com", "company": "Initech"}
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+    def make(script, tool_mode="react"):
+        monkeypatch.setenv("AGENT_TOOL_MODE", tool_mode)
+        agent = CRMAIAgent(ScriptedBackend(script=script))
+        assert agent.initialize(), agent.load_error
+        return agent
+
+    return make
+
+
+def count(db, model):
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def test_react_agent_runs_tools_against_the_database(make_agent, db):
+    agent = make_agent([react("I should create the contact", "create_contact", JANE), react_answer("Jane Roe was added.")])
+    result = agent.process_message("Add Jane Roe from Initech as a new contact", session_id="s1")
+    assert result == {"response": "Jane Roe was added.", "action_taken": "Processed through AI agent", "session_id": "s1"}
+    assert db.scalar(select(Contact.company).where(Contact.email == JANE["email"])) == "Initech"
+    assert agent.llm.calls == 2
+
+
+def test_json_tool_mode_runs_tools_against_the_database(make_agent, db):
+    agent = make_agent(
+        [json_step("I should create it", "create_pipeline", {"name": "Enterprise"}), json_answer("Created.")],
+        tool_mode="grammar",
+    )
+    assert agent.process_message("Set up a pipeline for enterprise sales")["response"] == "Created."
+    assert db.scalar(select(Pipeline.name)) == "Enterprise"
+    assert agent.tool_call_stats()["mode"] == "grammar"
+
+
+def test_malformed_output_is_retried(make_agent):
+    agent = make_agent(["I am not sure what to do next.", react("List them", "get_contacts", "all"), react_answer("None yet.")])
+    assert agent.process_message("Who is in my CRM at the moment?")["response"] == "None yet."
+    stats = agent.tool_call_stats()
+    assert stats["parse_failures"] == 1
+    assert stats["iterations"] == 3
+
+
+def test_tool_calls_commit_before_a_later_failure(make_agent, db):
+    cancelled = threading.Event()
+
+    class CancelAfterTool(BaseCallbackHandler):
+        def on_tool_end(self, output, **kwargs):
+            cancelled.set()
+
+    agent = make_agent([react("I should create the contact", "create_contact", JANE), react_answer("Done.")])
+    result = agent.process_message("Add Jane Roe", callbacks=[CancelAfterTool()], cancelled=cancelled)
+    assert result["response"].startswith("Error processing message")
+    assert count(db, Contact) == 1
+
+
+def test_tool_failing_halfway_rolls_back_its_writes(make_agent, db, monkeypatch):
+    create_contact = crud.create_contact
+
+    def create_then_fail(session, contact):
+        create_contact(session, contact)
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(crud, "create_contact", create_then_fail)
+    agent = make_agent([react("I should create the contact", "create_contact", JANE), react_answer("Done.")])
+    agent.process_message("Add Jane Roe")
+    assert count(db, Contact) == 0
+
+
+def test_history_is_kept_per_session(make_agent):
+    agent = make_agent([react_answer("Hello!")])
+    agent.process_message("Hi there, who are you?", session_id="s1")
+    assert agent.sessions.history("s1") == "Human: Hi there, who are you?\nAI: Hello!"
+    assert agent.sessions.history("s2") == ""
+
+
+def test_routed_commands_skip_the_llm(make_agent, db):
+    agent = make_agent([react_answer("unused")])
+    result = agent.process_message("create a pipeline called Renewals")
+    assert result["action_taken"] == "Fast path: create_pipeline"
+    assert db.scalar(select(Pipeline.name)) == "Renewals"
+    assert agent.llm.calls == 0
+
+
+def test_messages_before_initialization_get_a_notice():
+    agent = CRMAIAgent(ScriptedBackend(script=["unused"]))
+    assert "not initialized" in agent.process_message("What can you help me with?")["response"]
+
+
+def test_unknown_backend_fails_the_load_not_the_import(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "bogus")
+    with pytest.raises(BackendUnavailable):
+        backend_from_env()
+    agent = CRMAIAgent()
+    assert agent.initialize() is False
+    assert "bogus" in agent.load_error
+
+
+@pytest.mark.parametrize("backend", [
+    ScriptedBackend(script_path="/nonexistent/script.json"),
+    ScriptedBackend(script=[]),
+])
+def test_unusable_scripts_are_reported(backend):
+    agent = CRMAIAgent(backend)
+    assert agent.initialize() is False
+    assert agent.load_error
+
+
+def test_script_file_must_hold_completions(tmp_path):
+    path = tmp_path / "script.json"
+    path.write_text(json.dumps({"not": "a list"}))
+    with pytest.raises(BackendUnavailable):
+        ScriptedBackend(script_path=str(path)).create_llm()
+    path.write_text(json.dumps([react_answer("ok")]))
+    assert ScriptedBackend(script_path=str(path)).create_llm().invoke("prompt") == react_answer("ok")
+
+
+def test_backends_must_implement_create_llm():
+    with pytest.raises(TypeError):
+        LLMBackend()
@@ -0,0 +1,56 @@
+from app.api import crud
+from app.schemas.bulk import BULK_MAX_ITEMS
+
+
+def contact(number, **fields):
+    return {"first_name": "Bulk", "last_name": str(number), "email": f"bulk{number}@example.com", **fields}
+
+
+def test_invalid_rows_are_rejected_individually(client):
+    items = [contact(1), {"first_name": "No", "last_name": "Email"}, contact(2, email="not-an-email")]
+    body = client.post("/api/v1/contacts/bulk", json={"items": items}).json()
+    assert (body["created"], body["failed"]) == (1, 2)
+    assert [result["status"] for result in body["results"]] == ["created", "error", "error"]
+    assert body["results"][1]["error"].startswith("email:")
+    assert body["results"][2]["error"].startswith("email:")
+
+
+def test_duplicate_emails_in_a_batch_keep_the_first_row(client):
+    items = [contact(1, company="First"), contact(1, company="Second"), contact(2)]
+    body = client.post("/api/v1/contacts/bulk", json={"items": items}).json()
+    assert [result["status"] for result in body["results"]] == ["created", "error", "created"]
+    assert body["results"][1]["error"] == "Duplicate email in batch"
+    assert client.get(f"/api/v1/contacts/{body['results'][0]['id']}").json()["company"] == "First"
+    assert len(client.get("/api/v1/contacts").json()) == 2
+
+
+def test_existing_emails_fail_without_upsert(client, make_contact):
+    existing = make_contact(email="bulk1@example.com")
+    body = client.post("/api/v1/contacts/bulk", json={"items": [contact(1), contact(2)]}).json()
+    assert [result["status"] for result in body["results"]] == ["error", "created"]
+    assert client.get(f"/api/v1/contacts/{existing['id']}").json()["last_name"] == existing["last_name"]
+
+
+def test_upsert_updates_existing_contacts_by_email(client, make_contact):
+    existing = make_contact(email="bulk1@example.com", company="Acme")
+    assert client.get(f"/api/v1/contacts/{existing['id']}").status_code == 200  # cached
+
+    items = [contact(1, company="Initech"), contact(2)]
+    body = client.post("/api/v1/contacts/bulk", json={"items": items, "upsert": True}).json()
+    assert (body["created"], body["updated"]) == (1, 1)
+    assert body["results"][0] == {"index": 0, "id": existing["id"], "status": "updated", "error": None}
+    assert client.get(f"/api/v1/contacts/{existing['id']}").json()["company"] == "Initech"
+
+
+def test_upsert_is_refused_where_the_database_cannot_do_it(client, monkeypatch):
+    monkeypatch.setattr(crud, "UPSERT_INSERTS", {})
+    response = client.post("/api/v1/contacts/bulk", json={"items": [contact(1)], "upsert": True})
+    assert response.status_code == 501
+    assert "upsert=false" in response.json()["detail"]
+    assert client.post("/api/v1/contacts/bulk", json={"items": [contact(1)]}).json()["created"] == 1
+
+
+def test_batches_are_limited(client):
+    items = [contact(number) for number in range(BULK_MAX_ITEMS + 1)]
+    assert client.post("/api/v1/contacts/bulk", json={"items": items}).status_code == 422
+    assert client.post("/api/v1/contacts/bulk/delete", json={"ids": list(range(BULK_MAX_ITEMS + 1))}).status_code == 422
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from app.api import routes
+from app.services import ai_agent as ai_agent_module
+from app.services import inference
+from app.services.ai_agent import CRMAIAgent
+from app.services.inference import InferenceCancelled, InferenceWorker
+from app.services.llm_backends import ScriptedBackend
+
+QUESTION = "Which deals should I chase this week?"
+SLOW_ANSWER = "Thought: I now know the final answer\nFinal Answer: " + "Chase the open deals. " * 20
+
+
+def react(thought, tool, tool_input):
+    return f"Thought: {thought}\nAction: {tool}\nAction Input: {tool_input}"
+
+
+def react_answer(answer):
+    return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+
+def sse_events(body):
+    """(event, data) pairs of a text/event-stream body"""
+    events = []
+    for frame in body.split("\n\n"):
+        if not frame:
+            continue
+        fields = dict(line.split(": ", 1) for line in frame.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def use_agent(monkeypatch):
+    """Serve /chat from a scripted agent on its own inference worker"""
+    workers = []
+
+    def use(script, tokens_per_second=0.0, **worker_options):
+        agent = CRMAIAgent(ScriptedBackend(script=script, tokens_per_second=tokens_per_second))
+        assert agent.initialize(), agent.load_error
+        agent.state = "ready"
+        worker = InferenceWorker(**worker_options)
+        workers.append(worker)
+        monkeypatch.setattr(routes, "ai_agent", agent)
+        monkeypatch.setattr(routes, "inference_worker", worker)
+        monkeypatch.setattr(ai_agent_module, "inference_worker", worker)
+        assert not agent.is_fast_path(QUESTION)
+        return agent, worker
+
+    yield use
+    for worker in workers:
+        worker.shutdown()
+
+
+def wait_until_idle(worker, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while worker.pending and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return worker.pending == 0
+
+
+def test_stream_frames_tokens_tool_calls_and_the_final_answer(client, use_agent):
+    use_agent([react("I should look at the pipelines", "get_pipelines", ""), react_answer("No pipelines yet.")])
+    response = client.post("/api/v1/chat/stream", json={"message": QUESTION})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.endswith("\n\n")
+
+    events = sse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "token"
+    assert names.index("tool_start") < names.index("tool_end") < names.index("final")
+    assert names[-1] == "final"
+    assert "".join(data["token"] for name, data in events if name == "token").startswith("Thought: I should look")
+    assert events[names.index("tool_end")][1]["output"] == "No pipelines found."
+    assert events[-1][1]["response"] == "No pipelines yet."
+
+
+def test_stream_reports_a_timeout_as_an_error_event(client, use_agent):
+    _, worker = use_agent([SLOW_ANSWER], tokens_per_second=20, timeout=0.3)
+    events = sse_events(client.post("/api/v1/chat/stream", json={"message": QUESTION}).text)
+    assert events[-1] == ("error", {"detail": "AI agent timed out"})
+    assert "final" not in [name for name, _ in events]
+    assert wait_until_idle(worker)
+
+
+def test_chat_times_out_and_frees_its_slot(client, use_agent):
+    agent, worker = use_agent([SLOW_ANSWER], tokens_per_second=20, timeout=0.3)
+    response = client.post("/api/v1/chat", json={"message": QUESTION})
+    assert response.status_code == 504
+    # The abandoned run stops at its next token instead of generating the whole answer
+    assert wait_until_idle(worker, timeout=1.0)
+    assert agent.llm.calls == 1
+
+
+def test_full_queue_is_a_503_with_retry_after(client, use_agent, monkeypatch):
+    _, worker = use_agent([react_answer("unused")], concurrency=1, queue_size=0)
+    monkeypatch.setattr(worker, "pending", worker.max_pending)
+
+    for path in ("/api/v1/chat", "/api/v1/chat/stream"):
+        response = client.post(path, json={"message": QUESTION})
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.json()["detail"] == "AI agent is busy, please retry later"
+
+
+def test_disconnected_client_drops_its_queued_job(monkeypatch):
+    monkeypatch.setattr(inference, "DISCONNECT_POLL_INTERVAL", 0.01)
+    worker = InferenceWorker(concurrency=1, queue_size=1, timeout=5)
+    release = threading.Event()
+    ran = []
+
+    async def scenario():
+        busy = worker.submit(lambda cancelled: release.wait(5))
+
+        async def disconnected():
+            return True
+
+        with pytest.raises(InferenceCancelled):
+            await worker.run(lambda cancelled: ran.append(True), is_disconnected=disconnected)
+        release.set()
+        await busy.future
+        # Let the done callbacks free both slots
+        while worker.pending:
+            await asyncio.sleep(0.01)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        worker.shutdown()
+    assert ran == []
@@ -0,0 +1,176 @@
+import asyncio
+from datetime import datetime
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from app.api import cache
+from app.api.cache import EntityCache, MemoryBackend, RedisBackend, entity_cache
+from app.models import Contact, Deal
+from app.models.pipeline import DealStatus
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_the_ttl(clock):
+    backend = MemoryBackend(ttl=30)
+    backend.set("contacts:1", {"id": 1})
+    clock[0] += 29
+    assert backend.get("contacts:1") == {"id": 1}
+    clock[0] += 1
+    assert backend.get("contacts:1") is None
+    assert backend.evictions == 1
+    assert backend.size() == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", {"id": 1})
+    backend.set("b", {"id": 2})
+    backend.get("a")
+    backend.set("c", {"id": 3})
+    assert backend.get("b") is None
+    assert backend.get("a") == {"id": 1}
+    assert backend.get("c") == {"id": 3}
+    assert backend.evictions == 1
+
+
+def test_cached_rows_are_copies():
+    backend = MemoryBackend()
+    row = {"id": 1, "first_name": "Ada"}
+    backend.set("contacts:1", row)
+    row["first_name"] = "Changed"
+    backend.get("contacts:1")["first_name"] = "Changed"
+    assert backend.get("contacts:1") == {"id": 1, "first_name": "Ada"}
+
+
+def test_invalidate_removes_keys_and_counts_them():
+    entities = EntityCache(MemoryBackend())
+    entities.backend.set("contacts:1", {"id": 1})
+    entities.backend.set("contacts:2", {"id": 2})
+    entities.invalidate(Contact, [1, 3])
+    assert entities.get(Contact, 1) is None
+    assert entities.get(Contact, 2) == {"id": 2}
+    assert asyncio.run(entities.astats())["invalidations"] == 2
+    assert (entities.hits, entities.misses) == (1, 1)
+
+
+def test_disabled_cache_is_a_no_op():
+    entities = EntityCache(None)
+    entities.invalidate(Contact, [1])
+    assert entities.get(Contact, 1) is None
+    assert asyncio.run(entities.astats())["backend"] is None
+    assert entities.misses == 0
+
+
+def test_backend_failures_are_treated_as_misses():
+    class Broken:
+        def get(self, key):
+            raise ConnectionError("down")
+
+        set = delete = get
+
+    entities = EntityCache(Broken())
+    assert entities.get(Contact, 1) is None
+    entities.invalidate(Contact, [1])
+    assert entities.misses == 1
+
+
+@pytest.fixture
+def redis_backend():
+    backend = RedisBackend("redis://localhost:6379/0", ttl=30)
+    server = fakeredis.FakeServer()
+    backend.client = fakeredis.FakeRedis(server=server)
+    backend.async_client = fakeredis.aioredis.FakeRedis(server=server)
+    return backend
+
+
+def test_redis_entries_are_shared_and_expire(redis_backend):
+    entities = EntityCache(redis_backend)
+    entities.set(Contact(id=1, first_name="Ada", last_name="Lovelace", email="ada@example.com"))
+    assert entities.get(Contact, 1)["first_name"] == "Ada"
+    assert 29000 < redis_backend.client.pttl("crm:contacts:1") <= 30000
+
+    async def read_invalidate_and_report():
+        row = await entities.aget(Contact, 1)
+        await entities.ainvalidate(Contact, [1])
+        return row, await entities.aget(Contact, 1), await entities.astats()
+
+    row, after_invalidation, stats = asyncio.run(read_invalidate_and_report())
+    assert row["email"] == "ada@example.com"
+    assert after_invalidation is None
+    assert entities.get(Contact, 1) is None
+    assert stats["backend"] == "RedisBackend"
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (2, 1, 1)
+    # fakeredis has no INFO command: evictions the server cannot report are None
+    assert stats["evictions"] is None
+    assert stats["size"] is None
+
+
+def test_redis_rows_written_async_are_read_sync(redis_backend):
+    entities = EntityCache(redis_backend)
+    asyncio.run(entities.aset(Contact(id=2, first_name="Grace", last_name="Hopper", email="grace@example.com")))
+    assert entities.get(Contact, 2)["last_name"] == "Hopper"
+    entities.invalidate(Contact, [2])
+    assert redis_backend.client.exists("crm:contacts:2") == 0
+
+
+def test_memory_cache_is_off_by_default_with_several_workers(monkeypatch):
+    monkeypatch.delenv("ENTITY_CACHE_BACKEND", raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert not EntityCache.from_env().enabled
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    assert isinstance(EntityCache.from_env().backend, MemoryBackend)
+    monkeypatch.setenv("ENTITY_CACHE_BACKEND", "memory")
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert isinstance(EntityCache.from_env().backend, MemoryBackend)
+
+
+def test_rows_round_trip_to_instances():
+    created = datetime(2026, 10, 17, 9, 30)
+    deal = Deal(
+        id=5, title="Deal", value=10.0, status=DealStatus.WON, pipeline_id=1, contact_id=2,
+        created_at=created, updated_at=created,
+    )
+    row = EntityCache.to_row(deal)
+    assert row["status"] == "won"
+    assert row["created_at"] == created.isoformat()
+
+    restored = EntityCache.to_instance(Deal, row)
+    assert restored.status is DealStatus.WON
+    assert restored.created_at == created
+    assert (restored.id, restored.title, restored.value) == (5, "Deal", 10.0)
+
+
+def test_reads_are_served_from_the_cache_until_a_write(client, make_contact):
+    contact = make_contact(company="Acme")
+    url = f"/api/v1/contacts/{contact['id']}"
+    hits = entity_cache.hits
+
+    assert client.get(url).json()["company"] == "Acme"
+    assert client.get(url).json()["company"] == "Acme"
+    assert entity_cache.hits == hits + 1
+
+    assert client.patch(url, json={"company": "Initech"}).status_code == 200
+    assert client.get(url).json()["company"] == "Initech"
+
+    assert client.delete(url).status_code == 204
+    assert client.get(url).status_code == 404
+
+
+def test_deleting_a_pipeline_invalidates_its_deals(client, make_contact):
+    contact = make_contact()
+    pipeline = client.post("/api/v1/pipelines", json={"name": "Sales"}).json()
+    deal = client.post(
+        "/api/v1/deals", json={"title": "Deal", "pipeline_id": pipeline["id"], "contact_id": contact["id"]}
+    ).json()
+    assert client.get(f"/api/v1/deals/{deal['id']}").status_code == 200
+
+    assert client.delete(f"/api/v1/pipelines/{pipeline['id']}").status_code == 204
+    assert client.get(f"/api/v1/deals/{deal['id']}").status_code == 404
@@ -0,0 +1,75 @@
+import pytest
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture
+def contacts(make_contact):
+    return [make_contact() for _ in range(3)]
+
+
+def test_list_is_tagged_and_revalidated(client, contacts):
+    response = client.get("/api/v1/contacts")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    not_modified = client.get("/api/v1/contacts", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("header", ['W/{etag}', '"other", {etag}', "*"])
+def test_if_none_match_forms(client, contacts, header):
+    etag = client.get("/api/v1/contacts").headers["ETag"]
+    assert client.get("/api/v1/contacts", headers={"If-None-Match": header.format(etag=etag)}).status_code == 304
+
+
+def test_stale_etag_gets_the_new_representation(client, contacts):
+    etag = client.get("/api/v1/contacts").headers["ETag"]
+    assert client.patch(f"/api/v1/contacts/{contacts[1]['id']}", json={"company": "Initech"}).status_code == 200
+
+    response = client.get("/api/v1/contacts", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[1]["company"] == "Initech"
+
+
+def test_representation_options_change_the_etag(client, contacts):
+    full = client.get("/api/v1/contacts").headers["ETag"]
+    sparse = client.get("/api/v1/contacts", params={"fields": "id,email"}).headers["ETag"]
+    paged = client.get("/api/v1/contacts", params={"limit": 2}).headers["ETag"]
+    assert len({full, sparse, paged}) == 3
+    assert client.get("/api/v1/contacts", params={"fields": "id,email"}, headers={"If-None-Match": full}).status_code == 200
+
+
+def test_not_modified_page_keeps_the_next_cursor(client, contacts):
+    response = client.get("/api/v1/contacts", params={"limit": 2})
+    not_modified = client.get(
+        "/api/v1/contacts", params={"limit": 2}, headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers[NEXT_CURSOR_HEADER] == response.headers[NEXT_CURSOR_HEADER]
+
+
+def test_detail_is_tagged_and_revalidated(client, contacts):
+    url = f"/api/v1/contacts/{contacts[0]['id']}"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.patch(url, json={"notes": "Called"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_included_relations_are_part_of_the_etag(client, contacts):
+    pipeline = client.post("/api/v1/pipelines", json={"name": "Sales"}).json()
+    client.post("/api/v1/deals", json={"title": "Deal", "pipeline_id": pipeline["id"], "contact_id": contacts[0]["id"]})
+    params = {"include": "contact"}
+    etag = client.get("/api/v1/deals", params=params).headers["ETag"]
+    assert client.get("/api/v1/deals", params=params, headers={"If-None-Match": etag}).status_code == 304
+
+    # The deals did not change, but the embedded contact did
+    client.patch(f"/api/v1/contacts/{contacts[0]['id']}", json={"company": "Initech"})
+    response = client.get("/api/v1/deals", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["contact"]["company"] == "Initech"
@@ -0,0 +1,96 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.fields import DEAL_RELATIONS, TASK_RELATIONS, FieldSet
+from app.schemas import ContactResponse, DealWithRelationsResponse, TaskWithRelationsResponse
+
+
+def test_no_selection_means_the_full_model():
+    assert FieldSet.parse(None, ContactResponse) is None
+    assert FieldSet.parse("", ContactResponse) is None
+
+
+def test_fields_always_include_the_id():
+    fields = FieldSet.parse("email, first_name,,email", ContactResponse)
+    assert fields.names == ("id", "email", "first_name")
+    assert fields.columns == ("id", "email", "first_name")
+    assert list(fields.model.model_fields) == ["id", "email", "first_name"]
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as error:
+        FieldSet.parse("email,password,ssn", ContactResponse)
+    assert error.value.status_code == 400
+    assert "password, ssn" in error.value.detail
+
+
+def test_partial_models_are_built_once_per_selection():
+    assert FieldSet.parse("email", ContactResponse).model is FieldSet.parse("email", ContactResponse).model
+
+
+def test_render_serializes_only_the_selected_fields():
+    fields = FieldSet.parse("email", ContactResponse)
+    contact = SimpleNamespace(id=1, email="ada@example.com", first_name="Ada")
+    assert json.loads(fields.render([contact]).body) == [{"id": 1, "email": "ada@example.com"}]
+    assert json.loads(fields.render_one(contact).body) == {"id": 1, "email": "ada@example.com"}
+
+
+def test_list_and_detail_routes_return_sparse_fieldsets(client, make_contact):
+    contact = make_contact(company="Acme")
+    response = client.get("/api/v1/contacts", params={"fields": "email,company"})
+    assert response.json() == [{"id": contact["id"], "email": contact["email"], "company": "Acme"}]
+
+    response = client.get(f"/api/v1/contacts/{contact['id']}", params={"fields": "first_name"})
+    assert response.json() == {"id": contact["id"], "first_name": contact["first_name"]}
+
+    assert client.get("/api/v1/contacts", params={"fields": "nope"}).status_code == 400
+
+
+def test_include_alone_keeps_every_column():
+    fields = FieldSet.parse(None, DealWithRelationsResponse, "pipeline,contact,pipeline", DEAL_RELATIONS)
+    assert fields.include == ("pipeline", "contact")
+    assert fields.columns is None
+    assert "contact" not in fields.names and "title" in fields.names
+    assert {"contact", "pipeline"} <= set(fields.model.model_fields)
+
+
+def test_include_with_fields():
+    fields = FieldSet.parse("title", DealWithRelationsResponse, "contact", DEAL_RELATIONS)
+    assert fields.columns == ("id", "title")
+    assert list(fields.model.model_fields) == ["id", "title", "contact"]
+
+
+@pytest.mark.parametrize("model, value, include, relations", [
+    (TaskWithRelationsResponse, None, "pipeline", TASK_RELATIONS),
+    (DealWithRelationsResponse, None, "owner", DEAL_RELATIONS),
+    (ContactResponse, None, "deals", ()),
+    # Relations are embedded with include=, not selected as fields
+    (DealWithRelationsResponse, "contact", None, DEAL_RELATIONS),
+])
+def test_unknown_relations_are_rejected(model, value, include, relations):
+    with pytest.raises(HTTPException) as error:
+        FieldSet.parse(value, model, include, relations)
+    assert error.value.status_code == 400
+
+
+def test_deal_list_embeds_included_relations(client, make_contact):
+    contact = make_contact()
+    pipeline = client.post("/api/v1/pipelines", json={"name": "Sales"}).json()
+    deal = client.post(
+        "/api/v1/deals", json={"title": "Deal", "pipeline_id": pipeline["id"], "contact_id": contact["id"]}
+    ).json()
+
+    response = client.get("/api/v1/deals", params={"include": "contact,pipeline"})
+    assert response.status_code == 200, response.text
+    [embedded] = response.json()
+    assert embedded["title"] == "Deal"
+    assert embedded["contact"]["email"] == contact["email"]
+    assert embedded["pipeline"]["name"] == "Sales"
+
+    response = client.get("/api/v1/deals", params={"fields": "title", "include": "pipeline"})
+    assert response.json() == [{"id": deal["id"], "title": "Deal", "pipeline": pipeline}]
+
+    assert client.get("/api/v1/tasks", params={"include": "pipeline"}).status_code == 400
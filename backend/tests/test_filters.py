@@ -0,0 +1,116 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, Integer, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from app.api.filters import TASK_SORT_FIELDS, Sort
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.models import Task
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    score = Column(Integer, nullable=True)
+
+
+SCORES = [3, None, 1, 3, None, 2, 1, None]
+
+
+@pytest.fixture(scope="module")
+def items():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(Item(id=index + 1, score=score) for index, score in enumerate(SCORES))
+        session.commit()
+        yield session
+
+
+def expected(field: str, descending: bool):
+    """Ascending with NULLs last and ties broken by id, or its exact reverse"""
+    rows = [(index + 1, score) for index, score in enumerate(SCORES)]
+    if field == "id":
+        ordered = sorted(rows)
+    else:
+        ordered = sorted(rows, key=lambda row: (row[1] is None, row[1] or 0, row[0]))
+    return [row_id for row_id, _ in (ordered[::-1] if descending else ordered)]
+
+
+def keyset_pages(session, sort: Sort, size: int):
+    ids, last = [], None
+    while True:
+        query = select(Item).order_by(*sort.order_by(Item)).limit(size)
+        if last is not None:
+            query = query.where(sort.after(Item, last.id, last.score))
+        page = list(session.scalars(query))
+        ids += [item.id for item in page]
+        if len(page) < size:
+            return ids
+        last = page[-1]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 8])
+@pytest.mark.parametrize("field", ["id", "score"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_visit_every_row_once_in_order(items, field, descending, size):
+    sort = Sort(field, descending)
+    assert list(items.scalars(select(Item.id).order_by(*sort.order_by(Item)))) == expected(field, descending)
+    assert keyset_pages(items, sort, size) == expected(field, descending)
+
+
+@pytest.mark.parametrize("value, descending, field, expected_sort", [
+    ("due_date", False, "due_date", "due_date"),
+    ("-created_at", True, "created_at", "-created_at"),
+])
+def test_parse(value, descending, field, expected_sort):
+    sort = Sort.parse(value, TASK_SORT_FIELDS)
+    assert (sort.field, sort.descending, str(sort)) == (field, descending, expected_sort)
+
+
+@pytest.mark.parametrize("value", ["value", "-title", "due_date; drop table tasks"])
+def test_parse_rejects_fields_outside_the_whitelist(value):
+    with pytest.raises(HTTPException) as error:
+        Sort.parse(value, TASK_SORT_FIELDS)
+    assert error.value.status_code == 400
+
+
+def test_load_value_restores_datetimes():
+    due = datetime(2026, 10, 17, 9, 30)
+    assert Sort("due_date").load_value(Task, due.isoformat()) == due
+    assert Sort("due_date").load_value(Task, None) is None
+    assert Sort("id").load_value(Task, 5) == 5
+
+
+@pytest.mark.parametrize("sort", ["due_date", "-due_date"])
+def test_task_list_pages_through_null_due_dates(client, make_contact, sort):
+    contact = make_contact()
+    due_dates = [None, "2026-11-02T09:00:00", "2026-11-01T09:00:00", None, "2026-11-01T09:00:00"]
+    for index, due_date in enumerate(due_dates):
+        body = {"title": f"Task {index}", "contact_id": contact["id"], "due_date": due_date}
+        assert client.post("/api/v1/tasks", json=body).status_code == 201
+
+    tasks, params = [], {"sort": sort, "limit": 2}
+    while True:
+        response = client.get("/api/v1/tasks", params=params)
+        assert response.status_code == 200, response.text
+        tasks += response.json()
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["after"] = response.headers[NEXT_CURSOR_HEADER]
+
+    ordered = sorted(tasks, key=lambda task: (task["due_date"] is None, task["due_date"] or "", task["id"]))
+    assert tasks == (ordered[::-1] if sort.startswith("-") else ordered)
+    assert len(tasks) == len(due_dates)
+
+
+def test_task_list_rejects_a_cursor_from_another_sort(client, make_contact):
+    contact = make_contact()
+    for index in range(2):
+        client.post("/api/v1/tasks", json={"title": f"Task {index}", "contact_id": contact["id"]})
+    cursor = client.get("/api/v1/tasks", params={"sort": "due_date", "limit": 1}).headers[NEXT_CURSOR_HEADER]
+    assert client.get("/api/v1/tasks", params={"sort": "-due_date", "after": cursor}).status_code == 400
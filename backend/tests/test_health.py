@@ -0,0 +1,29 @@
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import main
+from app.services.ai_agent import ai_agent
+
+
+def test_liveness_needs_nothing_but_the_process(client, monkeypatch):
+    monkeypatch.setattr(main, "async_engine", create_async_engine("sqlite+aiosqlite:////nonexistent/crm.db"))
+    assert client.get("/health/live").json() == {"status": "alive"}
+
+
+def test_ready_while_the_model_loads(client, monkeypatch):
+    monkeypatch.setattr(ai_agent, "state", "loading")
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["model"]["state"] == "loading"
+
+    chat = client.post("/api/v1/chat", json={"message": "What should I follow up on?"})
+    assert chat.status_code == 503
+    assert "Retry-After" in chat.headers
+
+
+def test_not_ready_without_the_database(client, monkeypatch):
+    monkeypatch.setattr(main, "async_engine", create_async_engine("sqlite+aiosqlite:////nonexistent/crm.db"))
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+    assert response.json()["database"] == "unavailable"
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from app.services.intent_router import RoutedCommand, route
+
+
+@pytest.mark.parametrize("message, tool", [
+    ("show contacts", "get_contacts"),
+    ("Please list all my deals.", "get_deals"),
+    ("can you show me the pipelines?", "get_pipelines"),
+    ("get all of my tasks", "get_tasks"),
+    ("What contacts do we have?", "get_contacts"),
+])
+def test_list_commands(message, tool):
+    assert route(message) == RoutedCommand(tool, "all")
+
+
+@pytest.mark.parametrize("message", ["show contact 12", "get contact #12", "Find contact with id 12.", "view contact no. 12"])
+def test_show_contact(message):
+    assert route(message) == RoutedCommand("get_contact", "12")
+
+
+def test_create_pipeline_strips_quotes():
+    command = route('Create a new pipeline called "Enterprise Sales"')
+    assert command.tool == "create_pipeline"
+    assert json.loads(command.tool_input) == {"name": "Enterprise Sales"}
+
+
+@pytest.mark.parametrize("message", [
+    "create a pipeline called Sales and add a deal to it",
+    "create a pipeline named Sales, then list deals",
+    "create a pipeline called " + "x" * 101,
+    "create a pipeline called ''",
+])
+def test_compound_or_odd_pipeline_names_go_to_the_agent(message):
+    assert route(message) is None
+
+
+@pytest.mark.parametrize("message", [
+    "Who is in my CRM at the moment?",
+    "show contacts from Acme",
+    "list contacts and deals",
+    "delete contact 12",
+    "",
+])
+def test_everything_else_goes_to_the_agent(message):
+    assert route(message) is None
@@ -0,0 +1,77 @@
+from app.services import memory
+from app.services.memory import SessionMemoryStore
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+def test_unknown_or_missing_session_has_no_history():
+    store = SessionMemoryStore()
+    assert store.history(None) == ""
+    assert store.history("missing") == ""
+
+
+def test_history_renders_turns_in_order():
+    store = SessionMemoryStore(count_tokens=words)
+    store.save("s", "hello", "hi there")
+    store.save("s", "how are you", "fine")
+    assert store.history("s") == "Human: hello\nAI: hi there\nHuman: how are you\nAI: fine"
+
+
+def test_session_window_drops_oldest_turns_over_budget():
+    store = SessionMemoryStore(max_session_tokens=6, count_tokens=words)
+    store.save("s", "one two", "three")  # 3 tokens
+    store.save("s", "four five", "six")  # 6
+    store.save("s", "seven", "eight")  # 8: the first turn no longer fits
+    assert store.history("s") == "Human: four five\nAI: six\nHuman: seven\nAI: eight"
+    assert store.total_tokens == 5
+
+
+def test_latest_turn_is_kept_even_over_budget():
+    store = SessionMemoryStore(max_session_tokens=2, count_tokens=words)
+    store.save("s", "a", "b")
+    store.save("s", "a much longer question", "and answer")
+    assert store.history("s") == "Human: a much longer question\nAI: and answer"
+    assert store.total_tokens == 6
+
+
+def test_least_recently_used_session_is_evicted():
+    store = SessionMemoryStore(max_sessions=2, count_tokens=words)
+    store.save("a", "q", "r")
+    store.save("b", "q", "r")
+    store.save("a", "q2", "r2")
+    store.save("c", "q", "r")
+    assert len(store) == 2
+    assert store.history("b") == ""
+    assert store.history("a") and store.history("c")
+
+
+def test_total_token_cap_evicts_whole_sessions():
+    store = SessionMemoryStore(max_total_tokens=5, count_tokens=words)
+    store.save("a", "one two", "three")
+    store.save("b", "four five", "six")
+    assert store.history("a") == ""
+    assert store.total_tokens == 3
+
+
+def test_idle_sessions_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memory.time, "monotonic", lambda: now[0])
+    store = SessionMemoryStore(ttl=60, count_tokens=words)
+    store.save("s", "hello", "hi")
+    now[0] += 59
+    assert store.history("s")
+    now[0] += 2
+    assert store.history("s") == ""
+    assert len(store) == 0
+    assert store.total_tokens == 0
+
+
+def test_clear_releases_the_session_tokens():
+    store = SessionMemoryStore(count_tokens=words)
+    store.save("s", "hello", "hi")
+    store.clear("s")
+    store.clear("s")
+    assert store.history("s") == ""
+    assert store.total_tokens == 0
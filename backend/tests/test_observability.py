@@ -0,0 +1,84 @@
+import json
+import logging
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app import profiling
+from app.database import async_engine, engine
+from app.logging_config import JsonFormatter
+
+
+@pytest.fixture
+def sql_profile(monkeypatch):
+    """Profile requests as with SQL_PROFILE=true"""
+    monkeypatch.setattr(profiling, "SQL_PROFILE", True)
+    engines = (engine, async_engine.sync_engine)
+    profiling.instrument(*engines)
+    yield
+    for target in engines:
+        event.remove(target, "before_cursor_execute", profiling._before_cursor_execute)
+        event.remove(target, "after_cursor_execute", profiling._after_cursor_execute)
+
+
+def sample(body, name, labels):
+    match = re.search(r"^%s\{%s\} (\S+)$" % (re.escape(name), re.escape(labels)), body, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_metrics_are_labelled_by_route_template(client, make_contact):
+    contact = make_contact()
+    route = 'method="GET",route="/api/v1/contacts/{contact_id}"'
+    before = client.get("/metrics").text
+    assert client.get(f"/api/v1/contacts/{contact['id']}").status_code == 200
+    assert client.get("/api/v1/contacts/999999").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    after = response.text
+    for name, labels, increase in [
+        ("http_requests_total", f'{route},status="200"', 1),
+        ("http_requests_total", f'{route},status="404"', 1),
+        ("http_request_duration_seconds_count", route, 2),
+    ]:
+        assert sample(after, name, labels) - sample(before, name, labels) == increase, (name, labels)
+    assert sample(after, "http_request_duration_seconds_bucket", f'le="+Inf",{route}') >= 2
+    assert f'route="/api/v1/contacts/{contact["id"]}"' not in after
+    assert 'route="/api/v1/contacts/999999"' not in after
+
+
+def test_server_timing_reports_db_time_and_query_count(client, make_contact, sql_profile):
+    contact = make_contact()
+    response = client.get("/api/v1/contacts", params={"limit": 5})
+    match = re.fullmatch(r'db;dur=(\d+\.\d{2});desc="(\d+) queries"', response.headers["Server-Timing"])
+    assert match, response.headers["Server-Timing"]
+    assert float(match.group(1)) > 0
+    assert int(match.group(2)) >= 1
+
+    # Served from the entity cache after the first read
+    url = f"/api/v1/contacts/{contact['id']}"
+    client.get(url)
+    assert client.get(url).headers["Server-Timing"].endswith('desc="0 queries"')
+
+
+def test_requests_are_logged_as_one_json_line(client, caplog):
+    caplog.set_level(logging.INFO, logger="app.main")
+    response = client.get("/api/v1/contacts/999999", headers={"X-Request-ID": "req-42"})
+    assert response.headers["X-Request-ID"] == "req-42"
+
+    [record] = [r for r in caplog.records if r.getMessage() == "Request completed"]
+    line = JsonFormatter().format(record)
+    assert "\n" not in line
+    entry = json.loads(line)
+    assert entry["request_id"] == "req-42"
+    assert (entry["method"], entry["path"], entry["status"]) == ("GET", "/api/v1/contacts/999999", 404)
+    assert entry["duration_ms"] >= 0
+    assert entry["level"] == "INFO"
+
+
+def test_request_ids_are_generated_when_missing(client):
+    first = client.get("/health/live").headers["X-Request-ID"]
+    second = client.get("/health/live").headers["X-Request-ID"]
+    assert re.fullmatch(r"[0-9a-f]{32}", first)
+    assert first != second
@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, decode_sort_cursor, encode_cursor, set_next_cursor
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_id_cursor_round_trips():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor(2**40, "-created_at", datetime(2026, 10, 17, 9, 30))
+    assert not set(cursor) & set("=+/")
+
+
+def test_missing_cursor_decodes_to_none():
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+    assert decode_sort_cursor(None, "value") == (None, None)
+
+
+def test_sort_cursor_carries_the_sort_value():
+    created = datetime(2026, 10, 17, 9, 30)
+    assert decode_sort_cursor(encode_cursor(7, "-created_at", created), "-created_at") == (7, created.isoformat())
+    assert decode_sort_cursor(encode_cursor(8, "value", None), "value") == (8, None)
+
+
+def test_id_cursor_continues_the_default_sort():
+    assert decode_sort_cursor(encode_cursor(5), "id") == (5, None)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", _raw_cursor({"id": "5"}), _raw_cursor({"sort": "value"}), _raw_cursor([5])])
+def test_malformed_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_cursor_from_another_sort_order_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        decode_sort_cursor(encode_cursor(1, "value", 10.0), "-value")
+    assert error.value.status_code == 400
+
+
+def test_next_cursor_only_on_full_pages():
+    items = [SimpleNamespace(id=1, value=5.0), SimpleNamespace(id=3, value=None)]
+
+    response = Response()
+    set_next_cursor(response, items, limit=2)
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == 3
+
+    response = Response()
+    set_next_cursor(response, items, limit=2, sort="-value")
+    assert decode_sort_cursor(response.headers[NEXT_CURSOR_HEADER], "-value") == (3, None)
+
+    response = Response()
+    set_next_cursor(response, items, limit=3)
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_pages_follow_the_next_cursor(client, make_contact):
+    ids = [make_contact()["id"] for _ in range(5)]
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get("/api/v1/contacts", params=params)
+        assert response.status_code == 200
+        seen += [contact["id"] for contact in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params["after"] = cursor
+    assert seen == ids
+
+
+def test_invalid_cursor_query_parameter_is_rejected(client):
+    assert client.get("/api/v1/contacts", params={"after": "garbage"}).status_code == 400
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import select
+
+from app.api import crud
+from app.models import Pipeline
+from app.models.pipeline import DealStatus
+from app.models.pipeline_summary import PipelineSummary
+
+
+def summary_rows(db):
+    db.expire_all()
+    return {
+        (row.pipeline_id, row.status): (row.deal_count, row.total_value)
+        for row in db.scalars(select(PipelineSummary))
+    }
+
+
+def test_deal_deltas_net_out_per_pipeline_and_status():
+    deltas = crud.deal_deltas(
+        added=[(1, DealStatus.LEAD, 100.0), (1, DealStatus.LEAD, None), (2, DealStatus.WON, 50.0)],
+        removed=[(1, DealStatus.LEAD, 100.0), (1, DealStatus.PROPOSAL, 30.0)],
+    )
+    assert deltas == {
+        (1, DealStatus.LEAD): (1, 0.0),
+        (2, DealStatus.WON): (1, 50.0),
+        (1, DealStatus.PROPOSAL): (-1, -30.0),
+    }
+
+
+def test_moving_a_deal_within_its_group_is_a_no_op():
+    key = (1, DealStatus.LEAD, 10.0)
+    assert crud.deal_deltas(added=[key], removed=[key]) == {(1, DealStatus.LEAD): (0, 0.0)}
+
+
+@pytest.fixture(params=["upsert", "update_then_insert"])
+def rollup_db(request, db, monkeypatch):
+    if request.param == "update_then_insert":
+        # As on a dialect without ON CONFLICT
+        monkeypatch.setattr(crud, "UPSERT_INSERTS", {})
+    return db
+
+
+def test_apply_summary_deltas_creates_and_increments_rows(rollup_db):
+    db = rollup_db
+    pipeline = Pipeline(name="Sales")
+    db.add(pipeline)
+    db.commit()
+
+    crud.apply_summary_deltas(db, crud.deal_deltas(added=[(pipeline.id, DealStatus.LEAD, 100.0)]))
+    crud.apply_summary_deltas(db, crud.deal_deltas(
+        added=[(pipeline.id, DealStatus.LEAD, 20.0), (pipeline.id, DealStatus.WON, 5.0)]
+    ))
+    crud.apply_summary_deltas(db, crud.deal_deltas(removed=[(pipeline.id, DealStatus.LEAD, 100.0)]))
+    db.commit()
+
+    assert summary_rows(db) == {(pipeline.id, DealStatus.LEAD): (1, 20.0), (pipeline.id, DealStatus.WON): (1, 5.0)}
+
+
+def test_apply_summary_deltas_skips_empty_changes(rollup_db):
+    crud.apply_summary_deltas(rollup_db, {(1, DealStatus.LEAD): (0, 0.0)})
+    crud.apply_summary_deltas(rollup_db, {})
+    assert summary_rows(rollup_db) == {}
+
+
+def test_summary_follows_deal_writes(client, db, make_contact):
+    contact = make_contact()
+    pipeline = client.post("/api/v1/pipelines", json={"name": "Sales"}).json()
+
+    def create_deal(value, status="lead"):
+        body = {"title": "Deal", "value": value, "status": status, "pipeline_id": pipeline["id"], "contact_id": contact["id"]}
+        response = client.post("/api/v1/deals", json=body)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    first = create_deal(100.0)
+    second = create_deal(50.0)
+    create_deal(25.0, "won")
+    assert client.patch(f"/api/v1/deals/{first['id']}", json={"status": "won", "value": 120.0}).status_code == 200
+    assert client.delete(f"/api/v1/deals/{second['id']}").status_code == 204
+
+    summary = client.get("/api/v1/pipelines/summary").json()
+    assert (summary["deal_count"], summary["total_value"]) == (2, 145.0)
+    statuses = {entry["status"]: (entry["deal_count"], entry["total_value"]) for entry in summary["statuses"]}
+    assert statuses["won"] == (2, 145.0)
+    assert statuses["lead"] == (0, 0.0)
+
+    # The incrementally maintained rollup matches a full recomputation
+    maintained = summary_rows(db)
+    crud.rebuild_pipeline_summaries(db)
+    db.commit()
+    rebuilt = summary_rows(db)
+    assert {key: value for key, value in maintained.items() if value != (0, 0.0)} == rebuilt
@@ -0,0 +1,63 @@
+import pytest
+from langchain.callbacks.base import BaseCallbackHandler
+
+from app.services import scripted_llm
+from app.services.scripted_llm import ScriptedLLM, split_tokens
+
+
+class TokenRecorder(BaseCallbackHandler):
+    def __init__(self):
+        self.tokens = []
+
+    def on_llm_new_token(self, token, **kwargs):
+        self.tokens.append(token)
+
+
+@pytest.mark.parametrize("text", [
+    "Thought: I should list the contacts\nAction: get_contacts\nAction Input: all",
+    '{"thought": "t", "action_input": {"value": 5000.5}}',
+    "  leading and trailing  ",
+    "",
+])
+def test_split_tokens_joins_back_to_the_text(text):
+    assert "".join(split_tokens(text)) == text
+
+
+def test_split_tokens_keeps_leading_whitespace_with_words():
+    assert split_tokens("Final Answer: done.") == ["Final", " Answer", ":", " done", "."]
+
+
+def test_completions_cycle_through_the_script():
+    llm = ScriptedLLM(script=["first", "second"])
+    assert [llm.invoke("prompt") for _ in range(3)] == ["first", "second", "first"]
+    assert llm.calls == 3
+
+
+def test_completion_is_cut_at_the_earliest_stop_sequence():
+    llm = ScriptedLLM(script=["Action: get_contacts\nAction Input: all\nObservation: made up\nThought: more"])
+    assert llm.invoke("prompt", stop=["\nThought:", "\nObservation"]) == "Action: get_contacts\nAction Input: all"
+
+
+def test_stop_sequences_that_do_not_occur_are_ignored():
+    llm = ScriptedLLM(script=["Final Answer: done"])
+    assert llm.invoke("prompt", stop=["\nObservation"]) == "Final Answer: done"
+
+
+def test_tokens_are_streamed_through_the_callbacks():
+    recorder = TokenRecorder()
+    llm = ScriptedLLM(script=["Final Answer: done\nObservation: x"])
+    text = llm.invoke("prompt", stop=["\nObservation"], config={"callbacks": [recorder]})
+    assert recorder.tokens == split_tokens(text)
+
+
+def test_token_rates_simulate_generation_and_prompt_time(monkeypatch):
+    slept = []
+    monkeypatch.setattr(scripted_llm.time, "sleep", slept.append)
+    llm = ScriptedLLM(script=["one two three"], tokens_per_second=10, prompt_tokens_per_second=100)
+    llm.invoke("a b c d e")
+    assert slept[0] == pytest.approx(5 / 100)
+    assert slept[1:] == [pytest.approx(0.1)] * 3
+
+
+def test_get_num_tokens_matches_the_split():
+    assert ScriptedLLM(script=["x"]).get_num_tokens("Hello, world") == 3
@@ -0,0 +1,27 @@
+def search(client, q):
+    response = client.get("/api/v1/contacts/search", params={"q": q})
+    assert response.status_code == 200, response.text
+    return [contact["email"] for contact in response.json()]
+
+
+def test_search_works_on_a_database_created_by_init_db(client, make_contact):
+    make_contact(first_name="Ada", last_name="Lovelace", email="ada@example.com", company="Analytical Engines")
+    make_contact(first_name="Bob", last_name="Smith", email="bob@example.com", notes="Met Ada at the conference")
+    make_contact(first_name="Carol", last_name="Jones", email="carol@example.com")
+
+    assert search(client, "ada")[0] == "ada@example.com"
+    assert set(search(client, "ada")) == {"ada@example.com", "bob@example.com"}
+    assert search(client, "analytical") == ["ada@example.com"]
+    assert search(client, "nobody") == []
+
+
+def test_search_index_follows_updates_and_deletes(client, make_contact):
+    contact = make_contact(company="Acme")
+    assert search(client, "acme") == [contact["email"]]
+
+    client.patch(f"/api/v1/contacts/{contact['id']}", json={"company": "Initech"})
+    assert search(client, "acme") == []
+    assert search(client, "initech") == [contact["email"]]
+
+    client.delete(f"/api/v1/contacts/{contact['id']}")
+    assert search(client, "initech") == []
@@ -0,0 +1,108 @@
+import json
+import re
+
+import pytest
+from langchain.schema import AgentAction, AgentFinish, OutputParserException
+
+from app.services.tool_calling import TOOL_INPUTS, JSONToolCallParser, build_tool_call_grammar
+
+_GBNF_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\[(?:\\.|[^\]\\])*\]|[a-z][a-z0-9-]*|[()|?*+]|\s+')
+
+
+def grammar_regex(grammar: str) -> re.Pattern:
+    """Translate the (non-recursive) GBNF grammar into an equivalent regular expression"""
+    rules = dict(line.split(" ::= ", 1) for line in grammar.splitlines())
+
+    def expand(body: str) -> str:
+        parts = []
+        for token in _GBNF_TOKEN.findall(body):
+            if token.isspace():
+                continue
+            if token.startswith('"'):
+                parts.append(re.escape(json.loads(token)))
+            elif token.startswith("[") or token in "|?*+)":
+                parts.append(token)
+            elif token == "(":
+                parts.append("(?:")
+            else:
+                parts.append(f"(?:{expand(rules[token])})")
+        return "".join(parts)
+
+    return re.compile(expand(rules["root"]))
+
+
+@pytest.fixture(scope="module")
+def accepts():
+    pattern = grammar_regex(build_tool_call_grammar(["get_contact", "create_pipeline", "create_deal", "get_deals"]))
+    return lambda step: pattern.fullmatch(json.dumps(step) if isinstance(step, dict) else step) is not None
+
+
+def test_root_rule_comes_first():
+    assert build_tool_call_grammar(["get_contacts"]).startswith("root ::= ")
+
+
+def test_every_referenced_rule_is_defined():
+    grammar = build_tool_call_grammar(list(TOOL_INPUTS))
+    rules = dict(line.split(" ::= ", 1) for line in grammar.splitlines())
+    for body in rules.values():
+        for token in _GBNF_TOKEN.findall(body):
+            if re.fullmatch(r"[a-z][a-z0-9-]*", token):
+                assert token in rules
+
+
+def test_llama_cpp_parses_the_grammar():
+    llama_cpp = pytest.importorskip("llama_cpp")
+    llama_cpp.LlamaGrammar.from_string(build_tool_call_grammar(list(TOOL_INPUTS)), verbose=False)
+
+
+def test_accepts_tool_calls_and_final_answers(accepts):
+    assert accepts({"thought": "look it up", "action": "get_contact", "action_input": 12})
+    assert accepts({"thought": "list them", "action": "get_deals", "action_input": "all"})
+    assert accepts({"thought": "create it", "action": "create_pipeline", "action_input": {"name": "Sales"}})
+    assert accepts({
+        "thought": "create it", "action": "create_pipeline",
+        "action_input": {"name": "Sales", "description": None},
+    })
+    assert accepts({
+        "thought": "open a deal", "action": "create_deal",
+        "action_input": {"title": "Big one", "pipeline_id": 1, "contact_id": 2, "value": 5000.5, "status": "won"},
+    })
+    assert accepts({"thought": "I now know the final answer", "final_answer": "Done \"quoted\"\n"})
+    assert accepts('{"thought":"no spaces","final_answer":"ok"}')
+
+
+def test_rejects_steps_outside_the_schema(accepts):
+    # Tools left out of the grammar
+    assert not accepts({"thought": "t", "action": "get_tasks", "action_input": "all"})
+    # Wrong input types
+    assert not accepts({"thought": "t", "action": "get_contact", "action_input": "12"})
+    assert not accepts({"thought": "t", "action": "get_deals", "action_input": "some"})
+    # Missing required field, unknown enum value
+    assert not accepts({"thought": "t", "action": "create_pipeline", "action_input": {"description": "x"}})
+    assert not accepts({
+        "thought": "t", "action": "create_deal",
+        "action_input": {"title": "x", "pipeline_id": 1, "contact_id": 2, "status": "maybe"},
+    })
+    # Missing thought, trailing text
+    assert not accepts({"final_answer": "ok"})
+    assert not accepts(json.dumps({"thought": "t", "final_answer": "ok"}) + " and more")
+
+
+def test_parser_turns_steps_into_actions():
+    parser = JSONToolCallParser()
+    action = parser.parse(json.dumps({"thought": "t", "action": "create_pipeline", "action_input": {"name": "Sales"}}))
+    assert isinstance(action, AgentAction)
+    assert action.tool == "create_pipeline"
+    assert json.loads(action.tool_input) == {"name": "Sales"}
+    assert parser.parse(json.dumps({"thought": "t", "action": "get_contact", "action_input": "7"})).tool_input == "7"
+
+    finish = parser.parse(json.dumps({"thought": "t", "final_answer": "All done"}))
+    assert isinstance(finish, AgentFinish)
+    assert finish.return_values == {"output": "All done"}
+
+
+@pytest.mark.parametrize("text", ["Thought: free text", '{"thought": "t"}', "[]"])
+def test_parser_asks_the_model_to_retry_on_invalid_steps(text):
+    with pytest.raises(OutputParserException) as error:
+        JSONToolCallParser().parse(text)
+    assert error.value.send_to_llm
@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_concurrent_writes_wait_for_the_lock_instead_of_failing(client, make_contact):
+    contacts = [make_contact() for _ in range(8)]
+    pipeline = client.post("/api/v1/pipelines", json={"name": "Sales"}).json()
+    deals = [
+        client.post(
+            "/api/v1/deals", json={"title": "Deal", "value": 10, "pipeline_id": pipeline["id"], "contact_id": contact["id"]}
+        ).json()
+        for contact in contacts[:4]
+    ]
+
+    def write(index):
+        if index < 24:
+            deal = deals[index % len(deals)]
+            return client.patch(f"/api/v1/deals/{deal['id']}", json={"value": index, "status": "won"}).status_code
+        return client.delete(f"/api/v1/contacts/{contacts[4 + index % 4]['id']}").status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(write, range(28)))
+
+    assert all(status in (200, 204, 404) for status in statuses), statuses
+    assert statuses[:24] == [200] * 24
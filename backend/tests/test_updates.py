@@ -0,0 +1,76 @@
+import pytest
+
+
+@pytest.fixture
+def task(client, make_contact):
+    contact = make_contact()
+    response = client.post("/api/v1/tasks", json={"title": "Call back", "contact_id": contact["id"]})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_patch_changes_only_the_fields_sent(client, make_contact):
+    contact = make_contact(company="Acme", phone="555-0100", position="CTO")
+    url = f"/api/v1/contacts/{contact['id']}"
+
+    updated = client.patch(url, json={"company": "Initech", "phone": None}).json()
+    assert (updated["company"], updated["phone"], updated["position"]) == ("Initech", None, "CTO")
+    assert updated["email"] == contact["email"]
+    assert client.get(url).json() == updated
+
+
+def test_updates_advance_updated_at(client, make_contact):
+    contact = make_contact()
+    first = client.patch(f"/api/v1/contacts/{contact['id']}", json={"notes": "Met at the fair"}).json()
+    second = client.patch(f"/api/v1/contacts/{contact['id']}", json={"notes": "Sent a quote"}).json()
+    assert contact["updated_at"] < first["updated_at"] < second["updated_at"]
+    assert second["created_at"] == contact["created_at"]
+
+
+def test_put_and_patch_agree_on_a_full_body(client, make_contact):
+    first, second = make_contact(), make_contact()
+
+    def body_for(contact):
+        return {"first_name": "Ada", "last_name": "Lovelace", "email": f"ada{contact['id']}@example.com", "company": "Engines"}
+
+    put = client.put(f"/api/v1/contacts/{first['id']}", json=body_for(first)).json()
+    patch = client.patch(f"/api/v1/contacts/{second['id']}", json=body_for(second)).json()
+    ignored = {"id", "email", "created_at", "updated_at"}
+    assert {k: v for k, v in put.items() if k not in ignored} == {k: v for k, v in patch.items() if k not in ignored}
+    assert put["email"] == body_for(first)["email"]
+
+
+def test_completing_a_task_stamps_it_once(client, task):
+    url = f"/api/v1/tasks/{task['id']}"
+    assert (task["is_completed"], task["completed_at"]) == (False, None)
+
+    completed = client.patch(url, json={"status": "completed"}).json()
+    assert completed["is_completed"] is True
+    assert completed["completed_at"] is not None
+
+    again = client.put(url, json={"status": "completed", "title": "Call back today"}).json()
+    assert again["completed_at"] == completed["completed_at"]
+
+
+def test_reopening_a_task_clears_its_completion(client, task):
+    url = f"/api/v1/tasks/{task['id']}"
+    client.patch(url, json={"status": "completed"})
+
+    reopened = client.patch(url, json={"status": "in_progress"}).json()
+    assert (reopened["is_completed"], reopened["completed_at"]) == (False, None)
+
+    renamed = client.patch(url, json={"title": "Call back tomorrow"}).json()
+    assert (renamed["status"], renamed["is_completed"]) == ("in_progress", False)
+
+
+@pytest.mark.parametrize("method", ["put", "patch"])
+@pytest.mark.parametrize("resource, body", [
+    ("contacts", {"company": "Acme"}),
+    ("pipelines", {"name": "Renewals"}),
+    ("deals", {"value": 10}),
+    ("tasks", {"status": "completed"}),
+])
+def test_updating_a_missing_row_is_a_404(client, method, resource, body):
+    response = getattr(client, method)(f"/api/v1/{resource}/999", json=body)
+    assert response.status_code == 404
+    assert response.json()["detail"].endswith("not found")